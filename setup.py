@@ -14,6 +14,10 @@ setup(
         'inquirer',
         'protobuf==3.20.1',
     ],
+    extras_require={
+        'fast': ['google-crc32c', 'numpy'],
+        'export': ['numpy', 'pyarrow'],
+    },
     entry_points={
         'console_scripts': [
             'tbview = tbview.cli:main'
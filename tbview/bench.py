@@ -0,0 +1,289 @@
+"""Reproducible micro-benchmarks for the parser and viewer (`tbview bench`).
+
+Every benchmark runs on files produced by `tbview.synth`, so results are
+comparable across machines and commits; `import` times fresh interpreters
+importing each entry point. Results are written as JSON and can
+be checked against a saved baseline:
+
+    tbview bench --out base.json
+    tbview bench --baseline base.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from tbview import synth
+
+PLOT_SIZES = ((80, 24), (160, 48), (240, 64))
+
+BENCHMARKS: "OrderedDict[str, Callable]" = OrderedDict()
+
+
+def benchmark(name: str):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+class BenchContext(object):
+    def __init__(self, workdir: str, quick: bool = False, repeat: int = 5):
+        self.workdir = workdir
+        self.quick = quick
+        self.repeat = repeat
+
+    def scale(self, full: int, quick: int) -> int:
+        return quick if self.quick else full
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Run `fn` once to warm up, then `repeat` times; report median and min."""
+    fn()
+    times = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'seconds': statistics.median(times), 'min': min(times), 'repeat': len(times)}
+
+
+def _mb(nbytes: int) -> float:
+    return nbytes / (1024.0 * 1024.0)
+
+
+@benchmark('crc32c')
+def bench_crc32c(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    from tbview.crc32c import masked_crc32c
+    size = ctx.scale(1 << 20, 1 << 16)
+    data = bytes(random.Random(0).getrandbits(8) for _ in range(size))
+    res = measure(lambda: masked_crc32c(data), ctx.repeat)
+    res['mb_per_s'] = _mb(size) / res['seconds']
+    return {'crc32c': res}
+
+
+@benchmark('parse_full')
+def bench_parse_full(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    from tbview.parser import read_records
+    info = synth.generate_event_file(ctx.path('parse_full.tfevents'),
+                                     steps=ctx.scale(5000, 300), tags=8, histograms=2)
+    path = info['path']
+    res = measure(lambda: sum(1 for _ in read_records(path, warn=lambda msg: None)), ctx.repeat)
+    res['records_per_s'] = info['records'] / res['seconds']
+    res['mb_per_s'] = _mb(info['size']) / res['seconds']
+    return {'parse_full': res}
+
+
+@benchmark('tail_scan')
+def bench_tail_scan(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    from tbview.parser import read_records_from_offset
+    path = ctx.path('tail_scan.tfevents')
+    base = synth.generate_event_file(path, steps=ctx.scale(20000, 1000), tags=8)
+    tail = synth.generate_event_file(path, steps=ctx.scale(200, 20), tags=8, corrupt_tail=True, seed=1)
+    offset = base['valid_bytes']
+    res = measure(lambda: sum(1 for _ in read_records_from_offset(path, offset, warn=lambda msg: None)), ctx.repeat)
+    res['records_per_s'] = tail['records'] / res['seconds']
+    res['tail_bytes'] = tail['size'] - offset
+    return {'tail_scan': res}
+
+
+@benchmark('resync')
+def bench_resync(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    from tbview.parser import find_record_boundary
+    info = synth.generate_event_file(ctx.path('resync.tfevents'), steps=ctx.scale(5000, 300), tags=8)
+    size = info['size']
+    offsets = [size * i // 64 + 1 for i in range(64)]
+
+    def run():
+        with open(info['path'], 'rb') as f:
+            for off in offsets:
+                find_record_boundary(f, off)
+    res = measure(run, ctx.repeat)
+    res['resyncs_per_s'] = len(offsets) / res['seconds']
+    return {'resync': res}
+
+def _make_viewer(paths: List[str]):
+    from tbview.viewer import TensorboardViewer
+    tags = [os.path.basename(os.path.dirname(p)) for p in paths]
+    return TensorboardViewer(paths, tags)
+
+
+def _rescan(viewer):
+    """Parse every run of `viewer` again from the start, as a new viewer would."""
+    for run_tag in viewer.run_tags:
+        viewer._tag_offsets_by_run[run_tag] = OrderedDict()
+        viewer.records_by_run[run_tag] = OrderedDict()
+        viewer.wall_times_by_run[run_tag] = {}
+        viewer._tag_version_by_run[run_tag] = {}
+        viewer._last_offset_by_run[run_tag] = 0
+        viewer._last_scan_size_by_run[run_tag] = 0
+    viewer.scan_events(initial=True)
+
+
+@benchmark('scan_events')
+def bench_scan_events(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    runs = ctx.scale(4, 2)
+    paths = synth.generate_run_dir(ctx.path('scan_events'), runs=runs,
+                                   steps=ctx.scale(2000, 200), tags=8)
+    viewer = _make_viewer(paths)
+    total_bytes = sum(os.path.getsize(p) for p in paths)
+    res = measure(lambda: _rescan(viewer), ctx.repeat)
+    res['runs'] = runs
+    res['mb_per_s'] = _mb(total_bytes) / res['seconds']
+    return {f'scan_events[{runs} runs]': res}
+
+
+@benchmark('plot_frame')
+def bench_plot_frame(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    from tbview.dashing_lib.dashing import TBox
+    paths = synth.generate_run_dir(ctx.path('plot_frame'), runs=2,
+                                   steps=ctx.scale(20000, 1000), tags=4)
+    viewer = _make_viewer(paths)
+    tag = viewer.tag_names[0]
+    results = OrderedDict()
+    for engine in viewer.PLOT_ENGINES:
+        viewer.plot_engine = engine
+        for w, h in PLOT_SIZES:
+            tbox = TBox(viewer.term, 0, 0, w, h)
+            res = measure(lambda: viewer.plot_tag(tag, tbox), ctx.repeat)
+            res['fps'] = 1.0 / res['seconds']
+            results[f'plot_frame[{engine} {w}x{h}]'] = res
+    return results
+
+
+# Module each entry point needs before it can do any work
+IMPORT_TARGETS = (
+    ('cli', 'tbview.cli'),
+    ('summary', 'tbview.summary'),
+    ('export', 'tbview.export'),
+    ('hdf5', 'tbview.hdf5'),
+    ('viewer', 'tbview.viewer'),
+)
+
+
+@benchmark('import')
+def bench_import(ctx: BenchContext) -> Dict[str, Dict[str, float]]:
+    """Wall time of a fresh interpreter importing each entry point, minus bare startup."""
+    import subprocess
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (root, os.environ.get('PYTHONPATH')))))
+
+    def spawn(code):
+        return lambda: subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+    repeat = max(3, ctx.repeat)
+    base = measure(spawn('pass'), repeat)['seconds']
+    results = OrderedDict()
+    for name, module in IMPORT_TARGETS:
+        res = measure(spawn(f'import {module}'), repeat)
+        res['import_ms'] = max(0.0, res['seconds'] - base) * 1000.0
+        results[f'import[{name}]'] = res
+    return results
+
+def run_benchmarks(names: Optional[List[str]] = None, quick: bool = False, repeat: int = 5,
+                   workdir: Optional[str] = None, progress: Callable[[str], None] = lambda msg: None) -> dict:
+    """Run the selected benchmarks and return the JSON-serializable report."""
+    own_dir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='tbview-bench-')
+    ctx = BenchContext(workdir, quick=quick, repeat=repeat)
+    results = OrderedDict()
+    try:
+        for name, fn in BENCHMARKS.items():
+            if names and not any(n in name for n in names):
+                continue
+            progress(name)
+            results.update(fn(ctx))
+    finally:
+        if own_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': numpy_version,
+            'quick': quick,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> List[str]:
+    """Return one message per benchmark slower than baseline by more than `tolerance`."""
+    regressions = []
+    base_results = baseline.get('results', {})
+    for name, res in current.get('results', {}).items():
+        base = base_results.get(name)
+        if not base or not base.get('seconds'):
+            continue
+        ratio = res['seconds'] / base['seconds']
+        if ratio > 1.0 + tolerance:
+            regressions.append(f'{name}: {res["seconds"]*1000:.2f}ms vs baseline '
+                               f'{base["seconds"]*1000:.2f}ms ({ratio:.2f}x)')
+    return regressions
+
+
+def format_report(report: dict, baseline: Optional[dict] = None) -> str:
+    base_results = (baseline or {}).get('results', {})
+    lines = [f'{"benchmark":<34}{"median ms":>11}{"min ms":>10}  notes']
+    for name, res in report['results'].items():
+        extras = [f'{k}={v:,}' if isinstance(v, int) else f'{k}={v:,.1f}' for k, v in res.items()
+                  if k not in ('seconds', 'min', 'repeat') and isinstance(v, (int, float))]
+        base = base_results.get(name)
+        if base and base.get('seconds'):
+            extras.append(f'{res["seconds"] / base["seconds"]:.2f}x baseline')
+        lines.append(f'{name:<34}{res["seconds"]*1000:>11.2f}{res["min"]*1000:>10.2f}  {" ".join(extras)}')
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='tbview bench', description='run tbview performance benchmarks')
+    parser.add_argument('--out', default=None, metavar='FILE', help='write results as JSON to FILE')
+    parser.add_argument('--baseline', default=None, metavar='FILE', help='compare against a saved JSON result')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown vs baseline before failing (default 0.25 = 25%%)')
+    parser.add_argument('--quick', action='store_true', help='use small inputs (smoke test)')
+    parser.add_argument('--repeat', type=int, default=5, help='timed repetitions per benchmark')
+    parser.add_argument('--only', nargs='*', default=None, metavar='NAME',
+                        help=f'run benchmarks whose name contains NAME ({", ".join(BENCHMARKS)})')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.only, quick=args.quick, repeat=args.repeat,
+                            progress=lambda name: print(f'running {name}...', file=sys.stderr))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        for msg in regressions:
+            print(f'REGRESSION {msg}')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,13 @@
 import argparse
 import os
 import sys
-import inquirer
-from tbview.viewer import TensorboardViewer
-from tbview.parser import read_records
+
+# The viewer (blessed, plotext, numpy), inquirer and the protobuf descriptors
+# are imported where they are needed, so subcommands and -h5 conversion do
+# not pay for the interactive UI at startup (see `tbview bench --only import`)
+
+# Same as TensorboardViewer.PLOT_ENGINES, which would import the UI to read
+PLOT_ENGINES = ('plotext', 'braille')
 
 def check_file_or_directory(path):
     if not os.path.exists(path):
@@ -24,6 +28,48 @@ def local_event_dir(path):
         dir = '.'
     return dir
 
+def start_viewer(args, event_paths, event_tags):
+    """Create the viewer and run it interactively or headless.
+
+    Returns True when the user asked to go back to run selection.
+    """
+    from tbview.viewer import TensorboardViewer
+    headless = getattr(args, 'headless', None)
+    term = None
+    if headless:
+        from tbview.headless import HeadlessTerminal
+        term = HeadlessTerminal(*headless)
+    tbviewer = TensorboardViewer(event_paths, event_tags, plot_engine=args.engine, grid_size=args.grid,
+                                 profile=args.profile, term=term, since=args.since, last_steps=args.last_steps,
+                                 max_memory=args.max_memory, remote=getattr(args, 'remote_socket', None),
+                                 progressive=not headless)
+    try:
+        if not headless:
+            return tbviewer.run()
+        from tbview.headless import format_summary, load_keys, run_headless, write_outputs
+        keys = load_keys(args.keys, term) if args.keys else []
+        result = run_headless(tbviewer, frames=args.frames, keys=keys)
+        write_outputs(result, timings_out=args.timings_out, dump_frame=args.dump_frame)
+        print(format_summary(result))
+        return False
+    finally:
+        if getattr(args, 'mem_report', None):
+            from tbview.memreport import memory_report, write_report
+            write_report(memory_report(tbviewer, deep=args.mem_trace), args.mem_report)
+            print(f'memory report written to {args.mem_report}')
+        # Reopening these runs after 'q' resumes from what was parsed here
+        tbviewer.stash_runs()
+
+def start_prefetch(args, target_options, previously_selected):
+    """Parse the likely choices into the run cache while the prompt is open."""
+    from tbview.runcache import get_run_cache
+    cache = get_run_cache()
+    if (getattr(args, 'no_prefetch', False) or not cache.max_bytes or getattr(args, 'remote_socket', None)
+            or args.since is not None or args.last_steps is not None):
+        return None
+    from tbview.prefetch import SpeculativePrefetcher, likely_choices
+    return SpeculativePrefetcher(likely_choices(target_options, previously_selected), cache).start()
+
 def run_main(args):
     path = os.path.abspath(args.path)
 
@@ -60,15 +106,25 @@ def run_main(args):
                     if (root, file) in previously_selected:
                         default_selected.append(options[i])
 
-            questions = [
-                inquirer.Checkbox('choices',
-                                   message="Select one or more event files (space to toggle, enter to view)",
-                                   choices=options,
-                                   default=default_selected if default_selected else None,
-                                   carousel=True,
-                                   )
-            ]
-            answers = inquirer.prompt(questions)
+            if getattr(args, 'headless', None):
+                # No prompt without a terminal: view every run found
+                answers = {'choices': options}
+            else:
+                import inquirer
+                prefetcher = start_prefetch(args, target_options, previously_selected)
+                questions = [
+                    inquirer.Checkbox('choices',
+                                       message="Select one or more event files (space to toggle, enter to view)",
+                                       choices=options,
+                                       default=default_selected if default_selected else None,
+                                       carousel=True,
+                                       )
+                ]
+                try:
+                    answers = inquirer.prompt(questions)
+                finally:
+                    if prefetcher is not None:
+                        prefetcher.cancel()
             if answers is None:
                 return
             selected = answers.get('choices') or []
@@ -89,8 +145,7 @@ def run_main(args):
                 selected_event_paths.append(ev_path)
                 selected_event_tags.append(ev_tag)
 
-            tbviewer = TensorboardViewer(selected_event_paths, selected_event_tags)
-            should_reselect = tbviewer.run()
+            should_reselect = start_viewer(args, selected_event_paths, selected_event_tags)
             if not should_reselect:
                 return
             # Remember selected items for next loop iteration
@@ -102,43 +157,156 @@ def run_main(args):
     target_event_tag = target_event_name if target_event_dir is None else target_event_dir
 
     if args.h5:
-        import h5py
-        import numpy as np
-        records = {}
-        for event in read_records(target_event_path):
-            summary = event.summary
-            for value in summary.value:
-                if value.HasField('simple_value'):
-                    # print(value.tag, value.simple_value, event.step)
-                    if value.tag not in records:
-                        records[value.tag] = {}
-                    records[value.tag][event.step] = value.simple_value
-        
-        with h5py.File(os.path.dirname(target_event_path)+os.sep+'[hdf5]' + os.path.basename(target_event_path)+'.h5', 'w') as hf:
-            for tag in records:
-                group = hf.create_group(tag)
-                
-                steps = sorted(records[tag].keys())
-                values = [records[tag][step] for step in steps]
-                
-                steps_array = np.array(steps, dtype='int64')
-                values_array = np.array(values, dtype='float32')
-                
-                group.create_dataset('steps', data=steps_array)
-                group.create_dataset('values', data=values_array)
+        from tbview.hdf5 import export_hdf5
+        export_hdf5(target_event_path, follow=args.follow, compression=args.h5_compression,
+                    warn=lambda msg: print(msg))
     else:
-        tbviewer = TensorboardViewer(target_event_path, target_event_tag)
-        tbviewer.run()
+        start_viewer(args, target_event_path, target_event_tag)
+
+# Subcommands are dispatched on the first argument, before the viewer parser;
+# a directory with the same name can still be opened as `./<name>`
+SUBCOMMANDS = {
+    'bench': 'tbview.bench',
+    'export': 'tbview.export',
+    'serve': 'tbview.serve',
+    'stress': 'tbview.stress',
+    'summary': 'tbview.summary',
+}
+
+def run_subcommand(argv):
+    import importlib
+    module = importlib.import_module(SUBCOMMANDS[argv[0]])
+    return module.main(argv[1:])
+
+def parse_headless_size(value):
+    from tbview.headless import parse_size
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_duration(value):
+    """Parse durations like '90', '45s', '30m', '2h' or '1.5d' into seconds."""
+    text = value.strip().lower()
+    scale = DURATION_UNITS.get(text[-1:], None)
+    if scale is not None:
+        text = text[:-1]
+    try:
+        seconds = float(text) * (scale or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid duration {value!r}, expected e.g. 30m, 2h or 1d')
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f'duration {value!r} must be positive')
+    return seconds
+
+def positive_int(value):
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid integer {value!r}')
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f'{value!r} must be positive')
+    return n
+
+def parse_memory_size(value):
+    from tbview.series import parse_size_bytes
+    try:
+        return parse_size_bytes(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def resolve_remote(args):
+    """Socket of the `tbview serve` daemon to attach to, or None to parse locally."""
+    if args.remote is None:
+        return None
+    from tbview.serve import default_socket_path, is_serving
+    socket_path = args.remote or default_socket_path(args.path)
+    if is_serving(socket_path):
+        return socket_path
+    print(f"Warning: no tbview serve on {socket_path}, parsing event files locally")
+    return None
+
+def parse_cache_size(value):
+    if value.strip() == '0':
+        return 0
+    return parse_memory_size(value)
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        sys.exit(run_subcommand(sys.argv[1:]))
     parser = argparse.ArgumentParser()
     parser.add_argument('path', help='path to tensorboard log directory or event file', type=check_file_or_directory)
     parser.add_argument('-h5', action='store_true', help='convert to h5 file')
+    parser.add_argument('--follow', action='store_true',
+                        help='with -h5: keep appending new records to the h5 file until interrupted')
+    parser.add_argument('--h5-compression', choices=('gzip', 'lzf', 'none'), default='none',
+                        help='with -h5: dataset compression (default none)')
+    parser.add_argument('--engine', choices=PLOT_ENGINES, default='plotext',
+                        help="plot engine: 'plotext' (default) or the native 'braille' renderer")
+    parser.add_argument('--grid', type=int, default=0, metavar='N',
+                        help="start in grid view showing N tags at once (toggle with 'g')")
+    parser.add_argument('--profile', action='store_true',
+                        help="show the performance HUD on start (toggle with 't')")
+    parser.add_argument('--since', type=parse_duration, default=None, metavar='DURATION',
+                        help='load only events written in the last DURATION (e.g. 30m, 2h, 1d); '
+                             'older history is loaded in the background when zooming out')
+    parser.add_argument('--last-steps', type=positive_int, default=None, metavar='N',
+                        help='load only the last N steps of each run; older history is loaded when zooming out')
+    parser.add_argument('--max-memory', type=parse_memory_size, default=None, metavar='SIZE',
+                        help='memory budget for loaded series (e.g. 512M, 2G); least recently viewed series '
+                             'are evicted and reloaded when selected again')
+    parser.add_argument('--run-cache', type=parse_cache_size, default=1 << 30, metavar='SIZE',
+                        help='keep parsed runs up to SIZE (default 1G, 0 disables) when going back to run '
+                             "selection with 'q', so reopening them only reads new records")
+    parser.add_argument('--no-prefetch', action='store_true',
+                        help='do not parse likely runs in the background while the run selection prompt is open')
+    parser.add_argument('--mem-report', default=None, metavar='FILE',
+                        help="on exit, write estimated memory use per run and tag as JSON to FILE (panel: 'r')")
+    parser.add_argument('--mem-trace', action='store_true',
+                        help='trace allocations with tracemalloc and attribute them to source lines in --mem-report')
+    parser.add_argument('--remote', nargs='?', const='', default=None, metavar='SOCKET',
+                        help='get tags and series from a `tbview serve` daemon instead of parsing the files '
+                             '(default socket: the one `tbview serve <path>` listens on)')
+    parser.add_argument('--headless', type=parse_headless_size, default=None, metavar='WxH',
+                        help='render without a terminal at the given size (e.g. 160x48) and report frame timings')
+    parser.add_argument('--frames', type=int, default=None, metavar='N',
+                        help='headless: number of frames to render (default: one per scripted key, plus one)')
+    parser.add_argument('--keys', default=None, metavar='FILE',
+                        help='headless: key script, one key per line (a character, KEY_* name or text:<chars>)')
+    parser.add_argument('--timings-out', default=None, metavar='FILE',
+                        help='headless: write per-frame timings as JSON to FILE')
+    parser.add_argument('--dump-frame', default=None, metavar='FILE',
+                        help='headless: write the final frame as plain text to FILE')
+    parser.add_argument('--trace-out', default=None, metavar='FILE',
+                        help='write a Chrome trace-event JSON timeline of viewer and parser phases to FILE')
     parser.usage = f'{sys.argv[0]} path'
 
     args = parser.parse_args()
+    if args.remote is not None and (args.since is not None or args.last_steps is not None):
+        parser.error('--remote serves the whole history; --since and --last-steps apply to local parsing only')
+    args.remote_socket = None if args.h5 else resolve_remote(args)
+
+    if args.run_cache:
+        from tbview.runcache import RunCache, set_run_cache
+        set_run_cache(RunCache(args.run_cache))
 
-    run_main(args)
+    if args.mem_trace:
+        from tbview.memreport import start_tracing
+        start_tracing()
+
+    if args.trace_out:
+        from tbview.trace import Tracer, set_tracer
+        tracer = Tracer(args.trace_out)
+        set_tracer(tracer)
+        try:
+            run_main(args)
+        finally:
+            tracer.save()
+            print(f'trace written to {args.trace_out}')
+    else:
+        run_main(args)
 
 if __name__ == '__main__':
     main()
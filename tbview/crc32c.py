@@ -73,6 +73,15 @@ CRC_INIT = 0
 
 _MASK = 0xFFFFFFFF
 
+# Optional C implementations; the table-driven loop below is the fallback
+try:
+    from google_crc32c import value as _native_crc32c
+except ImportError:
+    try:
+        from crc32c import crc32c as _native_crc32c
+    except ImportError:
+        _native_crc32c = None
+
 
 def crc_update(crc, data):
     """Update CRC-32C checksum with data.
@@ -85,15 +94,18 @@ def crc_update(crc, data):
       32-bit updated CRC-32C as long.
     """
 
-    if type(data) != array.array or data.itemsize != 1:
+    if isinstance(data, (bytes, bytearray)):
+        buf = data
+    elif type(data) != array.array or data.itemsize != 1:
         buf = array.array("B", data)
     else:
         buf = data
 
+    # crc stays within 32 bits: table entries are 32-bit and crc >> 8 only shrinks
+    table = CRC_TABLE
     crc ^= _MASK
     for b in buf:
-        table_index = (crc ^ b) & 0xff
-        crc = (CRC_TABLE[table_index] ^ (crc >> 8)) & _MASK
+        crc = table[(crc ^ b) & 0xff] ^ (crc >> 8)
     return crc ^ _MASK
 
 
@@ -120,6 +132,8 @@ def crc32c(data):
     Returns:
       32-bit CRC-32C checksum of data as long.
     """
+    if _native_crc32c is not None and isinstance(data, (bytes, bytearray)):
+        return _native_crc32c(bytes(data)) & _MASK
     return crc_finalize(crc_update(CRC_INIT, data))
 
 def u32(x):
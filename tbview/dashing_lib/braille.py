@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""Purpose-built multi-series braille line plots.
+
+Series are decimated to the pixel resolution of the target area and
+rasterized straight into a braille cell buffer (2x4 dots per cell). NumPy is
+used for decimation and rasterization when available; a pure Python path
+keeps the renderer working without it.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from .dashing import braille_left, braille_right
+
+# numpy is optional and takes ~60 ms to import, so it is loaded on the first
+# braille render rather than with the viewer
+np = None
+_numpy_checked = False
+
+
+def _numpy():
+    """Return numpy, importing it on first use; None when it is not installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # pragma: no cover - exercised only without numpy
+            pass
+    return np
+
+BRAILLE_BASE = 0x2800
+# dot bit for (row % 4, col % 2) inside a braille cell
+_DOT_BITS = tuple((braille_left[r], braille_right[r]) for r in range(4))
+
+ANSI_COLORS = {
+    'red': 1, 'green': 2, 'yellow': 3, 'blue': 4, 'magenta': 5, 'cyan': 6, 'white': 7,
+}
+_RESET = '\x1b[0m'
+
+
+def _fg(color) -> str:
+    code = ANSI_COLORS.get(color, color) if isinstance(color, str) else color
+    if not isinstance(code, int):
+        return ''
+    return f'\x1b[38;5;{code}m'
+
+
+def decimate_minmax(xs: Sequence[float], ys: Sequence[float], buckets: int) -> Tuple[Sequence[float], Sequence[float]]:
+    """Reduce a series to at most ~2*buckets points, keeping per-bucket extremes.
+
+    Points are grouped into `buckets` contiguous index ranges; for every range
+    the min and max samples are kept in their original order, so spikes stay
+    visible after decimation. Short series are returned unchanged; decimated
+    output is NumPy arrays when NumPy is available, lists otherwise.
+    """
+    n = len(xs)
+    if buckets <= 0 or n <= 2 * buckets:
+        return xs, ys
+    if _numpy() is not None:
+        y = np.asarray(ys, dtype=float)
+        x = np.asarray(xs, dtype=float)
+        size = -(-n // buckets)
+        padded = np.concatenate((y, np.full(size * buckets - n, y[-1]))).reshape(buckets, size)
+        base = np.arange(buckets) * size
+        imin = np.minimum(base + padded.argmin(axis=1), n - 1)
+        imax = np.minimum(base + padded.argmax(axis=1), n - 1)
+        idx = np.unique(np.concatenate((imin, imax)))
+        return x[idx], y[idx]
+    out_x, out_y = [], []
+    size = -(-n // buckets)
+    for b in range(buckets):
+        lo = b * size
+        hi = min(n, lo + size)
+        if hi <= lo:
+            continue
+        seg = range(lo, hi)
+        imin = min(seg, key=ys.__getitem__)
+        imax = max(seg, key=ys.__getitem__)
+        for i in sorted({imin, imax}):
+            out_x.append(xs[i])
+            out_y.append(ys[i])
+    return out_x, out_y
+
+
+def crop_to_range(xs: Sequence[float], ys: Sequence[float], xlim: Optional[Tuple[float, float]]) -> Tuple[Sequence[float], Sequence[float]]:
+    """Keep the points of an ascending series inside `xlim`, plus one neighbour per side.
+
+    The neighbours keep lines entering and leaving the visible window intact.
+    """
+    if xlim is None or not len(xs):
+        return xs, ys
+    lo = max(0, bisect_left(xs, xlim[0]) - 1)
+    hi = min(len(xs), bisect_right(xs, xlim[1]) + 1)
+    return xs[lo:hi], ys[lo:hi]
+
+
+def _format_tick(v: float, absolute_time: bool = False) -> str:
+    if absolute_time:
+        try:
+            return datetime.fromtimestamp(v).strftime('%H:%M')
+        except (OverflowError, OSError, ValueError):
+            pass
+    if v == 0:
+        return '0'
+    mag = abs(v)
+    if mag >= 1e5 or mag < 1e-3:
+        return f'{v:.2e}'
+    if float(v).is_integer():
+        return str(int(v))
+    return f'{v:.4g}'
+
+
+def _ticks(lo: float, hi: float, count: int) -> List[float]:
+    if count <= 1 or hi <= lo:
+        return [lo]
+    step = (hi - lo) / (count - 1)
+    return [lo + i * step for i in range(count)]
+
+
+class BrailleLinePlot(object):
+    """Multi-series line plot rendered with braille characters.
+
+    Add series with `plot()`, optionally set limits and labels, then call
+    `build(w, h)` to obtain the figure as a string of exactly `h` lines.
+    """
+
+    def __init__(self):
+        self.series = []
+        self.title = ''
+        self.xlabel = ''
+        self.xlim: Optional[Tuple[float, float]] = None
+        self.ylim: Optional[Tuple[float, float]] = None
+        self.absolute_time = False
+
+    def plot(self, xs, ys, label=None, color='white'):
+        if not len(xs) or len(xs) != len(ys):
+            return
+        # NaN/inf points (e.g. a diverged loss) are dropped rather than
+        # poisoning the data range and the rasterizer
+        if _numpy() is not None:
+            xs = np.asarray(xs, dtype=float)
+            ys = np.asarray(ys, dtype=float)
+            finite = np.isfinite(xs) & np.isfinite(ys)
+            if not finite.all():
+                xs, ys = xs[finite], ys[finite]
+        elif not all(math.isfinite(x) and math.isfinite(y) for x, y in zip(xs, ys)):
+            points = [(x, y) for x, y in zip(xs, ys) if math.isfinite(x) and math.isfinite(y)]
+            xs, ys = [x for x, _y in points], [y for _x, y in points]
+        if not len(xs):
+            return
+        self.series.append((xs, ys, label, color))
+
+    def _data_range(self):
+        xmin = ymin = math.inf
+        xmax = ymax = -math.inf
+        for xs, ys, _label, _color in self.series:
+            if _numpy() is not None:
+                xmin = min(xmin, float(xs.min()))
+                xmax = max(xmax, float(xs.max()))
+                ymin = min(ymin, float(ys.min()))
+                ymax = max(ymax, float(ys.max()))
+            else:
+                xmin = min(xmin, min(xs))
+                xmax = max(xmax, max(xs))
+                ymin = min(ymin, min(ys))
+                ymax = max(ymax, max(ys))
+        return xmin, xmax, ymin, ymax
+
+    def build(self, w: int, h: int) -> str:
+        if w < 10 or h < 5 or not self.series:
+            return ''
+        xmin, xmax, ymin, ymax = self._data_range()
+        if self.xlim is not None:
+            xmin, xmax = self.xlim
+        if self.ylim is not None:
+            ymin, ymax = self.ylim
+        if xmax <= xmin:
+            xmin, xmax = xmin - 0.5, xmax + 0.5
+        if ymax <= ymin:
+            ymin, ymax = ymin - 0.5, ymax + 0.5
+
+        rows = h - 4  # title, x axis, x tick labels, x label
+        yticks = _ticks(ymin, ymax, min(5, rows))
+        ylabels = [_format_tick(v) for v in yticks]
+        ylab_w = max(len(s) for s in ylabels)
+        cols = w - ylab_w - 2
+        if cols < 4:
+            return ''
+
+        bits, owner = self._rasterize(cols, rows, xmin, xmax, ymin, ymax)
+        tick_rows = {}
+        for v, s in zip(yticks, ylabels):
+            r = int(round((ymax - v) / (ymax - ymin) * (rows - 1)))
+            tick_rows.setdefault(r, s)
+
+        lines = [self.title[:w].center(w)]
+        legend = self._legend(cols, max(1, rows // 3))
+        for r, (text, _color) in enumerate(legend):
+            # legend entries overlay the leftmost cells of the top rows
+            if _numpy() is not None:
+                bits[r, :len(text)] = 0
+            else:
+                bits[r][:len(text)] = [0] * len(text)
+        body_rows = self._rows_text(bits, owner)
+        for r in range(rows):
+            label = tick_rows.get(r)
+            prefix = (label.rjust(ylab_w) + '┤') if label is not None else (' ' * ylab_w + '│')
+            body = body_rows[r]
+            if r < len(legend):
+                text, color = legend[r]
+                body = _fg(color) + text[:3] + _RESET + text[3:] + body[len(text):]
+            lines.append(prefix + body + '│')
+
+        xtick_count = max(2, min(cols // 12, 8))
+        xticks = _ticks(xmin, xmax, xtick_count)
+        axis = ['─'] * cols
+        labels_row = [' '] * (cols + 8)
+        for v in xticks:
+            c = int(round((v - xmin) / (xmax - xmin) * (cols - 1)))
+            axis[c] = '┬'
+            text = _format_tick(v, self.absolute_time)
+            start = max(0, min(c - len(text) // 2, cols - len(text)))
+            if all(ch == ' ' for ch in labels_row[max(0, start - 1):start + len(text) + 1]):
+                labels_row[start:start + len(text)] = list(text)
+        lines.append(' ' * ylab_w + '└' + ''.join(axis) + '┘')
+        lines.append(' ' * (ylab_w + 1) + ''.join(labels_row[:cols]))
+        lines.append(' ' * (ylab_w + 1) + self.xlabel[:cols].center(cols))
+        return '\n'.join(lines)
+
+    def _legend(self, cols: int, max_rows: int) -> List[Tuple[str, object]]:
+        """Return (text, color) legend entries overlaid on the top plot rows."""
+        labelled = [(str(label), color) for _xs, _ys, label, color in self.series if label]
+        if len(labelled) > max_rows:
+            hidden = len(labelled) - max_rows + 1
+            labelled = labelled[:max_rows - 1] + [(f'+{hidden} more', None)]
+        out = []
+        for label, color in labelled:
+            prefix = ' ▄▄ ' if color is not None else '    '
+            out.append(((prefix + label + ' ')[:cols], color))
+        return out
+
+    def _rows_text(self, bits, owner) -> List[str]:
+        """Turn cell bits into row strings, switching color per owning series."""
+        rows = len(bits)
+        if _numpy() is not None:
+            cols = bits.shape[1]
+            lit = bits > 0
+            codes = np.where(lit, bits.astype(np.uint32) + BRAILLE_BASE, 32).astype('<u4')
+            grid = codes.tobytes().decode('utf-32-le')
+            row_strs = [grid[r * cols:(r + 1) * cols] for r in range(rows)]
+            keys = np.where(lit, owner, -1)
+            change = np.empty(keys.shape, dtype=bool)
+            change[:, 0] = keys[:, 0] != -1
+            change[:, 1:] = keys[:, 1:] != keys[:, :-1]
+            r_idx, c_idx = np.nonzero(change)
+            transitions = zip(r_idx.tolist(), c_idx.tolist(), keys[r_idx, c_idx].tolist())
+        else:
+            row_strs = [''.join([chr(BRAILLE_BASE + b) if b else ' ' for b in row]) for row in bits]
+            transitions = []
+            for r in range(rows):
+                prev = -1
+                for c, (b, o) in enumerate(zip(bits[r], owner[r])):
+                    key = o if b else -1
+                    if key != prev:
+                        transitions.append((r, c, key))
+                        prev = key
+        fgs = [_fg(color) for _xs, _ys, _label, color in self.series]
+        parts = [[] for _ in range(rows)]
+        starts = [0] * rows
+        open_color = [False] * rows
+        for r, c, key in transitions:
+            parts[r].append(row_strs[r][starts[r]:c])
+            parts[r].append(_RESET if key < 0 else fgs[key])
+            starts[r] = c
+            open_color[r] = key >= 0
+        out = []
+        for r in range(rows):
+            parts[r].append(row_strs[r][starts[r]:])
+            if open_color[r]:
+                parts[r].append(_RESET)
+            out.append(''.join(parts[r]))
+        return out
+
+    def _rasterize(self, cols, rows, xmin, xmax, ymin, ymax):
+        """Return per-cell braille bits and the index of the series owning each cell."""
+        pw, ph = cols * 2, rows * 4
+        if _numpy() is not None:
+            bits = np.zeros((rows, cols), dtype=np.uint8)
+            owner = np.zeros((rows, cols), dtype=np.int32)
+            dot_bits = np.array(_DOT_BITS, dtype=np.int64)
+            dots = np.zeros(ph * pw, dtype=bool)
+            for si, (xs, ys, _label, _color) in enumerate(self.series):
+                dx, dy = decimate_minmax(*crop_to_range(xs, ys, self.xlim), pw)
+                px = (np.asarray(dx, dtype=float) - xmin) / (xmax - xmin) * (pw - 1)
+                py = (ymax - np.asarray(dy, dtype=float)) / (ymax - ymin) * (ph - 1)
+                px, py = self._np_segments(px, py)
+                keep = (px >= 0) & (px < pw) & (py >= 0) & (py < ph)
+                if not keep.any():
+                    continue
+                # Dots within a cell are distinct powers of two, so summing the
+                # unique lit pixels per cell is the same as OR-ing them.
+                dots[:] = False
+                dots[py[keep] * pw + px[keep]] = True
+                py, px = np.divmod(np.flatnonzero(dots), pw)
+                cells = (py // 4) * cols + px // 2
+                layer = np.bincount(cells, weights=dot_bits[py % 4, px % 2], minlength=rows * cols)
+                layer = layer.astype(np.uint8).reshape(rows, cols)
+                bits |= layer
+                owner[layer > 0] = si
+            return bits, owner
+        bits = [[0] * cols for _ in range(rows)]
+        owner = [[0] * cols for _ in range(rows)]
+        for si, (xs, ys, _label, _color) in enumerate(self.series):
+            dx, dy = decimate_minmax(*crop_to_range(xs, ys, self.xlim), pw)
+            pts = [((x - xmin) / (xmax - xmin) * (pw - 1), (ymax - y) / (ymax - ymin) * (ph - 1)) for x, y in zip(dx, dy)]
+            for x, y in self._py_segments(pts):
+                if 0 <= x < pw and 0 <= y < ph:
+                    r, c = y // 4, x // 2
+                    bits[r][c] |= _DOT_BITS[y % 4][x % 2]
+                    owner[r][c] = si
+        return bits, owner
+
+    @staticmethod
+    def _np_segments(px, py):
+        """Interpolate integer pixels along consecutive points (vectorized)."""
+        if px.size == 1:
+            return np.rint(px).astype(np.int64), np.rint(py).astype(np.int64)
+        x0, x1 = px[:-1], px[1:]
+        y0, y1 = py[:-1], py[1:]
+        # Clip wildly out-of-range segments so the step count stays bounded
+        span = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0))
+        steps = np.minimum(np.ceil(span), 4096).astype(np.int64) + 1
+        seg = np.repeat(np.arange(steps.size), steps)
+        offsets = np.arange(seg.size) - np.repeat(np.cumsum(steps) - steps, steps)
+        t = offsets / np.maximum(steps[seg] - 1, 1)
+        xs = np.rint(x0[seg] + (x1 - x0)[seg] * t).astype(np.int64)
+        ys = np.rint(y0[seg] + (y1 - y0)[seg] * t).astype(np.int64)
+        return xs, ys
+
+    @staticmethod
+    def _py_segments(pts):
+        if len(pts) == 1:
+            yield int(round(pts[0][0])), int(round(pts[0][1]))
+            return
+        for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+            steps = min(int(math.ceil(max(abs(x1 - x0), abs(y1 - y0)))), 4096) + 1
+            for i in range(steps):
+                t = i / max(steps - 1, 1)
+                yield int(round(x0 + (x1 - x0) * t)), int(round(y0 + (y1 - y0) * t))
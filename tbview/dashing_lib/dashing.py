@@ -2,6 +2,9 @@
 #
 
 from collections import deque, namedtuple
+from contextlib import redirect_stdout
+import io
+import sys
 
 from blessed import Terminal
 
@@ -122,21 +125,28 @@ class Tile(object):
         #    print(tbox.t.move(x + dx, tbox.y) + char * width)
         pass
 
-    def display(self):
-        """Render current tile and its items. Recurse into nested splits
-        if any.
+    def render(self):
+        """Render current tile and its items into a single frame string.
+        Recurse into nested splits if any.
         """
-        try:
-            t = self._terminal
-        except AttributeError:
-            t = self._terminal = Terminal()
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            try:
+                t = self._terminal
+            except AttributeError:
+                t = self._terminal = Terminal()
+                self._fill_area(t, 0, 0, t.width, t.height - 1, "f")  # FIXME
+
             tbox = TBox(t, 0, 0, t.width, t.height - 1)
-            self._fill_area(tbox.t, 0, 0, t.width, t.height - 1, "f")  # FIXME
+            self._display(tbox, None)
+            # park cursor in a safe place and reset color
+            print(t.move(t.height - 3, 0) + t.normal)
+        return buf.getvalue()
 
-        tbox = TBox(t, 0, 0, t.width, t.height - 1)
-        self._display(tbox, None)
-        # park cursor in a safe place and reset color
-        print(t.move(t.height - 3, 0) + t.normal)
+    def display(self):
+        """Render current tile and write the frame to the terminal at once."""
+        sys.stdout.write(self.render())
+        sys.stdout.flush()
 
     def _draw_title(self, tbox, fill_all_width):
         if not self.title:
@@ -208,28 +218,45 @@ class HSplit(Split):
     pass
 
 
+def _wrap_line(line, w):
+    """Split a single line into chunks of at most `w` characters."""
+    if w <= 0:
+        return [line]
+    res = []
+    i = 0
+    while True:
+        if i+w < len(line):
+            res.append(line[i:i+w])
+        else:
+            res.append(line[i:])
+            break
+        i = i+w
+    return res
+
+
 class Text(Tile):
     def __init__(self, text, color=0, *args, **kw):
         super(Text, self).__init__(**kw)
         self.text = text
         self.color = color
+        self._wrap_cache = None  # (text, width, wrapped)
 
     def text_wrapped(self, w):
+        cache = self._wrap_cache
+        if cache is not None and cache[1] == w and cache[0] == self.text:
+            return cache[2]
         res = []
         for log in self.text.splitlines():
-            i = 0
-            while True:
-                if i+w < len(log):
-                    res.append(log[i:i+w])
-                else:
-                    res.append(log[i:])
-                    break
-                i = i+w
-        return '\n'.join(res)
+            res.extend(_wrap_line(log, w))
+        wrapped = '\n'.join(res)
+        self._wrap_cache = (self.text, w, wrapped)
+        return wrapped
 
     def _display(self, tbox, parent):
         tbox = self._draw_borders_and_title(tbox)
-        for dx, line in enumerate(self.text_wrapped(tbox.w).splitlines()):
+        dx = -1
+        # Lines past the box height would spill into the tiles below
+        for dx, line in enumerate(self.text_wrapped(tbox.w).splitlines()[:tbox.h]):
             print(
                 tbox.t.color(self.color)
                 + tbox.t.move(tbox.x + dx, tbox.y)
@@ -243,10 +270,29 @@ class Text(Tile):
 
 
 class Log(Tile):
-    def __init__(self, *args, **kw):
-        self.logs = deque(maxlen=50)
+    """Scrolling log backed by a bounded ring buffer.
+
+    Only the last `max_lines` messages are kept. Messages are wrapped once
+    per width and the wrapped lines are reused until the width changes.
+    """
+    def __init__(self, *args, max_lines=50, **kw):
+        self.logs = deque(maxlen=max_lines)
+        self._wrapped = deque(maxlen=max_lines)  # wrapped chunks, aligned with self.logs
+        self._wrap_width = None
+        self._flat = None  # flattened wrapped lines, rebuilt lazily
         super(Log, self).__init__(**kw)
 
+    @property
+    def max_lines(self):
+        return self.logs.maxlen
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by messages and their wrapped lines."""
+        total = sum(sys.getsizeof(msg) for msg in self.logs)
+        for chunks in self._wrapped:
+            total += sum(sys.getsizeof(chunk) for chunk in chunks)
+        return total
+
     def _display(self, tbox, parent):
         tbox = self._draw_borders_and_title(tbox)
         logs = self.logs_wrapped(tbox.w+4)
@@ -265,26 +311,30 @@ class Log(Tile):
                 print(tbox.t.move(tbox.x + i2, tbox.y) + " " * tbox.w)
 
     def logs_wrapped(self, w):
-        res = []
-        for log in self.logs:
-            i = 0
-            while True:
-                if i+w < len(log):
-                    res.append(log[i:i+w])
-                else:
-                    res.append(log[i:])
-                    break
-                i = i+w
-        return res
+        if w != self._wrap_width:
+            self._wrap_width = w
+            self._wrapped.clear()
+            self._wrapped.extend(_wrap_line(log, w) for log in self.logs)
+            self._flat = None
+        if self._flat is None:
+            self._flat = [chunk for chunks in self._wrapped for chunk in chunks]
+        return self._flat
 
     def append(self, msg):
         self.logs.append(msg)
+        if self._wrap_width is not None:
+            self._wrapped.append(_wrap_line(msg, self._wrap_width))
+        self._flat = None
 
     def replace_last(self, msg):
         try:
             self.logs[-1] = msg
         except IndexError:
-            self.logs.append(msg)
+            self.append(msg)
+            return
+        if self._wrap_width is not None:
+            self._wrapped[-1] = _wrap_line(msg, self._wrap_width)
+        self._flat = None
 
 
 class HGauge(Tile):
@@ -1,45 +1,226 @@
 from .dashing import Tile, TBox, Text
-import io
-from contextlib import redirect_stdout
-from typing import Callable
+from .layout import RatioHSplit, RatioVSplit
+from ..trace import get_tracer
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+import re
+import sys
+from typing import Callable, Hashable, List, Optional, Sequence
 
 class PlotextTile(Tile):
-    def __init__(self, plot_fn: Callable[[TBox], None], *args, **kw):
+    """Tile that blits a figure string produced by `plot_fn`.
+
+    `plot_fn` receives the inner TBox and returns the rendered figure (for
+    plotext, the result of `plt.build()`). When `cache_key_fn` is given, the
+    rendered lines are memoized on (width, height, cache_key_fn()) so an
+    unchanged plot costs only a screen blit.
+    """
+    def __init__(self, plot_fn: Callable[[TBox], Optional[str]], *args, cache_key_fn: Optional[Callable[[], Hashable]] = None, **kw):
         super(PlotextTile, self).__init__(**kw)
         self.plot_fn = plot_fn
+        self.cache_key_fn = cache_key_fn
+        self._cache_key = None
+        self._cache_lines: List[str] = []
 
     def _display(self, tbox, parent):
-        tbox = self._draw_borders_and_title(tbox)
-        st = self.plot_to_string(TBox(tbox.t, 0, 0, w=tbox.w-4, h=tbox.h-2 ))
-        dx = 0
-        for dx, line in enumerate(st.splitlines()):
-            print(
-                tbox.t.move(tbox.x + dx + 1, tbox.y + 2)
-                + line
-                + " " * (tbox.w - len(line) - 1)
-            )
-        dx += 2
-        while dx < tbox.h:
-            print(tbox.t.move(tbox.x + dx, tbox.y) + " " * tbox.w)
-            dx += 1
+        with get_tracer().span('PlotextTile._display', cat='ui', title=self.title):
+            tbox = self._draw_borders_and_title(tbox)
+            lines = self.plot_lines(self._plot_box(tbox))
+            # Lines start 2 columns in; pad and clip by visible width, since
+            # braille rows carry color sequences
+            width = tbox.w - 2
+            dx = 0
+            for dx, line in enumerate(lines):
+                visible = tbox.t.length(line)
+                if visible > width:
+                    line = tbox.t.truncate(line, width)
+                    visible = width
+                print(
+                    tbox.t.move(tbox.x + dx + 1, tbox.y + 2)
+                    + line
+                    + " " * (width - visible)
+                )
+            dx += 2
+            while dx < tbox.h:
+                print(tbox.t.move(tbox.x + dx, tbox.y) + " " * tbox.w)
+                dx += 1
+
+    @staticmethod
+    def _plot_box(inner):
+        return TBox(inner.t, 0, 0, w=inner.w-4, h=inner.h-2)
+
+    def prerender(self, tbox):
+        """Render into the cache for the given outer box without drawing."""
+        inner = tbox
+        if self.border_color is not None:
+            inner = TBox(tbox.t, tbox.x + 1, tbox.y + 1, tbox.w - 2, tbox.h - 2)
+        elif self.title is not None:
+            inner = TBox(tbox.t, tbox.x + 1, tbox.y, tbox.w - 1, tbox.h - 1)
+        self.plot_lines(self._plot_box(inner))
 
     def plot_to_string(self, tbox):
-        buf = io.StringIO()
-        with redirect_stdout(buf):
-            self.plot_fn(tbox)
-        return buf.getvalue()
+        return self.plot_fn(tbox) or ''
+
+    def plot_lines(self, tbox) -> List[str]:
+        """Return rendered figure lines, reusing the cached ones when possible."""
+        if self.cache_key_fn is None:
+            return self.plot_to_string(tbox).splitlines()
+        key = (tbox.w, tbox.h, self.cache_key_fn())
+        if key == self._cache_key:
+            return self._cache_lines
+        lines = self.plot_to_string(tbox).splitlines()
+        self._cache_key = key
+        self._cache_lines = lines
+        return lines
+
+    def invalidate(self):
+        """Drop the memoized figure so the next frame re-renders."""
+        self._cache_key = None
+        self._cache_lines = []
+
+    def cache_nbytes(self) -> int:
+        """Approximate bytes held by the memoized figure."""
+        return sys.getsizeof(self._cache_lines) + sum(sys.getsizeof(line) for line in self._cache_lines)
+
+
+class PlotGrid(RatioVSplit):
+    """Grid of plot panels: a RatioVSplit of RatioHSplit rows.
+
+    Before drawing, panels whose cache is stale are rendered together; when
+    `parallel_fn()` is true (the plot engine has no global state) this is done
+    in a thread pool, otherwise one after another.
+    """
+    def __init__(self, panels: Sequence[PlotextTile], ncols: int, parallel_fn: Callable[[], bool] = lambda: False, max_workers: Optional[int] = None, **kw):
+        self.panels = list(panels)
+        self.ncols = max(1, ncols)
+        rows = [
+            RatioHSplit(*row, ratios=(1,) * len(row), rest_pad_to=len(row) - 1)
+            for row in (self.panels[i:i + self.ncols] for i in range(0, len(self.panels), self.ncols))
+        ]
+        super(PlotGrid, self).__init__(*rows, ratios=(1,) * len(rows), rest_pad_to=len(rows) - 1, **kw)
+        self.parallel_fn = parallel_fn
+        self.max_workers = max_workers
+        self._executor = None
+
+    def panel_boxes(self, tbox):
+        """Yield (panel, outer TBox) pairs exactly as `_display` lays them out."""
+        x = tbox.x
+        for i, row in enumerate(self.items):
+            h = self.calc_item_size(i, tbox.h)
+            y = tbox.y
+            for j, panel in enumerate(row.items):
+                w = row.calc_item_size(j, tbox.w)
+                yield panel, TBox(tbox.t, x, y, w, h)
+                y += w
+            x += h
+
+    def _display(self, tbox, parent):
+        # The grid itself has no border, so panels split the whole box
+        boxes = list(self.panel_boxes(tbox))
+        if self.parallel_fn() and len(boxes) > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tbview-grid')
+            list(self._executor.map(lambda pb: pb[0].prerender(pb[1]), boxes))
+        else:
+            for panel, box in boxes:
+                panel.prerender(box)
+        super(PlotGrid, self)._display(tbox, parent)
+
+    def cache_nbytes(self) -> int:
+        return sum(panel.cache_nbytes() for panel in self.panels)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class TagIndex(object):
+    """Search index over a fixed list of names.
+
+    Prefix lookups bisect a case-folded sorted copy of the names; substring
+    and fuzzy (in-order subsequence) matches scan a candidate set, which
+    callers narrow incrementally as the query grows. Results are indices into
+    the original list, best tier first: prefix, substring, then fuzzy.
+    """
+    def __init__(self, names: Sequence[str]):
+        self.names = list(names)
+        self._folded = [n.lower() for n in self.names]
+        order = sorted(range(len(self._folded)), key=self._folded.__getitem__)
+        self._sorted_keys = [self._folded[i] for i in order]
+        self._sorted_idx = order
+
+    def __len__(self):
+        return len(self.names)
 
+    def nbytes(self) -> int:
+        """Approximate bytes held by the folded names and sort order (names are shared)."""
+        lists = (self.names, self._folded, self._sorted_keys, self._sorted_idx)
+        return sum(sys.getsizeof(lst) for lst in lists) + sum(sys.getsizeof(k) for k in self._folded)
+
+    def prefix(self, query: str) -> List[int]:
+        q = query.lower()
+        lo = bisect_left(self._sorted_keys, q)
+        hi = bisect_left(self._sorted_keys, q + '\U0010ffff')
+        return sorted(self._sorted_idx[lo:hi])
+
+    def fuzzy(self, query: str, candidates: Optional[Sequence[int]] = None) -> List[int]:
+        """Return indices whose name contains the query characters in order."""
+        q = query.lower()
+        pattern = re.compile('.*?'.join(re.escape(ch) for ch in q))
+        folded = self._folded
+        pool = range(len(folded)) if candidates is None else candidates
+        return [i for i in pool if pattern.search(folded[i])]
+
+    def search(self, query: str, candidates: Optional[Sequence[int]] = None) -> List[int]:
+        if not query:
+            return list(range(len(self.names))) if candidates is None else list(candidates)
+        matches = self.fuzzy(query, candidates)
+        q = query.lower()
+        folded = self._folded
+        prefix = set(self.prefix(q))
+        tiers = ([], [], [])
+        for i in matches:
+            if i in prefix:
+                tiers[0].append(i)
+            elif q in folded[i]:
+                tiers[1].append(i)
+            else:
+                tiers[2].append(i)
+        return tiers[0] + tiers[1] + tiers[2]
 
 
 class SelectionTile(Text):
+    """Virtualized, searchable list of options.
+
+    Only the rows inside the visible window are styled and printed. The
+    window scrolls to keep the current option visible, and a search query
+    narrows the list through a `TagIndex` over `keys` (defaults to the
+    option labels).
+    """
     def __init__(self, options, current=0, color=0, *args, **kw):
         super().__init__('', color, *args, **kw)
         self._current = current
-        self._options = options
+        self._top = 0
+        self._page = 1
+        self._query = ''
+        self._matches = None  # filtered option indices while a query is active
+        self._match_cache = {}  # query -> matches, reused while the query grows
+        self.searching = False  # show the query header even while it is empty
+        self.set_options(options)
 
     @property
     def current(self):
         return self._current
+
+    def cache_nbytes(self) -> int:
+        """Approximate bytes held by option labels, the search index and cached matches."""
+        total = sum(sys.getsizeof(o) for o in self._options)
+        if self._index is not None:
+            total += self._index.nbytes()
+        for matches in self._match_cache.values():
+            total += sys.getsizeof(matches)
+        return total
     
     @current.setter
     def current(self, c):
@@ -51,8 +232,72 @@ class SelectionTile(Text):
     
     @options.setter
     def options(self, options):
+        self.set_options(options)
+
+    def set_options(self, options, keys: Optional[Sequence[str]] = None):
         self._options = options
-    
+        self._index = None
+        self._keys = list(keys) if keys is not None else None
+        self._match_cache = {}
+        if self._query:
+            self._matches = self._search(self._query)
+
+    @property
+    def index(self) -> TagIndex:
+        if self._index is None:
+            self._index = TagIndex(self._keys if self._keys is not None else self._options)
+        return self._index
+
+    @property
+    def query(self):
+        return self._query
+
+    @property
+    def visible(self) -> Sequence[int]:
+        """Option indices currently listed (all options unless searching)."""
+        if self._matches is not None:
+            return self._matches
+        return range(len(self._options))
+
+    def _search(self, query):
+        cached = self._match_cache.get(query)
+        if cached is not None:
+            return cached
+        # Matches for a longer query are a subset of those for its prefix
+        candidates = None
+        for n in range(len(query) - 1, 0, -1):
+            prev = self._match_cache.get(query[:n])
+            if prev is not None:
+                candidates = prev
+                break
+        matches = self.index.search(query, candidates)
+        self._match_cache[query] = matches
+        return matches
+
+    def set_query(self, query: str):
+        """Filter the list; the current option moves to the best match if hidden."""
+        self._query = query
+        if not query:
+            self._matches = None
+            self._match_cache = {}
+            return
+        self._matches = self._search(query)
+        if self._matches and self._current not in set(self._matches):
+            self._current = self._matches[0]
+        self._top = 0
+
+    def move(self, delta: int):
+        """Move the selection by `delta` rows within the visible options."""
+        visible = self.visible
+        if not len(visible):
+            return
+        pos = self._position(visible)
+        pos = max(0, min(len(visible) - 1, (pos or 0) + delta))
+        self._current = visible[pos]
+
+    def page(self, direction: int):
+        self.move(direction * max(1, self._page - 1))
+
     def _apply_options_to_text(self, tbox:TBox):
         t = tbox.t
         styled_options = [
@@ -60,16 +305,29 @@ class SelectionTile(Text):
             for i,opt in enumerate(self._options)
         ]
         self.text = '\n'.join(styled_options)
-    
+
     def _display(self, tbox, parent):
         # Render options without wrapping to avoid breaking ANSI sequences
         tbox = self._draw_borders_and_title(tbox)
         t = tbox.t
         dx = 0
-        for i, opt in enumerate(self._options):
-            if dx >= tbox.h:
-                break
-            visible_text = opt[:tbox.w]
+        if self.searching or self._query:
+            header = f"/{self._query} ({len(self.visible)}/{len(self._options)})"[:tbox.w]
+            print(t.move(tbox.x, tbox.y) + t.white(header) + " " * (tbox.w - len(header)))
+            dx = 1
+        rows = max(0, tbox.h - dx)
+        self._page = max(1, rows)
+        visible = self.visible
+        # Scroll so that the current option stays inside the window
+        pos = self._position(visible)
+        if pos is not None:
+            if pos < self._top:
+                self._top = pos
+            elif pos >= self._top + rows:
+                self._top = pos - rows + 1
+        self._top = max(0, min(self._top, max(0, len(visible) - rows)))
+        for i in visible[self._top:self._top + rows]:
+            visible_text = self._options[i][:tbox.w]
             styled = (t.on_white if i == self._current else t.white)(visible_text)
             print(
                 t.move(tbox.x + dx, tbox.y)
@@ -79,4 +337,12 @@ class SelectionTile(Text):
             dx += 1
         while dx < tbox.h:
             print(t.move(tbox.x + dx, tbox.y) + " " * tbox.w)
-            dx += 1
\ No newline at end of file
+            dx += 1
+
+    def _position(self, visible):
+        if self._matches is None:
+            return self._current if 0 <= self._current < len(self._options) else None
+        try:
+            return self._matches.index(self._current)
+        except ValueError:
+            return None
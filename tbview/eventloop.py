@@ -0,0 +1,105 @@
+"""Minimal `selectors` event loop for the interactive viewer.
+
+The viewer waits in one place for whatever can change the screen: keyboard
+input, work finished by background threads, signals such as SIGWINCH and
+timer deadlines (e.g. the periodic reload check). Nothing runs between
+events, so an idle viewer does not wake up.
+
+Threads and signal handlers hand work to the loop with
+`call_soon_threadsafe`, which queues the callback and writes a byte to a
+wakeup pipe watched by the selector.
+"""
+
+import heapq
+import itertools
+import os
+import selectors
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class EventLoop(object):
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._timers = []
+        self._timer_ids = itertools.count()
+        self._cancelled = set()
+        self._ready = deque()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, self._drain_wakeups)
+
+    def add_reader(self, fd: int, callback: Callable[[], None]):
+        self._selector.register(fd, selectors.EVENT_READ, callback)
+
+    def remove_reader(self, fd: int):
+        try:
+            self._selector.unregister(fd)
+        except (KeyError, ValueError):
+            pass
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> int:
+        """Run `callback` after `delay` seconds; returns an id for `cancel`."""
+        timer_id = next(self._timer_ids)
+        heapq.heappush(self._timers, (time.monotonic() + delay, timer_id, callback))
+        return timer_id
+
+    def cancel(self, timer_id: int):
+        self._cancelled.add(timer_id)
+
+    def call_soon_threadsafe(self, callback: Callable[[], None]):
+        """Queue `callback` from any thread or signal handler and wake the loop."""
+        self._ready.append(callback)
+        try:
+            os.write(self._wake_w, b'\0')
+        except (BlockingIOError, OSError):
+            # The pipe is full, so the loop is awake already
+            pass
+
+    def _drain_wakeups(self):
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _next_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        while self._timers and self._timers[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._timers)[1])
+        if self._timers:
+            due = max(0.0, self._timers[0][0] - time.monotonic())
+            timeout = due if timeout is None else min(timeout, due)
+        return timeout
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """Wait up to `timeout` seconds (None: until an event) and run what is due.
+
+        Returns the number of callbacks run.
+        """
+        if self._ready:
+            timeout = 0
+        events = self._selector.select(self._next_timeout(timeout))
+        ran = 0
+        for key, _mask in events:
+            key.data()
+            if key.fd != self._wake_r:
+                ran += 1
+        while self._ready:
+            self._ready.popleft()()
+            ran += 1
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _due, timer_id, callback = heapq.heappop(self._timers)
+            if timer_id in self._cancelled:
+                self._cancelled.discard(timer_id)
+                continue
+            callback()
+            ran += 1
+        return ran
+
+    def close(self):
+        self._selector.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
@@ -0,0 +1,351 @@
+"""Streaming scalar export (`tbview export`).
+
+Scalars are decoded record by record from the wire format (no protobuf
+objects) and written in chunks of at most `chunk_rows` rows, so memory stays
+flat regardless of file size. A directory is exported as one output file
+per event file, spread over a process pool.
+
+Formats: csv, jsonl, npz (needs numpy), parquet and arrow (need pyarrow).
+Every format has the columns run, tag, step, wall_time and value; npz stores
+tags as `tag_index` into a `tags` array.
+"""
+
+import argparse
+import csv
+import json
+import os
+import struct
+import sys
+import time
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tbview.parser import decode_scalars, read_payloads_from_offset
+
+FORMATS = ('csv', 'jsonl', 'npz', 'parquet', 'arrow')
+EXTENSIONS = {'csv': '.csv', 'jsonl': '.jsonl', 'npz': '.npz', 'parquet': '.parquet', 'arrow': '.arrow'}
+DEFAULT_CHUNK_ROWS = 65536
+
+
+class TagFilter(object):
+    """Glob include/exclude filter with a per-tag decision cache."""
+
+    def __init__(self, include: Sequence[str] = (), exclude: Sequence[str] = ()):
+        self.include = list(include or ())
+        self.exclude = list(exclude or ())
+        self._cache: Dict[str, bool] = {}
+
+    def __call__(self, tag: str) -> bool:
+        keep = self._cache.get(tag)
+        if keep is None:
+            keep = ((not self.include or any(fnmatchcase(tag, p) for p in self.include))
+                    and not any(fnmatchcase(tag, p) for p in self.exclude))
+            self._cache[tag] = keep
+        return keep
+
+
+def iter_scalar_chunks(path: str, tag_filter=None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       warn=None) -> Iterator[Dict[str, list]]:
+    """Yield column chunks {'tag', 'step', 'wall_time', 'value'} of scalars in `path`."""
+    tag_filter = tag_filter or TagFilter()
+    chunk = _empty_chunk()
+    tags, steps, wall_times, values = chunk['tag'], chunk['step'], chunk['wall_time'], chunk['value']
+    for payload, _end in read_payloads_from_offset(path, 0, warn=warn):
+        try:
+            step, wall_time, scalars = decode_scalars(payload)
+        except (IndexError, ValueError, struct.error) as e:
+            if warn:
+                warn(f'Warning: Failed to decode event: {e}. Stopping read')
+            break
+        for tag, value in scalars:
+            if not tag_filter(tag):
+                continue
+            tags.append(tag)
+            steps.append(step)
+            wall_times.append(wall_time)
+            values.append(value)
+        if len(steps) >= chunk_rows:
+            yield chunk
+            chunk = _empty_chunk()
+            tags, steps, wall_times, values = chunk['tag'], chunk['step'], chunk['wall_time'], chunk['value']
+    if steps:
+        yield chunk
+
+
+def _empty_chunk() -> Dict[str, list]:
+    return {'tag': [], 'step': [], 'wall_time': [], 'value': []}
+
+
+class CsvWriter(object):
+    def __init__(self, path: str, run: str):
+        self.run = run
+        self._f = open(path, 'w', newline='')
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(('run', 'tag', 'step', 'wall_time', 'value'))
+
+    def write(self, chunk: Dict[str, list]):
+        run = self.run
+        self._writer.writerows(
+            (run, t, s, w, v) for t, s, w, v in zip(chunk['tag'], chunk['step'], chunk['wall_time'], chunk['value']))
+
+    def close(self):
+        self._f.close()
+
+
+class JsonlWriter(object):
+    def __init__(self, path: str, run: str):
+        self.run = run
+        self._f = open(path, 'w')
+
+    def write(self, chunk: Dict[str, list]):
+        run = self.run
+        self._f.writelines(
+            json.dumps({'run': run, 'tag': t, 'step': s, 'wall_time': w, 'value': v}) + '\n'
+            for t, s, w, v in zip(chunk['tag'], chunk['step'], chunk['wall_time'], chunk['value']))
+
+    def close(self):
+        self._f.close()
+
+
+class NpzWriter(object):
+    """Streams columns to raw temporary files, then assembles the .npz with
+    npy headers on close, so no column is ever held in memory whole.
+    """
+    COLUMNS = (('tag_index', '<i4'), ('step', '<i8'), ('wall_time', '<f8'), ('value', '<f8'))
+
+    def __init__(self, path: str, run: str):
+        import tempfile
+        import numpy as np
+        self._np = np
+        self.path = path
+        self.run = run
+        self.rows = 0
+        self._tags: Dict[str, int] = {}
+        self._tmpdir = tempfile.mkdtemp(prefix='.tbview-npz-', dir=os.path.dirname(os.path.abspath(path)))
+        self._files = {name: open(os.path.join(self._tmpdir, name), 'wb') for name, _dtype in self.COLUMNS}
+
+    def write(self, chunk: Dict[str, list]):
+        np = self._np
+        tags = self._tags
+        columns = {
+            'tag_index': [tags.setdefault(t, len(tags)) for t in chunk['tag']],
+            'step': chunk['step'],
+            'wall_time': chunk['wall_time'],
+            'value': chunk['value'],
+        }
+        for name, dtype in self.COLUMNS:
+            np.asarray(columns[name], dtype=dtype).tofile(self._files[name])
+        self.rows += len(chunk['step'])
+
+    def close(self):
+        import shutil
+        import zipfile
+        np = self._np
+        try:
+            for f in self._files.values():
+                f.close()
+            with zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+                for name, dtype in self.COLUMNS:
+                    with zf.open(name + '.npy', 'w', force_zip64=True) as out:
+                        np.lib.format.write_array_header_1_0(
+                            out, {'descr': dtype, 'fortran_order': False, 'shape': (self.rows,)})
+                        with open(os.path.join(self._tmpdir, name), 'rb') as src:
+                            shutil.copyfileobj(src, out, 1 << 20)
+                for name, arr in (('tags', np.array(list(self._tags), dtype=str)), ('run', np.array(self.run))):
+                    with zf.open(name + '.npy', 'w') as out:
+                        np.lib.format.write_array(out, arr, allow_pickle=False)
+        finally:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+
+class _ArrowWriterBase(object):
+    def __init__(self, path: str, run: str):
+        import pyarrow as pa
+        self._pa = pa
+        self.run = run
+        self.schema = pa.schema([
+            ('run', pa.string()),
+            ('tag', pa.string()),
+            ('step', pa.int64()),
+            ('wall_time', pa.float64()),
+            ('value', pa.float64()),
+        ])
+
+    def _batch(self, chunk: Dict[str, list]):
+        pa = self._pa
+        n = len(chunk['step'])
+        return pa.RecordBatch.from_arrays([
+            pa.array([self.run] * n, pa.string()),
+            pa.array(chunk['tag'], pa.string()),
+            pa.array(chunk['step'], pa.int64()),
+            pa.array(chunk['wall_time'], pa.float64()),
+            pa.array(chunk['value'], pa.float64()),
+        ], schema=self.schema)
+
+
+class ParquetWriter(_ArrowWriterBase):
+    def __init__(self, path: str, run: str):
+        super(ParquetWriter, self).__init__(path, run)
+        import pyarrow.parquet as pq
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, chunk: Dict[str, list]):
+        self._writer.write_table(self._pa.Table.from_batches([self._batch(chunk)]))
+
+    def close(self):
+        self._writer.close()
+
+
+class ArrowWriter(_ArrowWriterBase):
+    def __init__(self, path: str, run: str):
+        super(ArrowWriter, self).__init__(path, run)
+        self._writer = self._pa.ipc.new_file(path, self.schema)
+
+    def write(self, chunk: Dict[str, list]):
+        self._writer.write_batch(self._batch(chunk))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'jsonl': JsonlWriter,
+    'npz': NpzWriter,
+    'parquet': ParquetWriter,
+    'arrow': ArrowWriter,
+}
+
+
+def export_file(path: str, out_path: str, fmt: str, run: str = '', include: Sequence[str] = (),
+                exclude: Sequence[str] = (), chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """Export the scalars of one event file; returns row and timing stats."""
+    start = time.perf_counter()
+    warnings = []
+    writer = WRITERS[fmt](out_path, run)
+    rows = 0
+    try:
+        for chunk in iter_scalar_chunks(path, TagFilter(include, exclude), chunk_rows, warn=warnings.append):
+            writer.write(chunk)
+            rows += len(chunk['step'])
+    finally:
+        writer.close()
+    return {
+        'path': path,
+        'out': out_path,
+        'rows': rows,
+        'bytes_in': os.path.getsize(path),
+        'seconds': time.perf_counter() - start,
+        'warnings': warnings,
+    }
+
+
+def _export_job(job: Tuple) -> dict:
+    return export_file(*job)
+
+
+def find_event_files(root: str) -> List[str]:
+    from tbview.cli import is_event_file
+    found = []
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            if is_event_file(name):
+                found.append(os.path.join(dirpath, name))
+    return sorted(found)
+
+
+def plan_jobs(path: str, out: Optional[str], fmt: str, include=(), exclude=(),
+              chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Tuple]:
+    """Map inputs to (path, out_path, fmt, run, include, exclude, chunk_rows) jobs.
+
+    A single file goes to `out` (default: next to the input); a directory
+    yields one output per event file under `out`, named after its relative path.
+    """
+    ext = EXTENSIONS[fmt]
+    path = os.path.abspath(path)
+    if os.path.isfile(path):
+        out_path = out or path + ext
+        run = os.path.basename(os.path.dirname(path))
+        return [(path, out_path, fmt, run, list(include), list(exclude), chunk_rows)]
+    out_dir = out or 'tbview-export'
+    jobs = []
+    for event_path in find_event_files(path):
+        rel = os.path.relpath(event_path, path)
+        run = os.path.dirname(rel) or '.'
+        out_path = os.path.join(out_dir, rel.replace(os.sep, '__') + ext)
+        jobs.append((event_path, out_path, fmt, run, list(include), list(exclude), chunk_rows))
+    return jobs
+
+
+def run_export(jobs: List[Tuple], workers: int = 1, progress=lambda stats: None) -> List[dict]:
+    for job in jobs:
+        out_dir = os.path.dirname(os.path.abspath(job[1]))
+        os.makedirs(out_dir, exist_ok=True)
+    results = []
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            results.append(_export_job(job))
+            progress(results[-1])
+        return results
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(_export_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))):
+            results.append(stats)
+            progress(stats)
+    return results
+
+
+def infer_format(out: Optional[str]) -> str:
+    if out:
+        ext = os.path.splitext(out)[1].lower()
+        for fmt, fmt_ext in EXTENSIONS.items():
+            if ext == fmt_ext:
+                return fmt
+    return 'csv'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='tbview export', description='export scalars from event files')
+    parser.add_argument('path', help='event file or directory of runs')
+    parser.add_argument('-f', '--format', choices=FORMATS, default=None,
+                        help='output format (default: from --out extension, else csv)')
+    parser.add_argument('-o', '--out', default=None,
+                        help='output file for a single event file, or output directory for a directory')
+    parser.add_argument('--tag', action='append', default=[], metavar='GLOB',
+                        help='only export tags matching GLOB (repeatable)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='skip tags matching GLOB (repeatable)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='worker processes for directories (default: CPU count)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f'rows buffered per write (default {DEFAULT_CHUNK_ROWS})')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f'{args.path} is not a valid file or directory')
+    fmt = args.format or (infer_format(args.out) if os.path.isfile(args.path) else 'csv')
+    jobs = plan_jobs(args.path, args.out, fmt, args.tag, args.exclude, max(1, args.chunk_rows))
+    if not jobs:
+        print(f'No event file found in {args.path}', file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+
+    def report(stats):
+        for msg in stats['warnings']:
+            print(f"{stats['path']}: {msg}", file=sys.stderr)
+        print(f"{stats['rows']:>10,} rows  {stats['out']}")
+
+    try:
+        results = run_export(jobs, workers=args.jobs, progress=report)
+    except ImportError as e:
+        print(f'{fmt} export needs an optional dependency: {e}', file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    rows = sum(r['rows'] for r in results)
+    mb = sum(r['bytes_in'] for r in results) / (1024.0 * 1024.0)
+    print(f'exported {rows:,} rows from {len(results)} file(s) ({mb:.1f} MB) in {elapsed:.2f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Streaming HDF5 export for `tbview <event file> -h5`.
+
+Each scalar tag becomes a group (nested on '/', as before) with resizable,
+chunked `steps`, `values` and `wall_time` datasets. Records are appended in
+batches as they are parsed, so memory is bounded by the batch size, and the
+byte offset of the last consumed record is stored in the file attributes.
+With `follow`, the writer keeps polling the event file and appends new
+records from that offset; an existing output of the same source is resumed
+instead of rewritten.
+
+A one-shot export ends by rewriting each tag sorted by step, keeping the
+last value written for a repeated step (as a restarted trainer produces).
+With `follow` rows stay in file order, so repeated steps show up more than
+once. Datasets are uncompressed unless a compression filter is asked for.
+"""
+
+import os
+import struct
+import time
+from typing import Callable, Dict, List, Optional
+
+from tbview.parser import decode_scalars, read_payloads_from_offset
+
+COMPRESSIONS = ('gzip', 'lzf', 'none')
+DATASETS = (('steps', 'int64'), ('values', 'float32'), ('wall_time', 'float64'))
+
+
+def default_output_path(event_path: str) -> str:
+    return os.path.dirname(event_path) + os.sep + '[hdf5]' + os.path.basename(event_path) + '.h5'
+
+
+class Hdf5Writer(object):
+    """Append-only writer of per-tag scalar series into an HDF5 file."""
+
+    def __init__(self, path: str, source: str, compression: Optional[str] = None,
+                 chunk_rows: int = 4096, batch_rows: int = 65536, resume: bool = False):
+        import h5py
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.compression = None if compression in (None, 'none') else compression
+        self.chunk_rows = chunk_rows
+        self.batch_rows = batch_rows
+        self.offset = 0
+        self.rows = 0
+        self._pending: Dict[str, List[list]] = {}
+        self._pending_rows = 0
+        # End offset and pending row count after the last complete record
+        self._consumed = 0
+        self._consumed_rows = 0
+        # Offset of an undecodable record that stopped the last consume()
+        self.stopped_at: Optional[int] = None
+        hf = None
+        if resume and os.path.exists(path):
+            hf = h5py.File(path, 'a')
+            if hf.attrs.get('source_path') == self.source and hf.attrs.get('source_offset', 0) <= os.path.getsize(source):
+                self.offset = int(hf.attrs['source_offset'])
+            else:
+                hf.close()
+                hf = None
+        if hf is None:
+            hf = h5py.File(path, 'w')
+            hf.attrs['source_path'] = self.source
+            hf.attrs['source_offset'] = 0
+        self._hf = hf
+        self._consumed = self.offset
+
+    def add(self, tag: str, step: int, value: float, wall_time: float):
+        pending = self._pending.get(tag)
+        if pending is None:
+            pending = self._pending[tag] = [[], [], []]
+        pending[0].append(step)
+        pending[1].append(value)
+        pending[2].append(wall_time)
+        self._pending_rows += 1
+
+    def _datasets(self, tag: str):
+        hf = self._hf
+        if tag in hf:
+            group = hf[tag]
+        else:
+            group = hf.create_group(tag)
+            for name, dtype in DATASETS:
+                group.create_dataset(name, shape=(0,), maxshape=(None,), dtype=dtype,
+                                     chunks=(self.chunk_rows,), compression=self.compression)
+        return [group[name] for name, _dtype in DATASETS]
+
+    def flush(self, offset: Optional[int] = None):
+        """Write buffered rows and record `offset` as fully consumed."""
+        import numpy as np
+        for tag, columns in self._pending.items():
+            n = len(columns[0])
+            for dset, (_name, dtype), column in zip(self._datasets(tag), DATASETS, columns):
+                start = dset.shape[0]
+                dset.resize((start + n,))
+                dset[start:] = np.asarray(column, dtype=dtype)
+        self.rows += self._pending_rows
+        self._pending = {}
+        self._pending_rows = 0
+        self._consumed_rows = 0
+        if offset is not None:
+            self.offset = offset
+            self._hf.attrs['source_offset'] = offset
+        self._hf.flush()
+
+    def consume(self, warn: Optional[Callable[[str], None]] = None) -> int:
+        """Append every complete record after the stored offset; returns rows added."""
+        before = self.rows + self._pending_rows
+        self.stopped_at = None
+        for payload, end_offset in read_payloads_from_offset(self.source, self.offset, warn=warn):
+            try:
+                step, wall_time, scalars = decode_scalars(payload)
+            except (IndexError, ValueError, struct.error) as e:
+                # The stored offset stays before the record, so it is not lost
+                self.stopped_at = end_offset - len(payload) - 16
+                if warn:
+                    warn(f'Warning: Failed to decode event at offset {self.stopped_at}: {e}. Stopping read')
+                break
+            for tag, value in scalars:
+                self.add(tag, step, value, wall_time)
+            self._consumed = end_offset
+            self._consumed_rows = self._pending_rows
+            if self._pending_rows >= self.batch_rows:
+                self.flush(end_offset)
+        self.flush(self._consumed)
+        return self.rows - before
+
+    def deduplicate(self):
+        """Rewrite every tag sorted by step, keeping the last row of each step."""
+        import h5py
+        import numpy as np
+        groups = []
+        self._hf.visititems(lambda name, obj: groups.append(obj)
+                            if isinstance(obj, h5py.Group) and 'steps' in obj else None)
+        for group in groups:
+            columns = [group[name][:] for name, _dtype in DATASETS]
+            # np.unique keeps the first occurrence: reverse so the last one wins
+            _steps, first = np.unique(columns[0][::-1], return_index=True)
+            keep = len(columns[0]) - 1 - first
+            if len(keep) == len(columns[0]) and np.all(keep[1:] > keep[:-1]):
+                continue
+            for (name, _dtype), column in zip(DATASETS, columns):
+                group[name].resize((len(keep),))
+                group[name][:] = column[keep]
+        self._hf.flush()
+
+    def close(self):
+        """Write the rows of completely consumed records with their offset.
+
+        After an interruption in the middle of a record its rows are dropped
+        with the rest of the batch, and the stored offset still points before
+        them, so a resumed export reads them again instead of duplicating.
+        """
+        if self._hf is not None:
+            if self._pending_rows != self._consumed_rows:
+                self._pending = {}
+                self._pending_rows = 0
+                self.flush()
+            else:
+                self.flush(self._consumed)
+            self._hf.close()
+            self._hf = None
+
+
+def export_hdf5(event_path: str, out_path: Optional[str] = None, follow: bool = False,
+                compression: Optional[str] = None, batch_rows: int = 65536, poll_interval: float = 1.0,
+                warn: Optional[Callable[[str], None]] = None, log: Callable[[str], None] = print,
+                should_stop: Callable[[], bool] = lambda: False) -> str:
+    """Export `event_path` to HDF5; with `follow`, keep appending until interrupted."""
+    out_path = out_path or default_output_path(event_path)
+    writer = Hdf5Writer(out_path, event_path, compression=compression, batch_rows=batch_rows, resume=follow)
+    if writer.offset:
+        log(f'resuming {out_path} from offset {writer.offset}')
+    try:
+        added = writer.consume(warn=warn)
+        log(f'wrote {added} rows to {out_path}')
+        if not follow:
+            writer.deduplicate()
+            return out_path
+        if writer.stopped_at is not None:
+            return out_path
+        log('following for new records (Ctrl+C to stop)')
+        last_size = os.path.getsize(event_path)
+        while not should_stop():
+            time.sleep(poll_interval)
+            try:
+                size = os.path.getsize(event_path)
+            except OSError:
+                continue
+            if size < writer.offset:
+                log(f'{event_path} shrank below the exported offset; stopping')
+                break
+            if size == last_size:
+                continue
+            last_size = size
+            added = writer.consume(warn=warn)
+            if added:
+                log(f'appended {added} rows (offset {writer.offset})')
+            if writer.stopped_at is not None:
+                log(f'undecodable record at offset {writer.stopped_at}; stopping')
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+    return out_path
@@ -0,0 +1,200 @@
+"""Headless rendering: drive a TensorboardViewer without a TTY.
+
+Frames are rendered at a fixed size into an in-memory `ScreenBuffer` that
+interprets the cursor-positioning output of the dashing tiles, so the render
+path can be timed in CI and its final frame compared against golden text.
+
+Key scripts list one keystroke per line: a literal character (`s`, `/`), a
+blessed key name (`KEY_DOWN`, `KEY_ENTER`, `KEY_ESCAPE`), or `text:<chars>`
+for several characters. Blank lines and lines starting with `#` are ignored.
+"""
+
+import io
+import json
+import re
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import blessed
+from blessed.keyboard import Keystroke
+
+from tbview.perf import percentile
+
+_ESCAPE_RE = re.compile(
+    r'(\x1b\[[0-9;?]*[ -/]*[@-~])'   # CSI sequences (cursor moves, SGR, ...)
+    r'|(\x1b[()][0-9A-Za-z])'          # charset designation from t.normal
+    r'|(\x1b.)'                        # other two-byte escapes
+    r'|(\n)|(\r)'
+    r'|([^\x1b\n\r]+)'
+)
+
+_KEY_CHARS = {'KEY_ENTER': '\n', 'KEY_ESCAPE': '\x1b', 'KEY_BACKSPACE': '\x7f', 'KEY_TAB': '\t'}
+
+
+class HeadlessTerminal(blessed.Terminal):
+    """blessed Terminal with a fixed size that writes to an in-memory stream."""
+
+    def __init__(self, width: int, height: int, kind: str = 'xterm-256color'):
+        super(HeadlessTerminal, self).__init__(kind=kind, stream=io.StringIO(), force_styling=True)
+        self._headless_size = (int(width), int(height))
+
+    @property
+    def width(self):
+        return self._headless_size[0]
+
+    @property
+    def height(self):
+        return self._headless_size[1]
+
+
+class ScreenBuffer(object):
+    """Minimal VT screen model: cursor addressing, newlines and text.
+
+    Styling sequences are consumed and dropped; text past the right edge is
+    clipped rather than wrapped.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.rows = [[' '] * width for _ in range(height)]
+        self.row = 0
+        self.col = 0
+
+    def feed(self, data: str):
+        for m in _ESCAPE_RE.finditer(data):
+            csi, _charset, _other, newline, carriage, text = m.groups()
+            if text is not None:
+                self._write(text)
+            elif csi is not None:
+                if csi[-1] in 'Hf':
+                    params = csi[2:-1].split(';')
+                    row = int(params[0]) if params and params[0] else 1
+                    col = int(params[1]) if len(params) > 1 and params[1] else 1
+                    self.row = row - 1
+                    self.col = col - 1
+            elif newline is not None:
+                self.row += 1
+                self.col = 0
+            elif carriage is not None:
+                self.col = 0
+
+    def _write(self, text: str):
+        if not 0 <= self.row < self.height:
+            self.col += len(text)
+            return
+        line = self.rows[self.row]
+        for ch in text:
+            if 0 <= self.col < self.width:
+                line[self.col] = ch
+            self.col += 1
+
+    def lines(self) -> List[str]:
+        return [''.join(r).rstrip() for r in self.rows]
+
+    def text(self) -> str:
+        return '\n'.join(self.lines()).rstrip('\n') + '\n'
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    """Parse 'WIDTHxHEIGHT' (e.g. '160x48')."""
+    try:
+        w, h = value.lower().split('x', 1)
+        w, h = int(w), int(h)
+    except ValueError:
+        raise ValueError(f'invalid size {value!r}, expected WIDTHxHEIGHT')
+    if w < 20 or h < 10:
+        raise ValueError(f'size {value!r} is too small (minimum 20x10)')
+    return w, h
+
+
+def parse_keys(lines: Iterable[str], term: blessed.Terminal) -> List[Keystroke]:
+    keys = []
+    for raw in lines:
+        line = raw.rstrip('\n')
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if line.startswith('text:'):
+            keys.extend(Keystroke(ch) for ch in line[len('text:'):])
+        elif line.strip().startswith('KEY_'):
+            name = line.strip()
+            code = getattr(term, name, None)
+            if code is None:
+                raise ValueError(f'unknown key name {name!r}')
+            keys.append(Keystroke(_KEY_CHARS.get(name, ''), code=code, name=name))
+        elif len(line) == 1:
+            keys.append(Keystroke(line))
+        else:
+            raise ValueError(f'cannot parse key script line {line!r}')
+    return keys
+
+
+def load_keys(path: str, term: blessed.Terminal) -> List[Keystroke]:
+    with open(path) as f:
+        return parse_keys(f, term)
+
+
+def run_headless(viewer, frames: Optional[int] = None, keys: Iterable[Keystroke] = ()) -> dict:
+    """Render `frames` frames, applying one scripted key before each frame
+    after the first. Without `frames`, renders until the keys run out.
+
+    Returns per-frame timings, a latency summary and the final screen text.
+    """
+    keys = list(keys)
+    if frames is None:
+        frames = len(keys) + 1
+    term = viewer.term
+    screen = ScreenBuffer(term.width, term.height)
+    records = []
+    for i in range(frames):
+        key = keys[i - 1] if 0 < i <= len(keys) else None
+        input_s = 0.0
+        if key is not None:
+            start = time.perf_counter()
+            viewer.handle_input(key)
+            input_s = time.perf_counter() - start
+        start = time.perf_counter()
+        frame = viewer.render_frame()
+        render_s = time.perf_counter() - start
+        screen.feed(frame)
+        records.append({
+            'frame': i,
+            'key': None if key is None else (key.name or str(key)),
+            'input_ms': input_s * 1000.0,
+            'render_ms': render_s * 1000.0,
+            'bytes': len(frame),
+        })
+        if viewer._quit_and_reselect:
+            break
+    render_ms = sorted(r['render_ms'] for r in records)
+    return {
+        'width': term.width,
+        'height': term.height,
+        'frames': records,
+        'summary': {
+            'frames': len(records),
+            'mean_ms': sum(render_ms) / len(render_ms) if render_ms else 0.0,
+            'p50_ms': percentile(render_ms, 50),
+            'p95_ms': percentile(render_ms, 95),
+            'p99_ms': percentile(render_ms, 99),
+            'max_ms': render_ms[-1] if render_ms else 0.0,
+        },
+        'final_frame': screen.text(),
+    }
+
+
+def format_summary(result: dict) -> str:
+    s = result['summary']
+    return (f"{s['frames']} frames at {result['width']}x{result['height']}: "
+            f"mean {s['mean_ms']:.2f}ms p50 {s['p50_ms']:.2f}ms p95 {s['p95_ms']:.2f}ms "
+            f"p99 {s['p99_ms']:.2f}ms max {s['max_ms']:.2f}ms")
+
+
+def write_outputs(result: dict, timings_out: Optional[str] = None, dump_frame: Optional[str] = None):
+    if timings_out:
+        payload = {k: v for k, v in result.items() if k != 'final_frame'}
+        with open(timings_out, 'w') as f:
+            json.dump(payload, f, indent=2)
+    if dump_frame:
+        with open(dump_frame, 'w') as f:
+            f.write(result['final_frame'])
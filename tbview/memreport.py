@@ -0,0 +1,133 @@
+"""Memory accounting for a viewer session (`--mem-report`, 'r' panel).
+
+Sizes are estimates from `sys.getsizeof` on the containers the viewer keeps:
+loaded series (step -> value and step -> wall_time dicts), the per-tag record
+offsets collected by scans, the log tile and the render caches. With
+`--mem-trace`, `tracemalloc` runs from startup and the report also lists the
+source lines holding the most memory.
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+from typing import List, Optional
+
+from tbview.runcache import get_run_cache
+from tbview.series import format_bytes
+
+_FLOAT_BYTES = sys.getsizeof(0.5)
+_INT_BYTES = sys.getsizeof(1 << 20)
+
+
+def series_nbytes(values: dict, times: dict) -> int:
+    """Estimate the bytes held by one series without walking its points.
+
+    Steps are shared by both dicts; small cached ints are counted anyway.
+    """
+    return (sys.getsizeof(values) + sys.getsizeof(times)
+            + len(values) * (_FLOAT_BYTES + _INT_BYTES) + len(times) * _FLOAT_BYTES)
+
+
+def offsets_nbytes(offsets_by_tag: dict) -> int:
+    return sys.getsizeof(offsets_by_tag) + sum(sys.getsizeof(a) for a in offsets_by_tag.values())
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def start_tracing(frames: int = 1):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def tracemalloc_top(limit: int = 20) -> Optional[List[dict]]:
+    """Source lines holding the most traced memory, or None when not tracing."""
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    out = []
+    for stat in snapshot.statistics('lineno')[:limit]:
+        frame = stat.traceback[0]
+        out.append({'file': frame.filename, 'line': frame.lineno, 'bytes': stat.size, 'count': stat.count})
+    return out
+
+
+def memory_report(viewer, deep: bool = False, top: int = 20) -> dict:
+    """Collect estimated memory use of `viewer` per run and tag."""
+    runs = []
+    series = []
+    for run_tag in viewer.run_tags:
+        records = viewer.records_by_run.get(run_tag, {})
+        times = viewer.wall_times_by_run.get(run_tag, {})
+        run_bytes = 0
+        run_points = 0
+        for tag, values in records.items():
+            nbytes = series_nbytes(values, times.get(tag, {}))
+            series.append({'run': run_tag, 'tag': tag, 'points': len(values), 'bytes': nbytes})
+            run_bytes += nbytes
+            run_points += len(values)
+        offsets = viewer._tag_offsets_by_run.get(run_tag, {})
+        runs.append({
+            'run': run_tag,
+            'tags': len(offsets),
+            'loaded': len(records),
+            'points': run_points,
+            'series_bytes': run_bytes,
+            'offset_index_bytes': offsets_nbytes(offsets),
+        })
+    series.sort(key=lambda s: s['bytes'], reverse=True)
+    grid = viewer._grid
+    ui = {
+        'log': viewer.logger.nbytes(),
+        'plot_cache': viewer.plot_tile.cache_nbytes(),
+        'grid_cache': grid.cache_nbytes() if grid is not None else 0,
+        'tag_list': viewer.tag_selector.cache_nbytes(),
+    }
+    budget = viewer.series_budget
+    run_cache = get_run_cache()
+    report = {
+        'rss_bytes': rss_bytes(),
+        'series_bytes': sum(r['series_bytes'] for r in runs),
+        'offset_index_bytes': sum(r['offset_index_bytes'] for r in runs),
+        'ui_bytes': sum(ui.values()),
+        'budget': {'max_bytes': budget.max_bytes, 'estimated_bytes': budget.total},
+        'run_cache': {'max_bytes': run_cache.max_bytes, 'estimated_bytes': run_cache.total, 'runs': len(run_cache)},
+        'runs': runs,
+        'series': series,
+        'ui': ui,
+    }
+    if deep:
+        report['tracemalloc'] = tracemalloc_top(top)
+    return report
+
+
+def format_panel(report: dict, top: int = 8) -> List[str]:
+    """Short text lines for the viewer's memory panel."""
+    lines = [
+        f" rss     {format_bytes(report['rss_bytes'])}",
+        f" series  {format_bytes(report['series_bytes'])}",
+        f" offsets {format_bytes(report['offset_index_bytes'])}",
+        f" ui      {format_bytes(report['ui_bytes'])}",
+        '',
+    ]
+    for s in report['series'][:top]:
+        lines.append(f" {format_bytes(s['bytes']):>8} {s['run']}:{s['tag']}")
+    return lines
+
+
+def write_report(report: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -1,8 +1,21 @@
 import struct
-from tbview.tf_protobuf.event_pb2 import Event
-from tbview.tf_protobuf.summary_pb2 import Summary
 from tbview.crc32c import masked_crc32c
-from typing import Iterator, Tuple, Callable, Optional
+from tbview.trace import get_tracer
+from typing import TYPE_CHECKING, Iterator, List, Tuple, Callable, Optional
+
+if TYPE_CHECKING:
+    from tbview.tf_protobuf.event_pb2 import Event
+
+MAX_RECORD_BYTES = 64 * 1024 * 1024  # 64MB safety cap
+_DOUBLE = struct.Struct('<d')
+_FLOAT = struct.Struct('<f')
+_BISECT_MIN_SPAN = 64 * 1024
+
+def _event_class():
+    # The generated descriptors take tens of milliseconds to import, and
+    # callers decoding with `decode_scalars` never need them
+    from tbview.tf_protobuf.event_pb2 import Event
+    return Event
 
 def test_crc32c(data: bytes, crc_bytes: bytes) -> bool:
     """Validate masked CRC32C against provided bytes.
@@ -15,22 +28,57 @@ def test_crc32c(data: bytes, crc_bytes: bytes) -> bool:
     actual_crc = masked_crc32c(data)
     return expected_crc == actual_crc
 
-def read_records(file_path, warn: Optional[Callable[[str], None]] = None):
+def read_records(file_path, warn: Optional[Callable[[str], None]] = None, resync: bool = False):
     """Stream all `Event` protos from a TensorBoard TFRecord file.
 
     This function validates CRCs, guards against unreasonable record sizes,
     and stops gracefully when corruption is detected to avoid MemoryError.
+    With `resync`, corrupt regions are skipped instead (see
+    `read_payloads_from_offset`).
+    """
+    def _warn(msg: str):
+        if warn:
+            warn(msg)
+        else:
+            print(msg)
+    event_class = _event_class()
+    for event_raw, _end in read_payloads_from_offset(file_path, 0, warn=_warn, resync=resync):
+        # Parse event proto
+        try:
+            event = event_class()
+            event.ParseFromString(event_raw)
+        except Exception as e:
+            _warn(f'Warning: Failed to parse Event proto: {e}. Stopping read')
+            break
+        yield event
+
+
+def read_payloads_from_offset(file_path: str, start_offset: int = 0, warn: Optional[Callable[[str], None]] = None,
+                              end_offset: Optional[int] = None, resync: bool = False) -> Iterator[Tuple[bytes, int]]:
+    """Read raw, CRC-checked record payloads starting from a file offset.
+
+    Yields tuples of (payload, end_offset) without decoding the payload, for
+    callers that decode it themselves (see `decode_scalars`).
+
+    Records whose header starts at or after `end_offset` are not read, so a
+    file can be split into ranges parsed independently (see
+    `split_record_ranges`). With `resync`, an invalid length or payload CRC
+    (including a `start_offset` that is not on a record boundary) is skipped
+    by searching forward for the next valid record. A truncated record
+    always stops the read, since it may still be being written.
     """
-    MAX_RECORD_BYTES = 64 * 1024 * 1024  # 64MB safety cap
     def _warn(msg: str):
         if warn:
             warn(msg)
         else:
             print(msg)
     with open(file_path, 'rb') as f:
+        if start_offset:
+            f.seek(start_offset)
         while True:
-            # Read length header (8 bytes) and its CRC (4 bytes)
-            length_pos = f.tell()
+            header_pos = f.tell()
+            if end_offset is not None and header_pos >= end_offset:
+                break
             length_raw = f.read(8)
             if not length_raw:
                 break
@@ -38,79 +86,347 @@ def read_records(file_path, warn: Optional[Callable[[str], None]] = None):
             if len(length_raw) < 8 or len(length_crc) < 4:
                 _warn('Warning: Truncated record header encountered, stopping read')
                 break
+            error = None
             if not test_crc32c(length_raw, length_crc):
-                _warn(f'Warning: Invalid length CRC at offset {length_pos}, stopping read')
-                break
-            length = struct.unpack('Q', length_raw)[0]
-            if length <= 0 or length > MAX_RECORD_BYTES:
-                _warn(f'Warning: Unreasonable record length {length} at offset {length_pos}, stopping read')
+                error = f'Invalid length CRC at offset {header_pos}'
+            else:
+                length = struct.unpack('Q', length_raw)[0]
+                if length <= 0 or length > MAX_RECORD_BYTES:
+                    error = f'Unreasonable record length {length} at offset {header_pos}'
+                else:
+                    event_raw = f.read(length)
+                    payload_crc = f.read(4)
+                    if len(event_raw) != length or len(payload_crc) < 4:
+                        _warn('Warning: Truncated record payload encountered, stopping read')
+                        break
+                    if not test_crc32c(event_raw, payload_crc):
+                        error = f'Invalid payload CRC at offset {header_pos}'
+            if error is None:
+                yield event_raw, f.tell()
+                continue
+            next_pos = find_record_boundary(f, header_pos + 1, limit=end_offset) if resync else None
+            if next_pos is None:
+                _warn(f'Warning: {error}, stopping read')
                 break
+            _warn(f'Warning: {error}, skipped {next_pos - header_pos} bytes to the next valid record')
+            f.seek(next_pos)
 
-            # Read payload and validate its CRC
-            event_raw = f.read(length)
-            if len(event_raw) != length:
-                _warn('Warning: Truncated record payload encountered, stopping read')
-                break
-            payload_crc = f.read(4)
-            if len(payload_crc) < 4 or not test_crc32c(event_raw, payload_crc):
-                _warn('Warning: Invalid payload CRC, stopping read')
-                break
-
-            # Parse event proto
-            try:
-                event = Event()
-                event.ParseFromString(event_raw)
-            except Exception as e:
-                _warn(f'Warning: Failed to parse Event proto: {e}. Stopping read')
-                break
-            yield event
 
-
-def read_records_from_offset(file_path: str, start_offset: int = 0, warn: Optional[Callable[[str], None]] = None) -> Iterator[Tuple[Event, int]]:
+def read_records_from_offset(file_path: str, start_offset: int = 0, warn: Optional[Callable[[str], None]] = None,
+                             end_offset: Optional[int] = None, resync: bool = False) -> Iterator[Tuple['Event', int]]:
     """Read tensorboard events starting from a file offset.
 
     Yields tuples of (Event, end_offset) where end_offset is the file position
     immediately after reading the event and its CRC trailer. This enables
     incremental reading by resuming from the last offset next time.
+    `end_offset` and `resync` are passed to `read_payloads_from_offset`.
     """
-    MAX_RECORD_BYTES = 64 * 1024 * 1024  # 64MB safety cap
     def _warn(msg: str):
         if warn:
             warn(msg)
         else:
             print(msg)
+    # The span stays open while the caller consumes records, so it covers
+    # parsing plus the caller's per-record work
+    event_class = _event_class()
+    records = 0
+    last_offset = start_offset
+    with get_tracer().span('read_records_from_offset', cat='parser', path=file_path, start_offset=start_offset) as span:
+        try:
+            for event_raw, last_offset in read_payloads_from_offset(file_path, start_offset, warn=_warn,
+                                                                    end_offset=end_offset, resync=resync):
+                try:
+                    event = event_class()
+                    event.ParseFromString(event_raw)
+                except Exception as e:
+                    _warn(f'Warning: Failed to parse Event proto: {e}. Stopping read')
+                    break
+                records += 1
+                yield event, last_offset
+        finally:
+            # Also reached when the caller stops consuming early
+            span.set(records=records, bytes=last_offset - start_offset)
+
+
+def read_payloads_at(file_path: str, offsets) -> Iterator[bytes]:
+    """Yield the payloads of the records starting at `offsets`.
+
+    The offsets must come from an earlier validated read (e.g. a tag
+    discovery pass), so CRCs are not checked again.
+    """
     with open(file_path, 'rb') as f:
-        if start_offset:
-            f.seek(start_offset)
-        while True:
-            header_pos = f.tell()
-            length_raw = f.read(8)
-            if not length_raw:
+        for offset in offsets:
+            f.seek(offset)
+            header = f.read(12)
+            if len(header) < 12:
                 break
-            length_crc = f.read(4)
-            if len(length_raw) < 8 or len(length_crc) < 4:
-                _warn('Warning: Truncated record header encountered, stopping read')
+            length = struct.unpack_from('Q', header)[0]
+            payload = f.read(length)
+            if len(payload) != length:
                 break
-            if not test_crc32c(length_raw, length_crc):
-                _warn(f'Warning: Invalid length CRC at offset {header_pos}, stopping read')
+            yield payload
+
+def find_record_boundary(f, offset: int, limit: Optional[int] = None, verify_payload: bool = True) -> Optional[int]:
+    """Return the first offset >= `offset` where a valid record starts.
+
+    A position qualifies when its 8-byte length is sane, the masked CRC of
+    the length matches, and (with `verify_payload`) the payload CRC matches
+    as well. Only positions before `limit` (default: end of file) are
+    considered. `f` is a binary file object; its position is not preserved.
+    Returns None when no boundary is found.
+    """
+    if limit is None:
+        f.seek(0, 2)
+        limit = f.tell()
+    block = 1 << 16
+    pos = max(0, offset)
+    while pos < limit:
+        f.seek(pos)
+        # Overlap blocks by one header so candidates near the edge are complete
+        data = f.read(min(block, limit - pos) + 11)
+        scan_end = min(len(data) - 11, limit - pos)
+        i = 0
+        while i < scan_end:
+            # Lengths are < MAX_RECORD_BYTES, so the high half of the
+            # little-endian length is zero: cheap prefilter before any CRC
+            q = data.find(b'\x00\x00\x00\x00', i + 4)
+            if q < 0 or q - 4 >= scan_end:
                 break
-            length = struct.unpack('Q', length_raw)[0]
+            cand = q - 4
+            i = cand + 1
+            length = struct.unpack_from('Q', data, cand)[0]
             if length <= 0 or length > MAX_RECORD_BYTES:
-                _warn(f'Warning: Unreasonable record length {length} at offset {header_pos}, stopping read')
-                break
+                continue
+            if not test_crc32c(data[cand:cand + 8], data[cand + 8:cand + 12]):
+                continue
+            if verify_payload:
+                f.seek(pos + cand + 12)
+                payload = f.read(length)
+                if len(payload) != length or not test_crc32c(payload, f.read(4)):
+                    continue
+            return pos + cand
+        pos += max(scan_end, 1)
+    return None
 
-            event_raw = f.read(length)
-            if len(event_raw) != length:
-                _warn('Warning: Truncated record payload encountered, stopping read')
-                break
-            payload_crc = f.read(4)
-            if len(payload_crc) < 4 or not test_crc32c(event_raw, payload_crc):
-                _warn('Warning: Invalid payload CRC, stopping read')
-                break
-            try:
-                event = Event()
-                event.ParseFromString(event_raw)
-            except Exception as e:
-                _warn(f'Warning: Failed to parse Event proto: {e}. Stopping read')
+
+def split_record_ranges(file_path: str, parts: int, start_offset: int = 0,
+                        end_offset: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split [start_offset, end_offset) into up to `parts` record-aligned ranges.
+
+    Cut points are spread evenly by size and moved forward to the next record
+    boundary, so each (start, end) pair can be passed to
+    `read_payloads_from_offset` in a separate worker.
+    """
+    with open(file_path, 'rb') as f:
+        if end_offset is None:
+            f.seek(0, 2)
+            end_offset = f.tell()
+        span = end_offset - start_offset
+        cuts = [start_offset]
+        for i in range(1, max(1, parts)):
+            cut = find_record_boundary(f, start_offset + span * i // parts, limit=end_offset)
+            if cut is None:
                 break
-            yield event, f.tell()
+            if cut > cuts[-1]:
+                cuts.append(cut)
+    cuts.append(end_offset)
+    return [(a, b) for a, b in zip(cuts, cuts[1:]) if a < b]
+
+
+def _record_key_at(f, offset: int) -> Optional[Tuple[int, float]]:
+    """(step, wall_time) of the record at `offset`, or None if it does not decode."""
+    f.seek(offset)
+    length = struct.unpack('Q', f.read(12)[:8])[0]
+    try:
+        step, wall_time, _scalars = decode_scalars(f.read(length))
+    except (IndexError, ValueError, struct.error):
+        return None
+    return step, wall_time
+
+
+def bisect_records(file_path: str, predicate: Callable[[int, float], bool]) -> Optional[int]:
+    """Return the offset of the first record for which `predicate(step, wall_time)` holds.
+
+    Assumes the predicate is monotonic over the file (false, then true), as
+    with thresholds on steps or wall time of a single run. Bisects on byte
+    offsets with `find_record_boundary`, then scans the last few records, so
+    only O(log size) records are decoded. Returns None when no record matches.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(0, 2)
+        lo, hi = 0, f.tell()
+        while hi - lo > _BISECT_MIN_SPAN:
+            mid = (lo + hi) // 2
+            boundary = find_record_boundary(f, mid, limit=hi)
+            key = _record_key_at(f, boundary) if boundary is not None else None
+            if key is None:
+                # Nothing usable in the upper half: the final scan from `lo`
+                # still reaches any match there
+                hi = mid
+            elif predicate(*key):
+                hi = boundary
+            else:
+                lo = boundary
+    start = lo
+    for payload, end in read_payloads_from_offset(file_path, lo, warn=lambda msg: None, resync=True):
+        try:
+            step, wall_time, _scalars = decode_scalars(payload)
+        except (IndexError, ValueError, struct.error):
+            start = end
+            continue
+        if predicate(step, wall_time):
+            return start
+        start = end
+    return None
+
+
+def last_record_key(file_path: str, tail_bytes: int = _BISECT_MIN_SPAN) -> Optional[Tuple[int, float]]:
+    """Return (max step, last wall_time) over the records in the file tail."""
+    with open(file_path, 'rb') as f:
+        f.seek(0, 2)
+        size = f.tell()
+        start = find_record_boundary(f, size - tail_bytes) if size > tail_bytes else 0
+    if start is None:
+        start = 0
+    key = None
+    for payload, _end in read_payloads_from_offset(file_path, start, warn=lambda msg: None, resync=True):
+        try:
+            step, wall_time, _scalars = decode_scalars(payload)
+        except (IndexError, ValueError, struct.error):
+            continue
+        key = (max(step, key[0]) if key else step, wall_time)
+    return key
+
+
+def window_start_offset(file_path: str, since: Optional[float] = None, last_steps: Optional[int] = None,
+                        now: Optional[float] = None) -> int:
+    """Offset where a run's recent window starts: records with wall_time within
+    `since` seconds of `now`, and among the last `last_steps` steps.
+
+    Returns the file size when no record is recent enough, and 0 when the
+    whole file is in the window.
+    """
+    import os
+    import time
+    size = os.path.getsize(file_path)
+    start = 0
+    if since is not None:
+        cutoff = (time.time() if now is None else now) - since
+        offset = bisect_records(file_path, lambda step, wall_time: wall_time >= cutoff)
+        start = max(start, size if offset is None else offset)
+    if last_steps is not None:
+        key = last_record_key(file_path)
+        if key is not None:
+            first_step = key[0] - last_steps
+            offset = bisect_records(file_path, lambda step, wall_time: step > first_step)
+            start = max(start, size if offset is None else offset)
+    return start
+
+
+def _read_varint(buf, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7f) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _skip_field(buf, pos: int, wire_type: int) -> int:
+    if wire_type == 0:
+        return _read_varint(buf, pos)[1]
+    if wire_type == 1:
+        return pos + 8
+    if wire_type == 2:
+        n, pos = _read_varint(buf, pos)
+        return pos + n
+    if wire_type == 5:
+        return pos + 4
+    raise ValueError(f'unsupported wire type {wire_type}')
+
+
+def _decode_summary_values(buf, pos: int, end: int, out: list, wanted=None, values: bool = True):
+    # Keys and lengths are nearly always single-byte varints; the inline
+    # checks avoid a call per field on the hot path
+    while pos < end:
+        key = buf[pos]
+        if key < 0x80:
+            pos += 1
+        else:
+            key, pos = _read_varint(buf, pos)
+        if key != 0x0a:
+            pos = _skip_field(buf, pos, key & 7)
+            continue
+        # Summary.value, length-delimited
+        n = buf[pos]
+        if n < 0x80:
+            pos += 1
+        else:
+            n, pos = _read_varint(buf, pos)
+        value_end = pos + n
+        tag = None
+        value = None
+        while pos < value_end:
+            vkey = buf[pos]
+            if vkey < 0x80:
+                pos += 1
+            else:
+                vkey, pos = _read_varint(buf, pos)
+            if vkey == 0x0a:  # Value.tag
+                m = buf[pos]
+                if m < 0x80:
+                    pos += 1
+                else:
+                    m, pos = _read_varint(buf, pos)
+                tag = buf[pos:pos + m]
+                pos += m
+                if wanted is not None and tag not in wanted:
+                    break
+            elif vkey == 0x15:  # Value.simple_value, fixed32
+                value = _FLOAT.unpack_from(buf, pos)[0] if values else True
+                pos += 4
+            else:
+                pos = _skip_field(buf, pos, vkey & 7)
+        if tag is not None and value is not None and (wanted is None or tag in wanted):
+            out.append((tag.decode('utf-8'), value) if values else tag.decode('utf-8'))
+        pos = value_end
+
+
+def decode_scalars(payload: bytes, tags=None, values: bool = True) -> Tuple[int, float, list]:
+    """Decode (step, wall_time, [(tag, simple_value), ...]) from a serialized Event.
+
+    Walks the protobuf wire format directly and skips every field that is not
+    needed, which is much cheaper than building the full `Event` message.
+    `tags`, a set of UTF-8 encoded tag names, keeps only those values. With
+    `values=False` only the names of scalar tags are returned (see
+    `peek_scalar_tags`).
+    """
+    step = 0
+    wall_time = 0.0
+    scalars = []
+    pos = 0
+    end = len(payload)
+    while pos < end:
+        key, pos = _read_varint(payload, pos)
+        if key == 0x09:  # Event.wall_time, double
+            wall_time = _DOUBLE.unpack_from(payload, pos)[0]
+            pos += 8
+        elif key == 0x10:  # Event.step, int64 varint
+            step, pos = _read_varint(payload, pos)
+            if step >= 1 << 63:
+                step -= 1 << 64
+        elif key == 0x2a:  # Event.summary
+            n, pos = _read_varint(payload, pos)
+            _decode_summary_values(payload, pos, pos + n, scalars, tags, values)
+            pos += n
+        else:
+            pos = _skip_field(payload, pos, key & 7)
+    return step, wall_time, scalars
+
+
+def peek_scalar_tags(payload: bytes) -> list:
+    """Names of the scalar tags in a serialized Event, without decoding values."""
+    return decode_scalars(payload, values=False)[2]
@@ -0,0 +1,99 @@
+"""Lightweight phase timers and throughput counters for the viewer HUD.
+
+Timers are started with `start()` and closed with `stop(phase, token)`.
+While disabled, `start()` returns None and `stop()` returns immediately, so
+instrumented code paths cost one attribute check and a call.
+"""
+
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+PHASES = ('scan', 'series', 'build', 'render', 'write', 'input')
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in [0, 100])."""
+    if not sorted_values:
+        return 0.0
+    rank = int(round(q / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+class PerfStats(object):
+    """Rolling latency samples per phase plus ingest and frame counters."""
+
+    def __init__(self, window: int = 256, enabled: bool = False):
+        self.enabled = enabled
+        self.window = window
+        self._samples: Dict[str, deque] = {p: deque(maxlen=window) for p in PHASES}
+        # (records, bytes, seconds) per scan, for ingest throughput
+        self._ingest = deque(maxlen=window)
+        self._frames = deque(maxlen=window)
+
+    def start(self) -> Optional[float]:
+        return time.perf_counter() if self.enabled else None
+
+    def stop(self, phase: str, token: Optional[float]):
+        if token is None:
+            return
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = self._samples[phase] = deque(maxlen=self.window)
+        samples.append(time.perf_counter() - token)
+
+    def add_ingest(self, records: int, nbytes: int, seconds: float):
+        if self.enabled:
+            self._ingest.append((records, nbytes, seconds))
+
+    def frame(self):
+        if self.enabled:
+            self._frames.append(time.perf_counter())
+
+    def reset(self):
+        for samples in self._samples.values():
+            samples.clear()
+        self._ingest.clear()
+        self._frames.clear()
+
+    def latency_ms(self, phase: str) -> Tuple[float, float, float, int]:
+        """Return (p50, p95, p99, count) in milliseconds for a phase."""
+        values = sorted(self._samples.get(phase, ()))
+        return (
+            percentile(values, 50) * 1000.0,
+            percentile(values, 95) * 1000.0,
+            percentile(values, 99) * 1000.0,
+            len(values),
+        )
+
+    def ingest_rates(self) -> Tuple[float, float]:
+        """Return (records/s, MB/s) over the time spent scanning."""
+        records = sum(r for r, _b, _s in self._ingest)
+        nbytes = sum(b for _r, b, _s in self._ingest)
+        seconds = sum(s for _r, _b, s in self._ingest)
+        if seconds <= 0:
+            return 0.0, 0.0
+        return records / seconds, nbytes / seconds / (1024.0 * 1024.0)
+
+    def fps(self, horizon: float = 2.0) -> float:
+        if len(self._frames) < 2:
+            return 0.0
+        now = self._frames[-1]
+        recent = [t for t in self._frames if now - t <= horizon]
+        if len(recent) < 2 or recent[-1] <= recent[0]:
+            return 0.0
+        return (len(recent) - 1) / (recent[-1] - recent[0])
+
+    def summary_lines(self) -> List[str]:
+        lines = [' phase     p50    p95    p99 ms']
+        for phase in PHASES:
+            p50, p95, p99, n = self.latency_ms(phase)
+            if n == 0:
+                lines.append(f' {phase:<7}     -      -      -')
+            else:
+                lines.append(f' {phase:<7}{p50:6.1f} {p95:6.1f} {p99:6.1f}')
+        rec_s, mb_s = self.ingest_rates()
+        lines.append('')
+        lines.append(f' ingest {rec_s:,.0f} rec/s {mb_s:.2f} MB/s')
+        lines.append(f' fps    {self.fps():.1f}')
+        return lines
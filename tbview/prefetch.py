@@ -0,0 +1,132 @@
+"""Speculative parsing of likely runs while the run selection prompt is open.
+
+The prompt leaves the CPU idle while the user picks runs. `run_main` starts
+a `SpeculativePrefetcher` on the runs most likely to be picked (the ones
+selected last time, the most recently written and the top of the list) and
+cancels it once the selection is confirmed. Parsed runs are put in the
+process-wide run cache (`tbview.runcache`), so the viewer resumes from them
+and only reads what is left.
+
+The work is bounded on both ends: the thread parses in short slices and
+sleeps in between to stay under `cpu_fraction` of a core (the prompt keeps
+responding to keys), and it stops once a run would not fit in the room left
+in the cache, without evicting runs kept from earlier viewers.
+"""
+
+import os
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from tbview.runcache import RunCache, RunState, ScanProgress, file_identity, scan_records
+
+# Same as TensorboardViewer.EAGER_TAGS, which would import the UI to read
+EAGER_TAGS = ('train/epoch',)
+
+LIMIT = 8
+RECENT = 3
+CPU_FRACTION = 0.5
+SLICE = 0.02
+
+
+def likely_choices(target_options, previously_selected=(), limit: int = LIMIT, recent: int = RECENT) -> List[str]:
+    """Event paths worth parsing ahead of the selection, most likely first.
+
+    `target_options` are run_main's (root, file, size, display) tuples in list
+    order and `previously_selected` the (root, file) pairs picked last time.
+    The previous selection comes first, then the `recent` most recently
+    modified files, then the top of the list.
+    """
+    paths = [os.path.abspath(os.path.join(root, file)) for root, file, _size, _disp in target_options]
+    previous = [path for path, (root, file, _size, _disp) in zip(paths, target_options)
+                if (root, file) in previously_selected]
+
+    def mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    newest = sorted(paths, key=mtime, reverse=True)[:recent]
+    ordered = []
+    for path in previous + newest + paths:
+        if path not in ordered:
+            ordered.append(path)
+        if len(ordered) == limit:
+            break
+    return ordered
+
+
+class SpeculativePrefetcher(object):
+    """Parse `paths` into `cache` on a background thread until cancelled."""
+
+    def __init__(self, paths: Iterable[str], cache: RunCache, cpu_fraction: float = CPU_FRACTION,
+                 slice_seconds: float = SLICE):
+        self.paths = list(paths)
+        self.cache = cache
+        self.cpu_fraction = min(1.0, max(0.01, cpu_fraction))
+        self.slice_seconds = slice_seconds
+        self.parsed: List[str] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SpeculativePrefetcher':
+        self._thread = threading.Thread(target=self._run, name='tbview-prefetch', daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop parsing and wait for the thread; partially parsed runs stay cached."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        for path in self.paths:
+            if self._stop.is_set() or not self._prefetch(path):
+                return
+
+    def _prefetch(self, path: str) -> bool:
+        """Parse one run into the cache; False once the memory budget is spent."""
+        if path in self.cache:
+            return True
+        try:
+            state = RunState(file_identity(path), {}, set(EAGER_TAGS), {}, {}, {}, 0, 0, 0.0)
+        except OSError:
+            return True
+        tag_bytes = {tag.encode('utf-8') for tag in EAGER_TAGS}
+        pause = self.slice_seconds * (1.0 - self.cpu_fraction) / self.cpu_fraction
+        room = self.cache.max_bytes - self.cache.total
+        while True:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                return True
+            deadline = time.perf_counter() + self.slice_seconds
+            scan = ScanProgress(state.last_offset)
+            try:
+                scan_records(path, scan, state.offsets_by_tag, state.loaded_tags, tag_bytes,
+                             state.records, state.wall_times, state.versions, warn=lambda msg: None,
+                             should_stop=lambda: self._stop.is_set() or time.perf_counter() >= deadline)
+            except Exception:
+                # Left to the viewer, which reports read errors
+                return True
+            state.last_offset = scan.end_offset
+            complete = scan.complete
+            if state.nbytes() > room:
+                return False
+            if complete:
+                state.last_scan_size = size
+                try:
+                    state.last_mtime = os.path.getmtime(path)
+                except OSError:
+                    pass
+                break
+            if self._stop.is_set() or self._stop.wait(pause):
+                # Cancelled mid-run: the viewer continues from last_offset
+                break
+        if state.last_offset:
+            self.cache.put(path, state, evict=False)
+            self.parsed.append(path)
+        return True
@@ -0,0 +1,195 @@
+"""Process-wide cache of parsed runs (`--run-cache`).
+
+Going back to run selection with 'q' closes the viewer; the state it parsed
+from each event file (tag record offsets, loaded series, resume offset) is
+handed to the cache returned by `get_run_cache()`. A viewer opening the same
+file again takes that state back and only reads what was appended since, so
+reopening the same or overlapping selections costs a tail scan.
+
+Entries are keyed by absolute path and checked against the file identity
+(device and inode) and size, so a replaced or truncated file is parsed
+again. The least recently closed runs are evicted beyond `max_bytes`. The
+default cache has no room, which keeps library use and tests unaffected
+until the CLI installs a sized one via `set_run_cache()`.
+"""
+
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from tbview.parser import decode_scalars, read_payloads_from_offset
+from tbview.series import POINT_BYTES
+
+# Records read between polls of `should_stop` in scan_records
+STOP_CHECK_RECORDS = 256
+
+
+class RunState(object):
+    """What a viewer parsed from one event file, detached from the viewer."""
+
+    def __init__(self, identity, offsets_by_tag, loaded_tags, records, wall_times, versions,
+                 last_offset, last_scan_size, last_mtime, history_end=None):
+        self.identity = identity
+        self.offsets_by_tag = offsets_by_tag
+        self.loaded_tags = loaded_tags
+        self.records = records
+        self.wall_times = wall_times
+        self.versions = versions
+        self.last_offset = last_offset
+        self.last_scan_size = last_scan_size
+        self.last_mtime = last_mtime
+        # Start of the recent window when older history was never read
+        self.history_end = history_end
+
+    def nbytes(self) -> int:
+        from tbview.memreport import offsets_nbytes
+        points = sum(len(values) for values in self.records.values())
+        return points * POINT_BYTES + offsets_nbytes(self.offsets_by_tag)
+
+
+class ScanProgress(object):
+    """What `scan_records` has ingested, also filled in when the scan raises."""
+
+    __slots__ = ('records', 'end_offset', 'grown', 'complete')
+
+    def __init__(self, start_offset: int):
+        self.records = 0
+        # End of the last record fully ingested: where the next scan resumes
+        self.end_offset = start_offset
+        self.grown = set()
+        self.complete = False
+
+
+def scan_records(path: str, scan: ScanProgress, offsets_by_tag, loaded_tags, loaded_tag_bytes, records,
+                 wall_times, versions, warn: Optional[Callable[[str], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None) -> ScanProgress:
+    """Ingest the records of `path` after `scan.end_offset` into per-run containers.
+
+    Discovery pass: every scalar tag gets the start offsets of its records;
+    values are decoded only for `loaded_tags` (`loaded_tag_bytes` is the same
+    set encoded). Records that pass the CRC check but do not decode are
+    skipped with a warning. `should_stop` is polled every STOP_CHECK_RECORDS
+    records. `scan` is updated even if reading fails part way, so callers
+    keep the resume offset of the records already added to the containers.
+    """
+    n_records = 0
+    done_offset = scan.end_offset
+    grown = scan.grown
+    complete = True
+    reader = read_payloads_from_offset(path, done_offset, warn=warn, resync=True)
+    try:
+        for payload, end_offset in reader:
+            n_records += 1
+            record_start = end_offset - len(payload) - 16
+            try:
+                step, wall_time, tags = decode_scalars(payload, values=False)
+                scalars = ()
+                if not loaded_tags.isdisjoint(tags):
+                    scalars = decode_scalars(payload, tags=loaded_tag_bytes)[2]
+            except (IndexError, ValueError, struct.error) as e:
+                if warn:
+                    warn(f'Warning: Failed to decode event at offset {record_start}: {e}. Skipping it')
+                tags = scalars = ()
+            for tag in tags:
+                offsets = offsets_by_tag.get(tag)
+                if offsets is None:
+                    offsets = offsets_by_tag[tag] = array('q')
+                offsets.append(record_start)
+            for tag, value in scalars:
+                if tag not in records:
+                    records[tag] = {}
+                    wall_times[tag] = {}
+                records[tag][step] = value
+                wall_times[tag][step] = wall_time
+                versions[tag] = versions.get(tag, 0) + 1
+                grown.add(tag)
+            done_offset = end_offset
+            if should_stop is not None and n_records % STOP_CHECK_RECORDS == 0 and should_stop():
+                complete = False
+                break
+    except BaseException:
+        complete = False
+        raise
+    finally:
+        reader.close()
+        scan.records += n_records
+        scan.end_offset = done_offset
+        scan.complete = complete
+    return scan
+
+
+def file_identity(path: str):
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino)
+
+
+class RunCache(object):
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # path -> (state, nbytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._entries
+
+    def take(self, path: str) -> Optional[RunState]:
+        """Remove and return the state of `path` if it still matches the file."""
+        entry = self._entries.pop(os.path.abspath(path), None)
+        if entry is None:
+            return None
+        state, nbytes = entry
+        self.total -= nbytes
+        try:
+            identity = file_identity(path)
+            size = os.path.getsize(path)
+        except OSError:
+            return None
+        if identity != state.identity or size < state.last_offset:
+            return None
+        return state
+
+    def put(self, path: str, state: RunState, evict: bool = True) -> bool:
+        """Keep `state` as the most recently used entry, evicting beyond max_bytes.
+
+        With `evict=False` the state is only kept if it fits next to the
+        current entries. Returns whether it was kept.
+        """
+        path = os.path.abspath(path)
+        nbytes = state.nbytes()
+        old = self._entries.get(path)
+        room = self.max_bytes - (self.total - (old[1] if old is not None else 0))
+        if nbytes > (room if not evict else self.max_bytes):
+            return False
+        if old is not None:
+            del self._entries[path]
+            self.total -= old[1]
+        self._entries[path] = (state, nbytes)
+        self.total += nbytes
+        while self.total > self.max_bytes:
+            _path, (_state, evicted) = self._entries.popitem(last=False)
+            self.total -= evicted
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self.total = 0
+
+
+_run_cache = RunCache()
+
+
+def get_run_cache() -> RunCache:
+    return _run_cache
+
+
+def set_run_cache(cache: RunCache) -> RunCache:
+    """Install `cache` process-wide and return the previous one."""
+    global _run_cache
+    previous = _run_cache
+    _run_cache = cache
+    return previous
@@ -0,0 +1,52 @@
+"""Per-run polling schedule for the viewer's reload checks.
+
+Every run has its own check interval. A run whose event file grew is
+checked again after `min_interval`; each check that finds no growth doubles
+the interval up to `max_interval`, so finished or stalled runs fall back to
+a check every few minutes while active runs stay fresh. First checks are
+spread over the initial interval so that many runs opened together do not
+all come due in the same frame.
+"""
+
+import time
+from typing import Dict, Hashable, List, Optional
+
+MIN_INTERVAL = 1.0
+MAX_INTERVAL = 300.0
+BACKOFF = 2.0
+
+
+class ScanScheduler(object):
+    def __init__(self, runs: List[Hashable], min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL, now: Optional[float] = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        now = time.monotonic() if now is None else now
+        self.intervals: Dict[Hashable, float] = {run: min_interval for run in runs}
+        self._due: Dict[Hashable, float] = {
+            run: now + min_interval * (i + 1) / len(runs) for i, run in enumerate(runs)}
+
+    def due(self, now: Optional[float] = None) -> List[Hashable]:
+        """Runs whose check is due, most overdue first."""
+        now = time.monotonic() if now is None else now
+        return sorted((run for run, due in self._due.items() if due <= now), key=self._due.__getitem__)
+
+    def next_delay(self, now: Optional[float] = None) -> float:
+        """Seconds until the next check is due (0 if one is overdue)."""
+        if not self._due:
+            return self.max_interval
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(self._due.values()) - now)
+
+    def observe(self, run: Hashable, grew: bool, pending: bool = False, now: Optional[float] = None):
+        """Record a check of `run` and schedule the next one.
+
+        `pending` means the check stopped before reading everything (frame
+        budget spent), so the run stays due.
+        """
+        now = time.monotonic() if now is None else now
+        if grew:
+            self.intervals[run] = self.min_interval
+        else:
+            self.intervals[run] = min(self.max_interval, self.intervals[run] * BACKOFF)
+        self._due[run] = now if pending else now + self.intervals[run]
@@ -0,0 +1,99 @@
+"""Memory budget for loaded scalar series (`--max-memory`).
+
+The viewer keeps each loaded (run, tag) series as two dicts, step -> value
+and step -> wall_time. `SeriesBudget` estimates their size from the point
+count, keeps the series in least-recently-viewed order and picks which ones
+to evict when the total exceeds the budget. Evicted series are dropped by
+the viewer and decoded again from the record offsets when viewed.
+"""
+
+from collections import OrderedDict
+from typing import Hashable, Iterable, List, Optional
+
+# Measured with tracemalloc: one dict entry in each of the two dicts, a
+# float value, a float wall time and the int step they share
+POINT_BYTES = 200
+
+SIZE_UNITS = {'k': 1 << 10, 'm': 1 << 20, 'g': 1 << 30, 't': 1 << 40}
+
+
+def parse_size_bytes(value: str) -> int:
+    """Parse sizes like '512M', '2G', '1.5g' or '1048576' into bytes."""
+    text = value.strip().lower()
+    if text.endswith('b'):
+        text = text[:-1]
+    scale = SIZE_UNITS.get(text[-1:], None)
+    if scale is not None:
+        text = text[:-1]
+    try:
+        nbytes = int(float(text) * (scale or 1))
+    except ValueError:
+        raise ValueError(f'invalid size {value!r}, expected e.g. 512M or 2G')
+    if nbytes <= 0:
+        raise ValueError(f'size {value!r} must be positive')
+    return nbytes
+
+
+def format_bytes(nbytes: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if nbytes < 1024:
+            return f'{nbytes:.0f}{unit}' if unit == 'B' else f'{nbytes:.1f}{unit}'
+        nbytes /= 1024.0
+    return f'{nbytes:.2f}GB'
+
+
+class SeriesBudget(object):
+    """Byte accounting and LRU order of loaded series.
+
+    Keys are (run, tag) pairs. `max_bytes=None` only tracks usage.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self._sizes: "OrderedDict[Hashable, int]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def __contains__(self, key):
+        return key in self._sizes
+
+    def size_of(self, key: Hashable) -> int:
+        return self._sizes.get(key, 0)
+
+    def set_points(self, key: Hashable, points: int):
+        """Record the size of `key`; new keys count as most recently viewed."""
+        nbytes = points * POINT_BYTES
+        self.total += nbytes - self._sizes.get(key, 0)
+        self._sizes[key] = nbytes
+
+    def touch(self, key: Hashable):
+        if key in self._sizes:
+            self._sizes.move_to_end(key)
+
+    def discard(self, key: Hashable):
+        self.total -= self._sizes.pop(key, 0)
+
+    def over_budget(self) -> bool:
+        return self.max_bytes is not None and self.total > self.max_bytes
+
+    def victims(self, protected: Iterable[Hashable] = ()) -> List[Hashable]:
+        """Least recently viewed keys to drop to get back under budget.
+
+        Keys in `protected` (e.g. the series on screen) are never chosen, so
+        the result may leave the total above the budget.
+        """
+        if not self.over_budget():
+            return []
+        protected = set(protected)
+        excess = self.total - self.max_bytes
+        out = []
+        for key, nbytes in self._sizes.items():
+            if excess <= 0:
+                break
+            if key in protected:
+                continue
+            out.append(key)
+            excess -= nbytes
+        return out
@@ -0,0 +1,450 @@
+"""Shared series daemon (`tbview serve`) and its client.
+
+The daemon tails every event file under a log root once and keeps the
+scalars of each (file, tag) as compact step/value/wall_time arrays. Viewers
+started with `--remote` ask it for tag lists and series over a Unix domain
+socket instead of parsing the files themselves, so several people viewing
+the same logs share one parse and one copy of the data.
+
+Protocol: every message is a 4-byte big-endian length followed by the body.
+A request body starts with a one-byte opcode; a reply starts with a status
+byte (0 ok, 1 error followed by a message). Strings are a 2-byte length and
+UTF-8 bytes, numbers are big-endian.
+
+- PING: empty reply.
+- TAGS path: bytes consumed (u64), tag count (u32), then per tag its name and
+  point count (u64). The file is tailed first, so the reply is current.
+- SERIES start (u64), max_points (u32), path, tag: total points (u64), point
+  count n (u32), then n steps (i64), n values (f64) and n wall times (f64)
+  from index `start`. With `max_points`, the points are decimated with the
+  min/max buckets used by the braille renderer.
+"""
+
+import argparse
+import hashlib
+import os
+import socket
+import socketserver
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from tbview.parser import decode_scalars, read_payloads_from_offset
+
+OP_PING = 0
+OP_TAGS = 1
+OP_SERIES = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+MAX_MESSAGE_BYTES = 1 << 30
+DEFAULT_POLL_INTERVAL = 2.0
+DISCOVER_INTERVAL = 30.0
+
+_LENGTH = struct.Struct('!I')
+_TAGS_HEAD = struct.Struct('!BQI')
+_SERIES_REQUEST = struct.Struct('!BQI')
+_SERIES_HEAD = struct.Struct('!BQI')
+
+
+class ServeError(RuntimeError):
+    """An error reported by the daemon."""
+
+
+def default_socket_path(root: str) -> str:
+    """Socket location shared by the daemon and clients of the same log root."""
+    digest = hashlib.sha1(os.path.realpath(root).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f'tbview-{digest}.sock')
+
+
+def _pack_str(text: str) -> bytes:
+    data = text.encode('utf-8')
+    return struct.pack('!H', len(data)) + data
+
+
+def _unpack_str(buf: bytes, pos: int) -> Tuple[str, int]:
+    (n,) = struct.unpack_from('!H', buf, pos)
+    pos += 2
+    return buf[pos:pos + n].decode('utf-8'), pos + n
+
+
+def _network_order(column: array) -> bytes:
+    if sys.byteorder == 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _native_order(typecode: str, data: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == 'little':
+        column.byteswap()
+    return column
+
+
+def send_message(sock: socket.socket, body: bytes):
+    sock.sendall(_LENGTH.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    chunks = []
+    while n:
+        chunk = sock.recv(min(n, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[bytes]:
+    """Read one message; None when the peer closed the connection."""
+    head = _recv_exact(sock, _LENGTH.size)
+    if head is None:
+        return None
+    (n,) = _LENGTH.unpack(head)
+    if n > MAX_MESSAGE_BYTES:
+        raise ValueError(f'message of {n} bytes exceeds the limit')
+    return _recv_exact(sock, n)
+
+
+class FileSeries(object):
+    """Scalars of one event file as per-tag (steps, values, wall_times) arrays."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.tags: "OrderedDict[str, Tuple[array, array, array]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def points(self) -> int:
+        return sum(len(cols[0]) for cols in self.tags.values())
+
+    def tail(self) -> int:
+        """Append records written since the last call; returns the scalars added."""
+        with self.lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            if size < self.offset:
+                # Rewritten from scratch: clients notice the shorter series
+                self.offset = 0
+                self.tags = OrderedDict()
+            if size == self.offset:
+                return 0
+            added = 0
+            tags = self.tags
+            for payload, end in read_payloads_from_offset(self.path, self.offset, warn=lambda msg: None,
+                                                          resync=True):
+                try:
+                    step, wall_time, scalars = decode_scalars(payload)
+                except (IndexError, ValueError, struct.error) as e:
+                    # Skipped, so the next tail does not stop at it again
+                    print(f'{self.path}: skipping undecodable record at offset {end - len(payload) - 16}: {e}',
+                          file=sys.stderr)
+                    self.offset = end
+                    continue
+                for tag, value in scalars:
+                    cols = tags.get(tag)
+                    if cols is None:
+                        cols = tags[tag] = (array('q'), array('d'), array('d'))
+                    cols[0].append(step)
+                    cols[1].append(value)
+                    cols[2].append(wall_time)
+                added += len(scalars)
+                self.offset = end
+            return added
+
+    def tag_counts(self) -> Tuple[int, List[Tuple[str, int]]]:
+        with self.lock:
+            return self.offset, [(tag, len(cols[0])) for tag, cols in self.tags.items()]
+
+    def series(self, tag: str, start: int = 0, max_points: int = 0) -> Tuple[int, array, array, array]:
+        """Points of `tag` from index `start`, with the total number of points."""
+        with self.lock:
+            cols = self.tags.get(tag)
+            if cols is None:
+                return 0, array('q'), array('d'), array('d')
+            total = len(cols[0])
+            steps, values, walls = (col[start:] for col in cols)
+        if max_points and len(steps) > max_points:
+            from tbview.dashing_lib.braille import decimate_minmax
+            idx, _ys = decimate_minmax(range(len(values)), values, max(1, max_points // 2))
+            idx = [int(i) for i in idx]
+            steps = array('q', (steps[i] for i in idx))
+            values = array('d', (values[i] for i in idx))
+            walls = array('d', (walls[i] for i in idx))
+        return total, steps, values, walls
+
+
+class SeriesStore(object):
+    """The `FileSeries` of every event file under `root`, created on first use."""
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        self._files: "OrderedDict[str, FileSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._files)
+
+    def points(self) -> int:
+        return sum(f.points() for f in list(self._files.values()))
+
+    def resolve(self, path: str) -> str:
+        from tbview.cli import is_event_file
+        real = os.path.realpath(path)
+        if os.path.commonpath([real, self.root]) != self.root or not is_event_file(real):
+            raise ValueError(f'{path} is not an event file under {self.root}')
+        if not os.path.isfile(real):
+            raise ValueError(f'{path} does not exist')
+        return real
+
+    def get(self, path: str) -> FileSeries:
+        real = self.resolve(path)
+        with self._lock:
+            series = self._files.get(real)
+            if series is None:
+                series = self._files[real] = FileSeries(real)
+        return series
+
+    def discover(self) -> int:
+        """Add event files created under the root; returns how many were new."""
+        if os.path.isfile(self.root):
+            paths = [self.root]
+        else:
+            from tbview.export import find_event_files
+            paths = find_event_files(self.root)
+        new = 0
+        with self._lock:
+            for path in paths:
+                real = os.path.realpath(path)
+                if real not in self._files:
+                    self._files[real] = FileSeries(real)
+                    new += 1
+        return new
+
+    def refresh(self) -> int:
+        """Tail every known file; returns the scalars added."""
+        added = 0
+        for series in list(self._files.values()):
+            try:
+                added += series.tail()
+            except OSError as e:
+                print(f'{series.path}: {e}', file=sys.stderr)
+        return added
+
+
+def handle_request(store: SeriesStore, body: bytes) -> bytes:
+    op = body[0]
+    if op == OP_PING:
+        return bytes([STATUS_OK])
+    if op == OP_TAGS:
+        path, _pos = _unpack_str(body, 1)
+        series = store.get(path)
+        series.tail()
+        offset, counts = series.tag_counts()
+        parts = [_TAGS_HEAD.pack(STATUS_OK, offset, len(counts))]
+        for tag, count in counts:
+            parts.append(_pack_str(tag))
+            parts.append(struct.pack('!Q', count))
+        return b''.join(parts)
+    if op == OP_SERIES:
+        _op, start, max_points = _SERIES_REQUEST.unpack_from(body, 0)
+        path, pos = _unpack_str(body, _SERIES_REQUEST.size)
+        tag, _pos = _unpack_str(body, pos)
+        total, steps, values, walls = store.get(path).series(tag, start, max_points)
+        return b''.join((_SERIES_HEAD.pack(STATUS_OK, total, len(steps)),
+                         _network_order(steps), _network_order(values), _network_order(walls)))
+    raise ValueError(f'unknown opcode {op}')
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        store = self.server.store
+        while True:
+            try:
+                body = recv_message(self.request)
+            except (OSError, ValueError):
+                return
+            if not body:
+                return
+            try:
+                reply = handle_request(store, body)
+            except (ValueError, OSError, IndexError, struct.error, UnicodeDecodeError) as e:
+                reply = bytes([STATUS_ERROR]) + _pack_str(str(e))
+            try:
+                send_message(self.request, reply)
+            except OSError:
+                return
+
+
+class SeriesServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves a `SeriesStore` on a Unix socket, one thread per client."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, store: SeriesStore):
+        self.store = store
+        self.socket_path = socket_path
+        super().__init__(socket_path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def poll_store(store: SeriesStore, stop: threading.Event, interval: float = DEFAULT_POLL_INTERVAL,
+               discover_interval: float = DISCOVER_INTERVAL):
+    """Keep `store` current until `stop` is set (runs in a daemon thread)."""
+    last_discover = time.monotonic()
+    while not stop.wait(interval):
+        # One failed pass must not end background tailing for good
+        try:
+            if time.monotonic() - last_discover >= discover_interval:
+                last_discover = time.monotonic()
+                store.discover()
+            store.refresh()
+        except Exception as e:
+            print(f'tbview serve: refresh failed: {e}', file=sys.stderr)
+
+
+def is_serving(socket_path: str) -> bool:
+    """True if a daemon answers on `socket_path`."""
+    try:
+        client = SeriesClient(socket_path, timeout=2.0)
+    except OSError:
+        return False
+    try:
+        client.ping()
+        return True
+    except (OSError, ServeError):
+        return False
+    finally:
+        client.close()
+
+
+class SeriesClient(object):
+    """Blocking client of `tbview serve`, one request at a time."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = self._connect()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _call(self, body: bytes) -> bytes:
+        if self._sock is None:
+            self._sock = self._connect()
+        try:
+            send_message(self._sock, body)
+            reply = recv_message(self._sock)
+        except OSError:
+            # A timed out request may still be answered later; a fresh
+            # connection keeps that reply from being read as the next one's
+            self.close()
+            raise
+        if reply is None:
+            self.close()
+            raise ServeError('connection closed by tbview serve')
+        if reply[0] != STATUS_OK:
+            raise ServeError(_unpack_str(reply, 1)[0])
+        return reply
+
+    def ping(self):
+        self._call(bytes([OP_PING]))
+
+    def tags(self, path: str) -> Tuple[int, List[Tuple[str, int]]]:
+        """Bytes of `path` parsed by the daemon and (tag, point count) pairs."""
+        reply = self._call(bytes([OP_TAGS]) + _pack_str(path))
+        _status, offset, n = _TAGS_HEAD.unpack_from(reply, 0)
+        pos = _TAGS_HEAD.size
+        counts = []
+        for _ in range(n):
+            tag, pos = _unpack_str(reply, pos)
+            (count,) = struct.unpack_from('!Q', reply, pos)
+            pos += 8
+            counts.append((tag, count))
+        return offset, counts
+
+    def series(self, path: str, tag: str, start: int = 0, max_points: int = 0) -> Tuple[int, array, array, array]:
+        """(total, steps, values, wall_times) of `tag` from point index `start`."""
+        reply = self._call(_SERIES_REQUEST.pack(OP_SERIES, start, max_points) + _pack_str(path) + _pack_str(tag))
+        _status, total, n = _SERIES_HEAD.unpack_from(reply, 0)
+        pos = _SERIES_HEAD.size
+        steps = _native_order('q', reply[pos:pos + 8 * n])
+        values = _native_order('d', reply[pos + 8 * n:pos + 16 * n])
+        walls = _native_order('d', reply[pos + 16 * n:pos + 24 * n])
+        return total, steps, values, walls
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='tbview serve',
+                                     description='parse a log root once and serve its scalars to tbview --remote')
+    parser.add_argument('path', help='log directory (or event file) to serve')
+    parser.add_argument('--socket', default=None, metavar='PATH',
+                        help='Unix socket to listen on (default: derived from the log root)')
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SECONDS',
+                        help='how often to tail the event files (default %(default)s)')
+    parser.add_argument('--socket-mode', type=lambda v: int(v, 8), default=0o660, metavar='OCTAL',
+                        help='permissions of the socket file (default 660: owner and group)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f'{args.path} is not a valid file or directory')
+    socket_path = args.socket or default_socket_path(args.path)
+    if os.path.exists(socket_path):
+        if is_serving(socket_path):
+            print(f'tbview serve is already running on {socket_path}', file=sys.stderr)
+            return 1
+        os.unlink(socket_path)
+
+    store = SeriesStore(args.path)
+    start = time.perf_counter()
+    store.discover()
+    store.refresh()
+    print(f'parsed {len(store)} file(s), {store.points()} points in {time.perf_counter() - start:.2f}s',
+          file=sys.stderr)
+
+    server = SeriesServer(socket_path, store)
+    os.chmod(socket_path, args.socket_mode)
+    stop = threading.Event()
+    threading.Thread(target=poll_store, args=(store, stop, args.poll_interval), name='tbview-serve-poll',
+                     daemon=True).start()
+    remote = f'--remote {socket_path}' if args.socket else '--remote'
+    print(f'serving {store.root} on {socket_path} (view with: tbview {args.path} {remote})', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""End-to-end tail-latency stress harness (`tbview stress`).
+
+A writer process appends scalar events to several runs at a fixed rate,
+splitting some records into two flushed writes so the reader regularly sees
+partial records. Meanwhile a headless TensorboardViewer tails the files at a
+target frame rate. The harness reports:
+
+- write-to-visible latency: event wall_time to the end of the first frame
+  rendered after the event was ingested,
+- ingest lag: bytes on disk not yet consumed by the viewer,
+- dropped frames: frame budgets missed because scan plus render ran long,
+- memory growth: resident set size sampled over the run.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from tbview import synth
+from tbview.memreport import rss_bytes
+from tbview.perf import percentile
+
+
+def writer_main(paths: List[str], scalars_per_sec: float, tags: int, duration: float,
+                partial_every: int, seed: int = 0):
+    """Append events round-robin to `paths` for `duration` seconds.
+
+    Each event carries one scalar per tag and the current time as wall_time.
+    Every `partial_every`-th record is written in two flushed halves.
+    """
+    rng = random.Random(seed)
+    names = synth.tag_names(tags)
+    events_per_sec = max(1.0, scalars_per_sec / max(1, tags))
+    files = [open(p, 'ab') for p in paths]
+    steps = [0] * len(paths)
+    written = 0
+    start = time.time()
+    try:
+        while True:
+            elapsed = time.time() - start
+            if elapsed >= duration:
+                break
+            due = int(elapsed * events_per_sec) - written
+            for _ in range(due):
+                idx = written % len(files)
+                f = files[idx]
+                values = {name: rng.random() for name in names}
+                record = synth.encode_record(synth.make_scalars_event(steps[idx], values, wall_time=time.time()))
+                steps[idx] += 1
+                written += 1
+                if partial_every and written % partial_every == 0:
+                    cut = rng.randrange(1, len(record))
+                    f.write(record[:cut])
+                    f.flush()
+                    time.sleep(0.0005)
+                    f.write(record[cut:])
+                else:
+                    f.write(record)
+            for f in files:
+                f.flush()
+            time.sleep(0.002)
+    finally:
+        for f in files:
+            f.close()
+
+
+def _collect_latencies(viewer, tag: str, last_steps: dict, visible_at: float, out: List[float]):
+    for run_tag in viewer.run_tags:
+        times_map = viewer.wall_times_by_run.get(run_tag, {}).get(tag)
+        if not times_map:
+            continue
+        last = last_steps.get(run_tag, -1)
+        newest = last
+        # Steps arrive in increasing order, so only the tail is new
+        for step in reversed(times_map):
+            if step <= last:
+                break
+            wall_time = times_map[step]
+            if wall_time is not None:
+                out.append(visible_at - wall_time)
+            newest = max(newest, step)
+        last_steps[run_tag] = newest
+
+
+def run_stress(workdir: str, runs: int = 4, tags: int = 32, rate: float = 10000.0, duration: float = 10.0,
+               fps: float = 20.0, size=(160, 48), engine: str = 'braille', partial_every: int = 10,
+               drain: float = 3.0, progress=lambda msg: None) -> dict:
+    """Run writer and headless viewer concurrently and return the report."""
+    from tbview.headless import HeadlessTerminal
+    from tbview.viewer import TensorboardViewer, WARN
+
+    paths = []
+    run_tags = []
+    for i in range(runs):
+        run_dir = os.path.join(workdir, f'run_{i}')
+        os.makedirs(run_dir, exist_ok=True)
+        path = os.path.join(run_dir, f'events.out.tfevents.{1700000000 + i}.stress')
+        open(path, 'ab').close()
+        paths.append(path)
+        run_tags.append(f'run_{i}')
+
+    viewer = TensorboardViewer(paths, run_tags, plot_engine=engine, term=HeadlessTerminal(*size))
+    warnings = {'partial': 0, 'other': 0}
+    log = viewer.log
+
+    def counting_log(msg, level=''):
+        if level == WARN:
+            warnings['partial' if 'Truncated' in msg else 'other'] += 1
+        log(msg, level)
+    viewer.log = counting_log
+
+    writer = multiprocessing.Process(
+        target=writer_main, args=(paths, rate, tags, duration, partial_every), daemon=True)
+    budget = 1.0 / fps
+    latencies = []
+    frame_ms = []
+    lag_bytes = []
+    memory = []
+    last_steps = {}
+    dropped = 0
+    rss_start = rss_bytes()
+    start = time.time()
+    writer.start()
+    progress(f'writing {rate:,.0f} scalars/s to {runs} runs for {duration:.0f}s')
+    tag = synth.tag_names(tags)[0]
+    next_mem = start
+    try:
+        while True:
+            now = time.time()
+            writer_done = not writer.is_alive()
+            lag = sum(max(0, os.path.getsize(p) - viewer._last_offset_by_run[t]) for p, t in zip(paths, run_tags))
+            if writer_done and (lag == 0 or now - start > duration + drain):
+                break
+            t0 = time.perf_counter()
+            viewer.scan_events()
+            viewer.render_frame()
+            dt = time.perf_counter() - t0
+            _collect_latencies(viewer, tag, last_steps, time.time(), latencies)
+            frame_ms.append(dt * 1000.0)
+            lag_bytes.append(lag)
+            dropped += max(0, math.ceil(dt / budget) - 1)
+            if now >= next_mem:
+                memory.append((round(now - start, 2), rss_bytes()))
+                next_mem = now + 1.0
+            time.sleep(max(0.0, budget - dt))
+    finally:
+        writer.join(timeout=5)
+        if writer.is_alive():
+            writer.terminate()
+
+    records = sum(len(viewer.wall_times_by_run[t].get(tag, {})) for t in run_tags)
+    latencies_ms = sorted(l * 1000.0 for l in latencies)
+    frame_sorted = sorted(frame_ms)
+    lag_sorted = sorted(lag_bytes)
+    rss_end = rss_bytes()
+    return {
+        'config': {
+            'runs': runs, 'tags': tags, 'rate': rate, 'duration': duration, 'fps': fps,
+            'size': list(size), 'engine': engine, 'partial_every': partial_every,
+        },
+        'events_ingested': records,
+        'latency_ms': _distribution(latencies_ms),
+        'frame_ms': _distribution(frame_sorted),
+        'frames': len(frame_ms),
+        'dropped_frames': dropped,
+        'ingest_lag_bytes': {'p50': percentile(lag_sorted, 50), 'p95': percentile(lag_sorted, 95),
+                             'max': lag_sorted[-1] if lag_sorted else 0},
+        'partial_record_warnings': warnings['partial'],
+        'other_warnings': warnings['other'],
+        'memory': {'rss_start': rss_start, 'rss_end': rss_end, 'growth': rss_end - rss_start,
+                   'samples': memory},
+    }
+
+
+def _distribution(sorted_values: List[float]) -> dict:
+    return {
+        'count': len(sorted_values),
+        'p50': percentile(sorted_values, 50),
+        'p95': percentile(sorted_values, 95),
+        'p99': percentile(sorted_values, 99),
+        'max': sorted_values[-1] if sorted_values else 0.0,
+    }
+
+
+def format_report(report: dict) -> str:
+    lat = report['latency_ms']
+    frame = report['frame_ms']
+    mem = report['memory']
+    lag = report['ingest_lag_bytes']
+    return '\n'.join([
+        f"events ingested   {report['events_ingested']:,}",
+        f"write->visible    p50 {lat['p50']:.1f}ms p95 {lat['p95']:.1f}ms p99 {lat['p99']:.1f}ms max {lat['max']:.1f}ms",
+        f"frame time        p50 {frame['p50']:.1f}ms p95 {frame['p95']:.1f}ms max {frame['max']:.1f}ms",
+        f"frames            {report['frames']:,} ({report['dropped_frames']:,} dropped)",
+        f"ingest lag        p50 {lag['p50']:,} B p95 {lag['p95']:,} B max {lag['max']:,} B",
+        f"partial reads     {report['partial_record_warnings']:,} (other warnings {report['other_warnings']:,})",
+        f"memory            {mem['rss_start'] / 2**20:.1f} MB -> {mem['rss_end'] / 2**20:.1f} MB",
+    ])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from tbview.headless import parse_size
+    parser = argparse.ArgumentParser(prog='tbview stress',
+                                     description='measure write-to-visible latency against a concurrent writer')
+    parser.add_argument('--runs', type=int, default=4, help='number of runs written concurrently')
+    parser.add_argument('--tags', type=int, default=32, help='scalar tags per event')
+    parser.add_argument('--rate', type=float, default=10000.0, help='scalars per second across all runs')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds to write for')
+    parser.add_argument('--fps', type=float, default=20.0, help='viewer frame rate target')
+    parser.add_argument('--size', type=parse_size, default=(160, 48), metavar='WxH', help='headless terminal size')
+    parser.add_argument('--engine', choices=('plotext', 'braille'), default='braille')
+    parser.add_argument('--partial-every', type=int, default=10, metavar='N',
+                        help='split every Nth record into two flushed writes (0 disables)')
+    parser.add_argument('--out', default=None, metavar='FILE', help='write the report as JSON to FILE')
+    parser.add_argument('--workdir', default=None, help='directory for the event files (default: temporary)')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='tbview-stress-') as tmp:
+        report = run_stress(args.workdir or tmp, runs=args.runs, tags=args.tags, rate=args.rate,
+                            duration=args.duration, fps=args.fps, size=args.size, engine=args.engine,
+                            partial_every=args.partial_every,
+                            progress=lambda msg: print(msg, file=sys.stderr))
+    print(format_report(report))
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
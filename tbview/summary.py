@@ -0,0 +1,234 @@
+"""Latest-value summary across runs (`tbview summary`).
+
+For each event file, reports per tag the last step and value plus min, max
+and count. Files are read as cheaply as possible:
+
+- with a cached index entry (written by `--full`), only bytes appended since
+  the cached offset are read and merged, giving exact statistics;
+- otherwise the last `tail_bytes` are read after resynchronizing to a record
+  boundary, so min/max/count cover only that window (marked `~`); the
+  window grows when it holds no record boundary or no matching tag;
+- files smaller than the window are read whole and are exact.
+
+Payloads are decoded with `decode_scalars`, skipping protobuf objects.
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from tbview.parser import decode_scalars, find_record_boundary, read_payloads_from_offset
+
+INDEX_VERSION = 1
+DEFAULT_TAIL_BYTES = 8 * 1024
+
+
+def default_index_path() -> str:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'tbview', 'summary-index.json')
+
+
+def load_index(path: Optional[str]) -> dict:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != INDEX_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_index(path: str, files: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': INDEX_VERSION, 'files': files}, f)
+    os.replace(tmp_path, path)
+
+
+def _file_identity(st) -> List[int]:
+    return [st.st_dev, st.st_ino]
+
+
+def _update_stats(tags: Dict[str, list], start: int, path: str, tag_filter=None) -> int:
+    """Fold scalars after `start` into tags[tag] = [step, value, min, max, count, wall_time].
+
+    Returns the offset after the last complete record read.
+    """
+    offset = start
+    for payload, offset in read_payloads_from_offset(path, start, warn=lambda msg: None):
+        try:
+            step, wall_time, scalars = decode_scalars(payload)
+        except (IndexError, ValueError, struct.error) as e:
+            print(f'{path}: skipping undecodable record at offset {offset - len(payload) - 16}: {e}',
+                  file=sys.stderr)
+            continue
+        for tag, value in scalars:
+            stats = tags.get(tag)
+            if stats is None:
+                if tag_filter is not None and not tag_filter(tag):
+                    continue
+                tags[tag] = [step, value, value, value, 1, wall_time]
+                continue
+            stats[0] = step
+            stats[1] = value
+            if value < stats[2]:
+                stats[2] = value
+            if value > stats[3]:
+                stats[3] = value
+            stats[4] += 1
+            stats[5] = wall_time
+    return offset
+
+
+def summarize_file(path: str, index: Optional[dict] = None, tail_bytes: int = DEFAULT_TAIL_BYTES,
+                   full: bool = False, tag_filter=None) -> dict:
+    """Summarize one event file; updates `index` in place with exact results."""
+    st = os.stat(path)
+    size = st.st_size
+    key = os.path.abspath(path)
+    entry = (index or {}).get(key)
+    if entry and (entry.get('id') != _file_identity(st) or entry.get('offset', 0) > size):
+        entry = None
+
+    if entry is not None:
+        tags = {tag: list(stats) for tag, stats in entry['tags'].items()}
+        offset = entry['offset']
+        if offset < size:
+            offset = _update_stats(tags, offset, path)
+        mode = 'index'
+    elif full or size <= tail_bytes:
+        tags = {}
+        offset = _update_stats(tags, 0, path)
+        mode = 'full'
+    else:
+        tags = {}
+        window = tail_bytes
+        mode = 'tail'
+        with open(path, 'rb') as f:
+            while True:
+                start = find_record_boundary(f, size - window) if window < size else 0
+                if start is None and window < size:
+                    # No boundary inside the window (huge records): widen it
+                    window *= 4
+                    continue
+                # A read from offset 0 is indexed, so it must keep every tag;
+                # the filter is applied to the result below
+                offset = _update_stats(tags, start or 0, path, tag_filter if start else None)
+                # Tags written rarely may not appear in the tail: widen until
+                # something matches or the whole file has been read
+                if tags or start == 0:
+                    break
+                window *= 4
+        if start == 0:
+            mode = 'full'
+
+    if index is not None and mode != 'tail':
+        # The index always holds every tag so later filters can be served from it
+        index[key] = {'id': _file_identity(st), 'offset': offset, 'tags': tags}
+    if tag_filter is not None:
+        tags = {tag: stats for tag, stats in tags.items() if tag_filter(tag)}
+    return {'path': path, 'mode': mode, 'exact': mode != 'tail', 'offset': offset, 'tags': tags}
+
+
+def find_event_files(root: str) -> List[str]:
+    if os.path.isfile(root):
+        return [root]
+    from tbview.export import find_event_files as _find
+    return _find(root)
+
+
+def run_label(path: str, root: str) -> str:
+    if os.path.isfile(root):
+        return os.path.basename(os.path.dirname(os.path.abspath(path))) or '.'
+    return os.path.dirname(os.path.relpath(path, root)) or '.'
+
+
+def summarize(root: str, index_path: Optional[str] = None, tail_bytes: int = DEFAULT_TAIL_BYTES,
+              full: bool = False, include=(), exclude=()) -> List[dict]:
+    """Return one row per (event file, tag) under `root`."""
+    from tbview.export import TagFilter
+    tag_filter = TagFilter(include, exclude) if (include or exclude) else None
+    index = load_index(index_path) if index_path else None
+    snapshot = json.dumps(index, sort_keys=True) if index is not None else None
+    paths = find_event_files(root)
+    labels = [run_label(p, root) for p in paths]
+    duplicated = {label for label, n in Counter(labels).items() if n > 1}
+    rows = []
+    for path, label in zip(paths, labels):
+        if label in duplicated:
+            label = os.path.relpath(path, root) if os.path.isdir(root) else os.path.basename(path)
+        try:
+            result = summarize_file(path, index, tail_bytes=tail_bytes, full=full, tag_filter=tag_filter)
+        except OSError as e:
+            print(f'{path}: {e}', file=sys.stderr)
+            continue
+        for tag in sorted(result['tags']):
+            step, value, vmin, vmax, count, wall_time = result['tags'][tag]
+            rows.append({
+                'run': label, 'path': path, 'tag': tag, 'step': step, 'value': value,
+                'min': vmin, 'max': vmax, 'count': count, 'wall_time': wall_time, 'exact': result['exact'],
+            })
+    if index is not None and json.dumps(index, sort_keys=True) != snapshot:
+        save_index(index_path, index)
+    return rows
+
+
+def format_table(rows: List[dict]) -> str:
+    if not rows:
+        return 'no scalars found'
+    run_w = max(3, max(len(r['run']) for r in rows))
+    tag_w = max(3, max(len(r['tag']) for r in rows))
+    lines = [f'{"run":<{run_w}}  {"tag":<{tag_w}}  {"step":>9}  {"last":>11}  {"min":>12}  {"max":>12}  {"n":>8}']
+    for r in rows:
+        mark = ' ' if r['exact'] else '~'
+        lines.append(
+            f'{r["run"]:<{run_w}}  {r["tag"]:<{tag_w}}  {r["step"]:>9}  {r["value"]:>11.5g}  '
+            f'{mark}{r["min"]:>11.5g}  {mark}{r["max"]:>11.5g}  {mark}{r["count"]:>7}')
+    if any(not r['exact'] for r in rows):
+        lines.append('~ computed over the file tail only; run with --full once to index exact statistics')
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='tbview summary',
+                                     description='print the latest value, min and max of tags across runs')
+    parser.add_argument('path', help='event file or directory of runs')
+    parser.add_argument('--tag', action='append', default=[], metavar='GLOB',
+                        help='only show tags matching GLOB (repeatable)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='hide tags matching GLOB (repeatable)')
+    parser.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    parser.add_argument('--full', action='store_true',
+                        help='scan files without an index entry from the start (exact min/max) and index them')
+    parser.add_argument('--tail-bytes', type=int, default=DEFAULT_TAIL_BYTES,
+                        help=f'bytes read from the end of unindexed files (default {DEFAULT_TAIL_BYTES})')
+    parser.add_argument('--index', default=default_index_path(), metavar='FILE',
+                        help='summary index location (default: %(default)s)')
+    parser.add_argument('--no-index', action='store_true', help='neither read nor write the index')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f'{args.path} is not a valid file or directory')
+    start = time.perf_counter()
+    rows = summarize(args.path, index_path=None if args.no_index else args.index,
+                     tail_bytes=max(1024, args.tail_bytes), full=args.full,
+                     include=args.tag, exclude=args.exclude)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(format_table(rows))
+        print(f'{len({r["path"] for r in rows})} file(s) in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
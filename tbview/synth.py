@@ -0,0 +1,152 @@
+"""Synthetic TensorBoard event files for tests and benchmarks.
+
+`generate_event_file` writes reproducible runs with configurable step and tag
+counts, optional histogram and graph records, value noise, and a corrupted
+tail, so parser and viewer behaviour can be measured on known inputs.
+"""
+
+import math
+import os
+import random
+import struct
+from typing import List, Optional
+
+from tbview.crc32c import masked_crc32c
+from tbview.tf_protobuf.event_pb2 import Event
+
+
+def encode_record(payload: bytes) -> bytes:
+    """Frame a payload as a TFRecord (length, length CRC, payload, payload CRC)."""
+    length_bytes = struct.pack("Q", len(payload))
+    return b"".join((
+        length_bytes,
+        struct.pack("I", masked_crc32c(length_bytes)),
+        payload,
+        struct.pack("I", masked_crc32c(payload)),
+    ))
+
+
+def write_tfrecord_records(path: str, payloads: List[bytes]):
+    # Always append to support incremental writes across calls
+    with open(path, "ab") as f:
+        for payload in payloads:
+            f.write(encode_record(payload))
+
+
+def make_event(step: int, tag: str, value: float) -> bytes:
+    e = Event()
+    e.step = step
+    e.wall_time = 1000.0 + step
+    v = e.summary.value.add()
+    v.tag = tag
+    v.simple_value = float(value)
+    return e.SerializeToString()
+
+
+def make_scalars_event(step: int, values: dict, wall_time: Optional[float] = None) -> bytes:
+    """One event carrying a scalar per tag, as summary writers batch them."""
+    e = Event()
+    e.step = step
+    e.wall_time = 1000.0 + step if wall_time is None else wall_time
+    for tag, value in values.items():
+        v = e.summary.value.add()
+        v.tag = tag
+        v.simple_value = float(value)
+    return e.SerializeToString()
+
+
+def make_histogram_event(step: int, tag: str, rng: random.Random, buckets: int = 30) -> bytes:
+    e = Event()
+    e.step = step
+    e.wall_time = 1000.0 + step
+    v = e.summary.value.add()
+    v.tag = tag
+    samples = [rng.gauss(0.0, 1.0) for _ in range(buckets * 4)]
+    histo = v.histo
+    histo.min = min(samples)
+    histo.max = max(samples)
+    histo.num = len(samples)
+    histo.sum = sum(samples)
+    histo.sum_squares = sum(s * s for s in samples)
+    width = (histo.max - histo.min) / buckets or 1.0
+    counts = [0] * buckets
+    for s in samples:
+        counts[min(buckets - 1, int((s - histo.min) / width))] += 1
+    histo.bucket_limit.extend(histo.min + width * (i + 1) for i in range(buckets))
+    histo.bucket.extend(counts)
+    return e.SerializeToString()
+
+
+def make_graph_event(rng: random.Random, size: int) -> bytes:
+    e = Event()
+    e.wall_time = 1000.0
+    e.graph_def = bytes(rng.getrandbits(8) for _ in range(size))
+    return e.SerializeToString()
+
+
+def tag_names(n_tags: int) -> List[str]:
+    groups = ('train', 'eval', 'lr', 'grad')
+    return [f'{groups[i % len(groups)]}/metric_{i}' for i in range(n_tags)]
+
+
+def generate_event_file(
+    path: str,
+    steps: int = 1000,
+    tags: int = 8,
+    histograms: int = 0,
+    histogram_every: int = 10,
+    graph_bytes: int = 0,
+    noise: float = 0.05,
+    corrupt_tail: bool = False,
+    seed: int = 0,
+) -> dict:
+    """Write a synthetic run to `path` (appending) and describe what was written.
+
+    Each step emits one event with a scalar for every tag (a decaying curve
+    plus gaussian `noise`). Every `histogram_every` steps, `histograms`
+    histogram events are added; `graph_bytes` > 0 prepends a graph record of
+    that size. `corrupt_tail` appends a record whose payload is cut short,
+    like a writer caught mid-flush.
+    """
+    rng = random.Random(seed)
+    names = tag_names(tags)
+    records = 0
+    with open(path, "ab") as f:
+        if graph_bytes > 0:
+            f.write(encode_record(make_graph_event(rng, graph_bytes)))
+            records += 1
+        for step in range(steps):
+            values = {}
+            for i, name in enumerate(names):
+                base = math.exp(-step / (steps / (2.0 + i % 3) + 1.0)) + 0.1 * i
+                values[name] = base + rng.gauss(0.0, noise)
+            f.write(encode_record(make_scalars_event(step, values)))
+            records += 1
+            if histograms and step % histogram_every == 0:
+                for h in range(histograms):
+                    f.write(encode_record(make_histogram_event(step, f'hist/layer_{h}', rng)))
+                    records += 1
+        valid_bytes = f.tell()
+        if corrupt_tail:
+            record = encode_record(make_scalars_event(steps, {names[0]: 0.0} if names else {}))
+            f.write(record[:len(record) // 2])
+    return {
+        'path': path,
+        'records': records,
+        'valid_bytes': valid_bytes,
+        'size': os.path.getsize(path),
+        'tags': names,
+    }
+
+
+def generate_run_dir(root: str, runs: int = 1, **kwargs) -> List[str]:
+    """Write `runs` event files under `root/run_<i>/` and return their paths."""
+    paths = []
+    seed = kwargs.pop('seed', 0)
+    for i in range(runs):
+        run_dir = os.path.join(root, f'run_{i}')
+        os.makedirs(run_dir, exist_ok=True)
+        path = os.path.join(run_dir, f'events.out.tfevents.{1700000000 + i}.synthetic')
+        generate_event_file(path, seed=seed + i, **kwargs)
+        paths.append(path)
+    return paths
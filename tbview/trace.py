@@ -0,0 +1,156 @@
+"""Chrome trace-event recorder for viewer and parser phases.
+
+The process-wide tracer returned by `get_tracer()` is disabled unless
+`--trace-out` installs an enabled one via `set_tracer()`. Disabled spans are
+a shared no-op object, so instrumentation stays in place at negligible cost.
+The output loads in chrome://tracing or Perfetto.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class _NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        # GeneratorExit is a consumer closing a generator early, not a failure
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            self.args['error'] = exc_type.__name__
+        self.tracer._emit({
+            'name': self.name,
+            'cat': self.cat,
+            'ph': 'X',
+            'ts': self.tracer._us(self.start),
+            'dur': (end - self.start) * 1e6,
+            'tid': threading.get_ident(),
+            'args': self.args,
+        })
+        return False
+
+    def set(self, **args):
+        """Attach values known only after the work is done (e.g. counts)."""
+        self.args.update(args)
+
+
+class Tracer(object):
+    """Collects spans, counters and instant events in memory and saves them
+    as a Chrome trace JSON file.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_events: int = 1000000):
+        self.path = path
+        self.enabled = path is not None
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._t0 = time.perf_counter()
+
+    def _us(self, ts: float) -> float:
+        return (ts - self._t0) * 1e6
+
+    def _emit(self, event: Dict[str, Any]):
+        event['pid'] = self._pid
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+
+    def span(self, name: str, cat: str = 'tbview', **args):
+        """Context manager timing a block as a complete ('X') event."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def counter(self, name: str, cat: str = 'tbview', **values):
+        """Record a counter sample; each keyword becomes a series."""
+        if not self.enabled:
+            return
+        self._emit({
+            'name': name,
+            'cat': cat,
+            'ph': 'C',
+            'ts': self._us(time.perf_counter()),
+            'tid': threading.get_ident(),
+            'args': values,
+        })
+
+    def instant(self, name: str, cat: str = 'tbview', **args):
+        if not self.enabled:
+            return
+        self._emit({
+            'name': name,
+            'cat': cat,
+            'ph': 'i',
+            's': 't',
+            'ts': self._us(time.perf_counter()),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def save(self, path: Optional[str] = None):
+        """Write all collected events; safe to call repeatedly."""
+        path = path or self.path
+        if path is None:
+            return
+        payload = {
+            'traceEvents': self.events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'dropped_events': self.dropped},
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> Tracer:
+    """Install `tracer` process-wide and return the previous one."""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer
+    return previous
@@ -1,19 +1,43 @@
 from tbview.dashing_lib.layout import RatioHSplit, RatioVSplit
-from tbview.dashing_lib.widgets import PlotextTile, SelectionTile
+from tbview.dashing_lib.widgets import PlotextTile, PlotGrid, SelectionTile
+from tbview.dashing_lib.braille import BrailleLinePlot, crop_to_range, decimate_minmax
 from tbview.dashing_lib import *
-import plotext as plt
 from time import sleep
 import blessed
-from tbview.parser import read_records, read_records_from_offset
-from collections import OrderedDict
+from tbview.parser import (decode_scalars, read_payloads_at, read_payloads_from_offset, read_records,
+                           read_records_from_offset, window_start_offset)
+from tbview.perf import PerfStats
+from tbview.runcache import RunState, ScanProgress, file_identity, get_run_cache, scan_records
+from tbview.scheduler import ScanScheduler
+from tbview.memreport import format_panel, memory_report
+from tbview.series import POINT_BYTES, SeriesBudget, format_bytes
+from tbview.trace import get_tracer
+from array import array
+from collections import OrderedDict, deque
+from functools import partial
+import math
+import sys
 
 ERROR = '[ERROR]'
 WARN = '[WARN]'
 INFO = '[INFO]'
 DEBUG = '[DEBUG]'
 
+# Disabled timers for grid panels, which may render on worker threads
+_NO_PERF = PerfStats()
+
 class TensorboardViewer:
-    def __init__(self, event_path, event_tag) -> None:
+    PLOT_ENGINES = ('plotext', 'braille')
+    EAGER_TAGS = ('train/epoch',)
+    DEFAULT_GRID_SIZE = 4
+    LOG_MAX_LINES = 200
+    # Seconds of ingestion allowed per pass of the event loop
+    SCAN_BUDGET = 0.02
+    LOAD_GAUGES = 4
+    PANEL_REFRESH_INTERVAL = 1.0
+
+    def __init__(self, event_path, event_tag, plot_engine='plotext', grid_size=0, profile=False, term=None,
+                 since=None, last_steps=None, max_memory=None, remote=None, progressive=False) -> None:
         # Support single or multiple runs
         if isinstance(event_path, (list, tuple)):
             self.event_paths = list(event_path)
@@ -21,8 +45,8 @@ class TensorboardViewer:
         else:
             self.event_paths = [event_path]
             self.run_tags = [event_tag]
-        self.term = blessed.Terminal()
-        self.logger = Log(title=' Log/Err', border_color=15)
+        self.term = term if term is not None else blessed.Terminal()
+        self.logger = Log(title=' Log/Err', border_color=15, max_lines=self.LOG_MAX_LINES)
         self.tag_selector = SelectionTile(
                     options= [],
                     current=0,
@@ -35,16 +59,33 @@ class TensorboardViewer:
         self.x_axis_modes = ['step', 'relative', 'absolute']
         self.x_mode_index = 0
         self.series_colors = ['red', 'green', 'yellow', 'blue', 'magenta', 'cyan']
+        self.plot_engine = plot_engine if plot_engine in self.PLOT_ENGINES else 'plotext'
         self._xlim_steps = None  # tuple (start_step, end_step) or None
         self._awaiting_xlim_input = False
         self._xlim_input_buffer = ''
         self._ylim = None  # tuple (ymin, ymax) or None
         self._awaiting_ylim_input = False
         self._ylim_input_buffer = ''
+        self._awaiting_tag_search = False
+        self._search_restore_current = 0
+        # Grid mode shows several tags at once; pinned tags take precedence
+        # over the tags following the current selection
+        self.grid_size = max(0, int(grid_size or 0))
+        self._grid_enabled = self.grid_size > 0
+        self.grid_pins = []
+        self._grid = None
+        self.plot_tile = PlotextTile(self.plot, cache_key_fn=self._render_state_key, title='Plot', border_color=15)
+        # Phase timers only collect samples while the HUD is shown
+        self.perf = PerfStats(enabled=profile)
+        self.hud = Text('', color=15, title=' Perf', border_color=15)
+        self.mem_panel = Text('', color=15, title=' Memory', border_color=15)
+        self._mem_panel_enabled = False
+        self._mem_panel_ts = 0.0
+        self.tips = Text(" 1.Up/Down/PgUp/PgDn to move through tags, '/' to search.\n\n 2.Use number 1-9 or to select tag.\n\n 3.Press 'q' to go back to selection.\n\n 4.Ctrl+C to quit.\n\n 5.Press 's' to toggle smoothing (0/10/50/100/200).\n\n 6.Press 'm' to toggle X axis (step/rel/abs).\n\n 7.Press 'x' to set xlim in steps (start:end), ESC to cancel.\n\n 8.Press 'y' to set ylim (min:max), ESC to cancel.\n\n 9.Press 'e' to switch plot engine (plotext/braille).\n\n 10.Press 'g' to toggle grid view, 'p' to pin/unpin tag.\n\n 11.Press 't' to toggle the performance HUD, 'r' the memory panel.", color=15, title=' Tips', border_color=15)
         self.ui = RatioHSplit(
-            PlotextTile(self.plot, title='Plot', border_color=15),
+            self._build_grid() if self._grid_enabled else self.plot_tile,
             RatioVSplit(
-                Text(" 1.Press arrow keys to locate coordinates.\n\n 2.Use number 1-9 or to select tag.\n\n 3.Press 'q' to go back to selection.\n\n 4.Ctrl+C to quit.\n\n 5.Press 's' to toggle smoothing (0/10/50/100/200).\n\n 6.Press 'm' to toggle X axis (step/rel/abs).\n\n 7.Press 'x' to set xlim in steps (start:end), ESC to cancel.\n\n 8.Press 'y' to set ylim (min:max), ESC to cancel.", color=15, title=' Tips', border_color=15),
+                self.hud if profile else self.tips,
                 self.tag_selector,
                 self.logger,
                 ratios=(2, 4, 2),
@@ -53,15 +94,32 @@ class TensorboardViewer:
             ratios=(4, 1) if self.term.width > 100 else (3, 1),
             rest_pad_to=1
         )
+        self.ui._terminal = self.term
 
-        # Per-run data structures
+        # Per-run data structures. Scans only record where each scalar tag
+        # occurs; a tag's values are decoded once it is loaded (selected,
+        # plotted or prefetched), so memory follows the tags actually viewed
+        self._tag_offsets_by_run = {tag: OrderedDict() for tag in self.run_tags}
+        self._loaded_tags_by_run = {tag: set() for tag in self.run_tags}
+        self._loaded_tag_bytes_by_run = {tag: set() for tag in self.run_tags}
         self.records_by_run = {tag: OrderedDict() for tag in self.run_tags}
+        self.series_budget = SeriesBudget(max_memory)
+        self._budget_warned = False
+        self.tag_names = []  # union of scalar tags across runs, in discovery order
         self.wall_times_by_run = {tag: {} for tag in self.run_tags}
         self._last_offset_by_run = {tag: 0 for tag in self.run_tags}
         self._last_scan_size_by_run = {tag: 0 for tag in self.run_tags}
-        self._profile_enabled = False
-        self._frame_count = 0
-        self._last_fps_log = 0.0
+        # Bumped whenever a (run, tag) series receives records; part of the render cache keys
+        self._tag_version_by_run = {tag: {} for tag in self.run_tags}
+        # With --remote, tags and series come from `tbview serve` instead of
+        # the files: point counts per tag replace the record offsets
+        self.remote = None
+        self._remote_counts_by_run = {tag: OrderedDict() for tag in self.run_tags}
+        self._remote_received = {}
+        if remote is not None:
+            from tbview.serve import SeriesClient
+            self.remote = SeriesClient(remote)
+            self.log(f'attached to tbview serve at {remote}', INFO)
         import os, time
         self._last_seen_mtime_by_run = {}
         for p, tag in zip(self.event_paths, self.run_tags):
@@ -70,61 +128,551 @@ class TensorboardViewer:
             except Exception:
                 self._last_seen_mtime_by_run[tag] = 0.0
         self._last_scan_ts = time.time()
+        # Each run is re-checked on its own interval, fast while it grows
+        self.scan_scheduler = ScanScheduler(self.run_tags)
         self._quit_and_reselect = False
-        self.scan_events(initial=True)
+        # Set by run(); the loop redraws only after something marked the frame dirty
+        self._loop = None
+        self._dirty = True
+        self._panel_timer = None
+        # With --since/--last-steps only a recent window is loaded first; the
+        # bytes before it are backfilled in a thread when the user zooms out
+        self._history_end_by_run = {}
+        self._backfill_started = False
+        self._backfill_done = deque()
+        self._backfill_jobs = 0
+        # An xlim reaching before the loaded window waits for the backfill
+        self._pending_xlim = None
+        # Runs parsed by an earlier viewer in this process resume where it stopped
+        restored = self._restore_cached_runs() if self.remote is None else set()
+        if self.remote is None and (since is not None or last_steps is not None):
+            self._open_window(since, last_steps, skip=restored)
+        for tag in self.EAGER_TAGS:
+            # Labels show the ETA derived from these on every plot
+            for run_tag in self.run_tags:
+                self._mark_loaded(run_tag, tag)
+        # Progressive loading leaves the initial scan to run() in
+        # SCAN_BUDGET slices, so the first frame and input come right away
+        self._loading = OrderedDict()  # run -> (start offset, size when opened)
+        self._load_started = 0.0
+        self._load_bytes = 0
+        self.load_panel = None
+        if progressive:
+            self._begin_progressive_load()
+        else:
+            self.scan_events(initial=True)
 
 
     def scan_events(self, initial=False):
+        with get_tracer().span('scan_events', cat='viewer', initial=initial):
+            self._scan_events(initial)
+
+    def _scan_events(self, initial):
+        import time
+        perf_token = self.perf.start()
+        n_records = 0
+        n_bytes = 0
+        for path, run_tag in zip(self.event_paths, self.run_tags):
+            records, nbytes, _complete = self._scan_run(path, run_tag, initial)
+            n_records += records
+            n_bytes += nbytes
+        self._refresh_tag_options()
+        self._enforce_memory_budget()
+        if perf_token is not None:
+            self.perf.add_ingest(n_records, n_bytes, time.perf_counter() - perf_token)
+            self.perf.stop('scan', perf_token)
+
+    def scan_due(self, budget=None):
+        """Check the runs the scan scheduler says are due, within `budget` seconds.
+
+        A run whose new records do not fit in the budget is left partially
+        read and stays due. Returns True if any records were ingested.
+        """
+        import os, time
+        budget = self.SCAN_BUDGET if budget is None else budget
+        scheduler = self.scan_scheduler
+        paths = dict(zip(self.run_tags, self.event_paths))
+        perf_token = self.perf.start()
+        deadline = time.perf_counter() + budget
+        n_records = 0
+        n_bytes = 0
+        due = scheduler.due()
+        if self._loading:
+            due = list(self._loading) + [r for r in due if r not in self._loading]
+        with get_tracer().span('scan_due', cat='viewer'):
+            for i, run_tag in enumerate(due):
+                # The first due run always makes progress, even past the budget
+                if i and time.perf_counter() >= deadline:
+                    break
+                path = paths[run_tag]
+                try:
+                    grew = os.path.getsize(path) != self._last_scan_size_by_run.get(run_tag, 0)
+                except OSError:
+                    grew = False
+                complete = True
+                if grew:
+                    try:
+                        records, nbytes, complete = self._scan_run(path, run_tag, deadline=deadline)
+                    except Exception as e:
+                        # Backs off like an idle run instead of being retried on every tick
+                        self.log(f'failed to check file update of {run_tag}: {e}', WARN)
+                        grew = False
+                    else:
+                        n_records += records
+                        n_bytes += nbytes
+                scheduler.observe(run_tag, grew=grew, pending=not complete)
+                if complete and run_tag in self._loading:
+                    del self._loading[run_tag]
+                    if not self._loading:
+                        self._finish_progressive_load()
+        if n_records:
+            self._refresh_tag_options()
+            self._enforce_memory_budget()
+        if perf_token is not None:
+            self.perf.add_ingest(n_records, n_bytes, time.perf_counter() - perf_token)
+            self.perf.stop('scan', perf_token)
+        return n_records > 0
+
+    def _begin_progressive_load(self):
         import os, time
-        start_ts = time.perf_counter()
         for path, run_tag in zip(self.event_paths, self.run_tags):
             try:
-                current_size = os.path.getsize(path)
-            except Exception:
-                continue
-            # Skip scan if no growth
-            if not initial and current_size == self._last_scan_size_by_run.get(run_tag, 0):
+                size = os.path.getsize(path)
+            except OSError:
                 continue
-            # Incremental read per run
-            for event, end_off in read_records_from_offset(
-                path,
-                self._last_offset_by_run.get(run_tag, 0),
-                warn=lambda msg: self.log(msg, WARN)
-            ):
-                summary = event.summary
-                for value in summary.value:
-                    if value.HasField('simple_value'):
-                        per_run_records = self.records_by_run[run_tag]
-                        per_run_times = self.wall_times_by_run[run_tag]
-                        if value.tag not in per_run_records:
-                            per_run_records[value.tag] = {}
-                        if value.tag not in per_run_times:
-                            per_run_times[value.tag] = {}
-                        per_run_records[value.tag][event.step] = value.simple_value
-                        per_run_times[value.tag][event.step] = getattr(event, 'wall_time', None)
-                self._last_offset_by_run[run_tag] = end_off
+            start = self._last_offset_by_run.get(run_tag, 0)
+            if size > start:
+                self._loading[run_tag] = (start, size)
+        if not self._loading:
+            return
+        self._load_started = time.perf_counter()
+        self._load_bytes = sum(size - start for start, size in self._loading.values())
+        n = min(self.LOAD_GAUGES, len(self._loading))
+        self.load_gauges = [HGauge(label='', val=0, color=2) for _ in range(n)]
+        self.load_panel = RatioVSplit(*self.load_gauges, ratios=(1,) * n, rest_pad_to=n - 1,
+                                      title=' Loading', border_color=15)
+        self._set_sidebar_panel(self.load_panel)
+
+    def _finish_progressive_load(self):
+        import time
+        seconds = time.perf_counter() - self._load_started
+        nbytes = sum(self._last_offset_by_run.get(r, 0) for r in self.run_tags)
+        self.log(f'loaded {len(self.run_tags)} run(s), {nbytes / 2**20:.1f} MB in {seconds:.1f}s', INFO)
+        sidebar = self.ui.items[1]
+        if sidebar.items[0] is self.load_panel:
+            self._set_sidebar_panel(
+                self.mem_panel if self._mem_panel_enabled else (self.hud if self.perf.enabled else self.tips))
+        self.load_panel = None
+
+    def _update_load_gauges(self):
+        """Bytes-read fraction of the runs still loading, first LOAD_GAUGES of them."""
+        remaining = 0
+        fractions = []
+        for run_tag, (start, size) in self._loading.items():
+            read = min(size, self._last_offset_by_run.get(run_tag, 0)) - start
+            remaining += size - start - read
+            fractions.append((run_tag, 100.0 * read / (size - start)))
+        width = max(4, min(12, max(len(r) for r, _f in fractions)))
+        for gauge, (run_tag, pct) in zip(self.load_gauges, fractions):
+            gauge.label = f'{run_tag[-width:]:>{width}} {pct:3.0f}%'
+            gauge.value = pct
+        for gauge in self.load_gauges[len(fractions):]:
+            gauge.label = ''
+            gauge.value = 0
+        done = 100.0 * (self._load_bytes - remaining) / max(1, self._load_bytes)
+        self.load_panel.title = f' Loading {len(self._loading)} run(s) {done:.0f}%'
+
+    def _scan_run(self, path, run_tag, initial=False, deadline=None):
+        """Ingest records of one run appended since the last scan.
+
+        Stops early once `deadline` (a perf_counter time) has passed.
+        Returns (records, bytes, complete).
+        """
+        if self.remote is not None:
+            return self._scan_remote_run(path, run_tag)
+        import os, time
+        tracer = get_tracer()
+        try:
+            current_size = os.path.getsize(path)
+        except Exception:
+            return 0, 0, True
+        # Skip scan if no growth
+        if not initial and current_size == self._last_scan_size_by_run.get(run_tag, 0):
+            return 0, 0, True
+        # Incremental read per run
+        start_off = self._last_offset_by_run.get(run_tag, 0)
+        with tracer.span('scan_run', cat='viewer', run=run_tag, path=path):
+            per_run_records = self.records_by_run[run_tag]
+            should_stop = None
+            if deadline is not None:
+                should_stop = lambda: time.perf_counter() >= deadline
+            scan = ScanProgress(start_off)
+            try:
+                scan_records(
+                    path,
+                    scan,
+                    self._tag_offsets_by_run[run_tag],
+                    self._loaded_tags_by_run[run_tag],
+                    self._loaded_tag_bytes_by_run[run_tag],
+                    per_run_records,
+                    self.wall_times_by_run[run_tag],
+                    self._tag_version_by_run[run_tag],
+                    warn=lambda msg: self.log(msg, WARN),
+                    should_stop=should_stop,
+                )
+            finally:
+                # Also after a failed read: the offsets already recorded must
+                # not be read and appended again by the next scan
+                self._last_offset_by_run[run_tag] = scan.end_offset
+                for tag in scan.grown:
+                    self.series_budget.set_points((run_tag, tag), len(per_run_records[tag]))
+            n_records, complete = scan.records, scan.complete
+        run_bytes = self._last_offset_by_run.get(run_tag, 0) - start_off
+        tracer.counter('records_ingested', cat='viewer', **{run_tag: n_records})
+        tracer.counter('bytes_ingested', cat='viewer', **{run_tag: run_bytes})
+        if complete:
+            # After a partial read the size stays stale, so the next check
+            # continues from the last offset
             self._last_scan_size_by_run[run_tag] = current_size
             try:
                 self._last_seen_mtime_by_run[run_tag] = os.path.getmtime(path)
             except Exception:
                 pass
-            self._last_scan_ts = time.time()
+        self._last_scan_ts = time.time()
+        return n_records, run_bytes, complete
+
+    def _scan_remote_run(self, path, run_tag):
+        import os, time
+        from tbview.serve import ServeError
+        n_records = 0
+        try:
+            offset, counts = self.remote.tags(path)
+            counts = self._remote_counts_by_run[run_tag] = OrderedDict(counts)
+            for tag in list(self._loaded_tags_by_run[run_tag]):
+                if counts.get(tag, 0) != self._remote_received.get((run_tag, tag), 0):
+                    n_records += self._fetch_remote(path, run_tag, tag)
+        except (OSError, ServeError) as e:
+            self.log(f'tbview serve: {e}', WARN)
+            return 0, 0, True
+        # Compared with the file size by the reload check, so a daemon
+        # that has not caught up yet is asked again
+        self._last_scan_size_by_run[run_tag] = offset
+        try:
+            self._last_seen_mtime_by_run[run_tag] = os.path.getmtime(path)
+        except Exception:
+            pass
+        self._last_scan_ts = time.time()
+        return n_records, 0, True
 
+    def _fetch_remote(self, path, run_tag, tag):
+        """Append the points of `tag` the daemon has beyond those received; returns their count."""
+        key = (run_tag, tag)
+        start = self._remote_received.get(key, 0)
+        total, steps, values, walls = self.remote.series(path, tag, start=start)
+        per_run_records = self.records_by_run[run_tag]
+        per_run_times = self.wall_times_by_run[run_tag]
+        if total < start:
+            # The event file was rewritten: start over
+            per_run_records.pop(tag, None)
+            per_run_times.pop(tag, None)
+            total, steps, values, walls = self.remote.series(path, tag)
+        self._remote_received[key] = total
+        if tag not in per_run_records:
+            per_run_records[tag] = {}
+            per_run_times[tag] = {}
+        if steps:
+            per_run_records[tag].update(zip(steps, values))
+            per_run_times[tag].update(zip(steps, walls))
+            per_run_versions = self._tag_version_by_run[run_tag]
+            per_run_versions[tag] = per_run_versions.get(tag, 0) + 1
+            self.series_budget.set_points(key, len(per_run_records[tag]))
+        return len(steps)
+
+    def _tag_point_count(self, run_tag, tag):
+        if self.remote is not None:
+            return self._remote_counts_by_run[run_tag].get(tag, 0)
+        return len(self._tag_offsets_by_run[run_tag].get(tag, ()))
+
+    def _mark_loaded(self, run_tag, tag):
+        self._loaded_tags_by_run[run_tag].add(tag)
+        self._loaded_tag_bytes_by_run[run_tag].add(tag.encode('utf-8'))
+
+    def _ensure_tag_loaded(self, tag):
+        """Decode the values of `tag` in every run from the recorded offsets."""
+        if tag is None:
+            return
+        loaded_any = False
+        for path, run_tag in zip(self.event_paths, self.run_tags):
+            if tag in self._loaded_tags_by_run[run_tag]:
+                continue
+            if self.remote is not None:
+                if self._load_remote_tag(path, run_tag, tag):
+                    loaded_any = True
+                continue
+            offsets = self._tag_offsets_by_run[run_tag].get(tag)
+            if not offsets:
+                # Not seen in this run yet: decode it as soon as a scan finds it
+                self._mark_loaded(run_tag, tag)
+                continue
+            with get_tracer().span('load_tag', cat='viewer', run=run_tag, tag=tag, records=len(offsets)):
+                wanted = {tag.encode('utf-8')}
+                values = {}
+                times = {}
+                try:
+                    for payload in read_payloads_at(path, offsets):
+                        step, wall_time, scalars = decode_scalars(payload, tags=wanted)
+                        for _tag, value in scalars:
+                            values[step] = value
+                            times[step] = wall_time
+                except OSError as e:
+                    self.log(f'failed to load {tag} from {run_tag}: {e}', WARN)
+                    continue
+            self._mark_loaded(run_tag, tag)
+            self.records_by_run[run_tag][tag] = values
+            self.wall_times_by_run[run_tag][tag] = times
+            per_run_versions = self._tag_version_by_run[run_tag]
+            per_run_versions[tag] = per_run_versions.get(tag, 0) + 1
+            self.series_budget.set_points((run_tag, tag), len(values))
+            loaded_any = True
+        if loaded_any:
+            self._enforce_memory_budget(extra_protected=(tag,))
+
+    def _load_remote_tag(self, path, run_tag, tag):
+        from tbview.serve import ServeError
+        points = self._remote_counts_by_run[run_tag].get(tag, 0)
+        if not points:
+            return False
+        with get_tracer().span('load_tag', cat='viewer', run=run_tag, tag=tag, records=points):
+            try:
+                self._fetch_remote(path, run_tag, tag)
+            except (OSError, ServeError) as e:
+                self.log(f'failed to load {tag} from {run_tag}: {e}', WARN)
+                return False
+        self._mark_loaded(run_tag, tag)
+        return True
+
+    def _displayed_tags(self):
+        tags = [self._get_selected_tag()]
+        if self._grid_enabled:
+            tags.extend(self._grid_tags())
+        tags.extend(self.EAGER_TAGS)
+        return [t for t in tags if t is not None]
+
+    def _enforce_memory_budget(self, extra_protected=()):
+        """Evict least recently viewed series until back under --max-memory."""
+        budget = self.series_budget
+        if not budget.over_budget():
+            return
+        tags = set(self._displayed_tags())
+        tags.update(extra_protected)
+        protected = [(run_tag, tag) for run_tag in self.run_tags for tag in tags]
+        victims = budget.victims(protected)
+        freed = 0
+        for run_tag, tag in victims:
+            freed += budget.size_of((run_tag, tag))
+            self._evict_series(run_tag, tag)
+        if victims:
+            self.log(f'evicted {len(victims)} series ({format_bytes(freed)}) to stay under --max-memory', DEBUG)
+        if budget.over_budget() and not self._budget_warned:
+            self._budget_warned = True
+            self.log(f'series on screen need {format_bytes(budget.total)}, more than --max-memory '
+                     f'{format_bytes(budget.max_bytes)}', WARN)
+
+    def _evict_series(self, run_tag, tag):
+        self._loaded_tags_by_run[run_tag].discard(tag)
+        self._loaded_tag_bytes_by_run[run_tag].discard(tag.encode('utf-8'))
+        self.records_by_run[run_tag].pop(tag, None)
+        self.wall_times_by_run[run_tag].pop(tag, None)
+        self.series_budget.discard((run_tag, tag))
+        self._remote_received.pop((run_tag, tag), None)
+        per_run_versions = self._tag_version_by_run[run_tag]
+        per_run_versions[tag] = per_run_versions.get(tag, 0) + 1
+
+    def _prefetch_neighbors(self):
+        """Load one unloaded tag next to the selection; returns True if it did."""
+        current = self.tag_selector.current
+        budget = self.series_budget
+        for idx in (current + 1, current - 1):
+            if 0 <= idx < len(self.tag_names):
+                tag = self.tag_names[idx]
+                points = sum(self._tag_point_count(r, tag) for r in self.run_tags
+                             if tag not in self._loaded_tags_by_run[r])
+                if not points:
+                    continue
+                # Prefetching must not evict anything, or neighbours would
+                # keep evicting each other
+                if budget.max_bytes is not None and budget.total + points * POINT_BYTES > budget.max_bytes:
+                    return False
+                self._ensure_tag_loaded(tag)
+                return True
+        return False
+
+    def _refresh_tag_options(self):
         # Update tag options as union across runs
         all_tags = OrderedDict()
+        tags_by_run = self._remote_counts_by_run if self.remote is not None else self._tag_offsets_by_run
         for run_tag in self.run_tags:
-            for t in self.records_by_run.get(run_tag, {}):
+            for t in tags_by_run.get(run_tag, {}):
                 all_tags.setdefault(t, None)
-        self.tag_selector.options = [
-            f'[{i+1}] {root_tag} '
-            for i, root_tag in enumerate(all_tags.keys())
-        ]
-        if self._profile_enabled:
-            self.log(f'scan_events took {(time.perf_counter()-start_ts)*1000:.1f}ms', DEBUG)
+        tag_names = list(all_tags.keys())
+        if tag_names != self.tag_names:
+            # Only rebuild labels and the search index when the tag set changed
+            self.tag_names = tag_names
+            self.tag_selector.set_options(
+                [f'[{i+1}] {root_tag} ' for i, root_tag in enumerate(tag_names)],
+                keys=tag_names,
+            )
+
+    def _open_window(self, since, last_steps, skip=()):
+        for path, run_tag in zip(self.event_paths, self.run_tags):
+            if run_tag in skip:
+                continue
+            try:
+                start = window_start_offset(path, since=since, last_steps=last_steps)
+            except Exception as e:
+                self.log(f'failed to locate recent window of {run_tag}: {e}', WARN)
+                continue
+            if start > 0:
+                self._last_offset_by_run[run_tag] = start
+                self._history_end_by_run[run_tag] = start
+        if self._history_end_by_run:
+            skipped = sum(self._history_end_by_run.values())
+            self.log(f'loaded the recent window only ({skipped / 2**20:.1f} MB of history skipped); '
+                     "clear xlim or set it before the window with 'x' to load the rest", INFO)
+
+    def _restore_cached_runs(self):
+        cache = get_run_cache()
+        restored = set()
+        for path, run_tag in zip(self.event_paths, self.run_tags):
+            state = cache.take(path)
+            if state is None:
+                continue
+            self._tag_offsets_by_run[run_tag] = state.offsets_by_tag
+            self._loaded_tags_by_run[run_tag] = set(state.loaded_tags)
+            self._loaded_tag_bytes_by_run[run_tag] = {t.encode('utf-8') for t in state.loaded_tags}
+            self.records_by_run[run_tag] = state.records
+            self.wall_times_by_run[run_tag] = state.wall_times
+            self._tag_version_by_run[run_tag] = state.versions
+            self._last_offset_by_run[run_tag] = state.last_offset
+            self._last_scan_size_by_run[run_tag] = state.last_scan_size
+            self._last_seen_mtime_by_run[run_tag] = state.last_mtime
+            if state.history_end is not None:
+                self._history_end_by_run[run_tag] = state.history_end
+            for tag, values in state.records.items():
+                self.series_budget.set_points((run_tag, tag), len(values))
+            restored.add(run_tag)
+        if restored:
+            self.log(f'resumed {len(restored)} run(s) from the run cache', INFO)
+            self._refresh_tag_options()
+            self._enforce_memory_budget()
+        return restored
+
+    def stash_runs(self):
+        """Hand the parsed state of every run to the process-wide run cache."""
+        cache = get_run_cache()
+        if self.remote is not None or not cache.max_bytes:
+            return
+        for path, run_tag in zip(self.event_paths, self.run_tags):
+            try:
+                identity = file_identity(path)
+            except OSError:
+                continue
+            cache.put(path, RunState(
+                identity,
+                self._tag_offsets_by_run[run_tag],
+                self._loaded_tags_by_run[run_tag],
+                self.records_by_run[run_tag],
+                self.wall_times_by_run[run_tag],
+                self._tag_version_by_run[run_tag],
+                self._last_offset_by_run[run_tag],
+                self._last_scan_size_by_run[run_tag],
+                self._last_seen_mtime_by_run.get(run_tag, 0.0),
+                history_end=self._history_end_by_run.get(run_tag),
+            ))
+
+    def _start_backfill(self):
+        """Parse the history skipped by the recent window in a background thread."""
+        if self._backfill_started or not self._history_end_by_run:
+            return
+        self._backfill_started = True
+        import threading
+        paths = dict(zip(self.run_tags, self.event_paths))
+        jobs = [(run_tag, paths[run_tag], end) for run_tag, end in self._history_end_by_run.items()]
+        self._backfill_jobs = len(jobs)
+        self.log('loading older history in the background...', INFO)
+        threading.Thread(target=self._backfill, args=(jobs,), name='tbview-backfill', daemon=True).start()
+
+    def _backfill(self, jobs):
+        # Runs off the main thread: only builds private containers and hands
+        # them over through the deque, merged by _merge_backfill on the UI thread
+        for run_tag, path, end in jobs:
+            offsets_by_tag = OrderedDict()
+            records = {}
+            times = {}
+            try:
+                for payload, off in read_payloads_from_offset(path, 0, warn=lambda msg: None,
+                                                              end_offset=end, resync=True):
+                    record_start = off - len(payload) - 16
+                    step, wall_time, scalars = decode_scalars(payload)
+                    for tag, value in scalars:
+                        if tag not in records:
+                            offsets_by_tag[tag] = array('q')
+                            records[tag] = {}
+                            times[tag] = {}
+                        offsets_by_tag[tag].append(record_start)
+                        records[tag][step] = value
+                        times[tag][step] = wall_time
+            except Exception as e:
+                self._backfill_done.append((run_tag, None, None, e))
+                self._wake()
+                continue
+            self._backfill_done.append((run_tag, offsets_by_tag, records, times))
+            self._wake()
+
+    def _merge_backfill(self):
+        while self._backfill_done:
+            run_tag, offsets_by_tag, records, times = self._backfill_done.popleft()
+            self._backfill_jobs -= 1
+            if offsets_by_tag is None:
+                self.log(f'failed to load history of {run_tag}: {times}', WARN)
+                continue
+            current_offsets = self._tag_offsets_by_run[run_tag]
+            for tag, offsets in offsets_by_tag.items():
+                if tag in current_offsets:
+                    offsets.extend(current_offsets[tag])
+                current_offsets[tag] = offsets
+            loaded = self._loaded_tags_by_run[run_tag]
+            per_run_records = self.records_by_run[run_tag]
+            per_run_times = self.wall_times_by_run[run_tag]
+            per_run_versions = self._tag_version_by_run[run_tag]
+            for tag, older in records.items():
+                # Unloaded tags are decoded from the merged offsets on demand
+                if tag not in loaded:
+                    continue
+                # Older points go first; points already loaded win on repeated steps
+                older.update(per_run_records.get(tag, {}))
+                per_run_records[tag] = older
+                older_times = times[tag]
+                older_times.update(per_run_times.get(tag, {}))
+                per_run_times[tag] = older_times
+                per_run_versions[tag] = per_run_versions.get(tag, 0) + 1
+                self.series_budget.set_points((run_tag, tag), len(older))
+            self._history_end_by_run.pop(run_tag, None)
+            self.log(f'loaded history of {run_tag}', INFO)
+            self._refresh_tag_options()
+        self._enforce_memory_budget()
+        if self._pending_xlim is not None and not self._backfill_jobs:
+            start_v, end_v = self._pending_xlim
+            self._pending_xlim = None
+            self._apply_xlim(start_v, end_v)
 
     def handle_input(self, key):
         if key is None:
             return
+        # Handle incremental tag search mode
+        if self._awaiting_tag_search:
+            self._handle_tag_search_input(key)
+            return
         # Handle ylim interactive input mode
         if self._awaiting_ylim_input:
             if key.is_sequence:
@@ -176,7 +724,7 @@ class TensorboardViewer:
             return
 
         if key.is_sequence:
-            pass
+            self._handle_navigation_key(getattr(key, 'name', ''))
         else:
             if key.isdigit():
                 digit = int(key)
@@ -189,6 +737,27 @@ class TensorboardViewer:
             elif str(key).lower() == 'm':
                 self.x_mode_index = (self.x_mode_index + 1) % len(self.x_axis_modes)
                 self.log(f"X axis set to {self.x_axis_modes[self.x_mode_index]}", INFO)
+            elif str(key).lower() == 'e':
+                engines = self.PLOT_ENGINES
+                self.plot_engine = engines[(engines.index(self.plot_engine) + 1) % len(engines)]
+                self.log(f'plot engine set to {self.plot_engine}', INFO)
+            elif str(key) == '/':
+                self._awaiting_tag_search = True
+                self._search_restore_current = self.tag_selector.current
+                self.tag_selector.searching = True
+                self.tag_selector.set_query('')
+                self.log("Type to search tags, Enter to accept, ESC to cancel.", INFO)
+            elif str(key).lower() == 'g':
+                self._set_grid_enabled(not self._grid_enabled)
+                self.log(f"grid view {'on' if self._grid_enabled else 'off'}", INFO)
+            elif str(key).lower() == 'p':
+                self._toggle_grid_pin()
+            elif str(key).lower() == 't':
+                self._set_hud_enabled(not self.perf.enabled)
+                self.log(f"performance HUD {'on' if self.perf.enabled else 'off'}", INFO)
+            elif str(key).lower() == 'r':
+                self._set_mem_panel_enabled(not self._mem_panel_enabled)
+                self.log(f"memory panel {'on' if self._mem_panel_enabled else 'off'}", INFO)
             elif str(key).lower() == 'q':
                 self._quit_and_reselect = True
             elif str(key).lower() == 'x':
@@ -203,30 +772,272 @@ class TensorboardViewer:
                 self.log("Enter ylim as min:max (empty to clear). Press Enter to apply.", INFO)
                 self._render_ylim_prompt()
 
+    def _grid_tags(self):
+        """Return the tags shown in grid panels, padded with None."""
+        n = self.grid_size
+        if self.grid_pins:
+            tags = self.grid_pins[:n]
+        else:
+            start = max(0, min(self.tag_selector.current, len(self.tag_names) - 1))
+            tags = self.tag_names[start:start + n]
+        return list(tags) + [None] * (n - len(tags))
+
+    def _grid_panel_tag(self, idx):
+        tags = self._grid_tags()
+        return tags[idx] if idx < len(tags) else None
+
+    def _plot_grid_panel(self, idx, tbox):
+        tag = self._grid_panel_tag(idx)
+        return self.plot_tag(tag, tbox, panel=True) if tag is not None else None
+
+    def _prepare_grid(self):
+        """Load and touch the grid tags on the UI thread, before panels render."""
+        for tag in self._grid_tags():
+            if tag is None:
+                continue
+            self._ensure_tag_loaded(tag)
+            for run_tag in self.run_tags:
+                self.series_budget.touch((run_tag, tag))
+
+    def _grid_panel_key(self, idx):
+        tag = self._grid_panel_tag(idx)
+        return self._render_state_key(tag) if tag is not None else None
+
+    def _build_grid(self):
+        n = self.grid_size or self.DEFAULT_GRID_SIZE
+        self.grid_size = n
+        ncols = int(math.ceil(math.sqrt(n)))
+        panels = [
+            PlotextTile(partial(self._plot_grid_panel, i), cache_key_fn=partial(self._grid_panel_key, i), border_color=15)
+            for i in range(n)
+        ]
+        # plotext renders through global state, so only the braille engine runs panels concurrently
+        self._grid = PlotGrid(panels, ncols, parallel_fn=lambda: self.plot_engine == 'braille')
+        return self._grid
+
+    def _set_grid_enabled(self, enabled):
+        self._grid_enabled = enabled
+        if enabled and self._grid is None:
+            self._build_grid()
+        main = self._grid if enabled else self.plot_tile
+        self.ui.items = (main,) + tuple(self.ui.items[1:])
+
+    def _set_hud_enabled(self, enabled):
+        self.perf.enabled = enabled
+        if not enabled:
+            self.perf.reset()
+        self._mem_panel_enabled = False
+        self._set_sidebar_panel(self.hud if enabled else self.tips)
+
+    def _set_mem_panel_enabled(self, enabled):
+        self._mem_panel_enabled = enabled
+        self._mem_panel_ts = 0.0
+        self._set_sidebar_panel(self.mem_panel if enabled else (self.hud if self.perf.enabled else self.tips))
+
+    def _set_sidebar_panel(self, panel):
+        sidebar = self.ui.items[1]
+        sidebar.items = (panel,) + tuple(sidebar.items[1:])
+
+    def _update_mem_panel(self):
+        # Walking every series is cheap but not free; refresh once a second
+        import time
+        now = time.time()
+        if now - self._mem_panel_ts < 1.0:
+            return
+        self._mem_panel_ts = now
+        self.mem_panel.text = '\n'.join(format_panel(memory_report(self)))
+
+    def _update_hud(self):
+        lines = self.perf.summary_lines()
+        lines.append(f' series {self._memory_usage_text()} ({len(self.series_budget)} loaded)')
+        self.hud.text = '\n'.join(lines)
+
+    def _memory_usage_text(self):
+        budget = self.series_budget
+        if budget.max_bytes is None:
+            return format_bytes(budget.total)
+        return f'{format_bytes(budget.total)}/{format_bytes(budget.max_bytes)}'
+
+    def _toggle_grid_pin(self):
+        tag = self._get_selected_tag()
+        if tag is None:
+            return
+        if tag in self.grid_pins:
+            self.grid_pins.remove(tag)
+            self.log(f'unpinned {tag} from grid', INFO)
+        else:
+            self.grid_pins.append(tag)
+            self.log(f'pinned {tag} to grid ({len(self.grid_pins)}/{self.grid_size or self.DEFAULT_GRID_SIZE})', INFO)
+
+    def _handle_navigation_key(self, name):
+        """Move the tag selection for arrow and paging keys; return True if handled."""
+        selector = self.tag_selector
+        if name == 'KEY_UP':
+            selector.move(-1)
+        elif name == 'KEY_DOWN':
+            selector.move(1)
+        elif name == 'KEY_PGUP':
+            selector.page(-1)
+        elif name == 'KEY_PGDOWN':
+            selector.page(1)
+        elif name == 'KEY_HOME':
+            selector.move(-len(selector.options))
+        elif name == 'KEY_END':
+            selector.move(len(selector.options))
+        else:
+            return False
+        return True
+
+    def _handle_tag_search_input(self, key):
+        selector = self.tag_selector
+        if key.is_sequence:
+            name = getattr(key, 'name', '')
+            if name in ('KEY_BACKSPACE', 'KEY_DELETE'):
+                selector.set_query(selector.query[:-1])
+            elif name in ('KEY_ENTER',):
+                self._finish_tag_search(accept=True)
+            elif name in ('KEY_ESCAPE',):
+                self._finish_tag_search(accept=False)
+            else:
+                self._handle_navigation_key(name)
+            return
+        ch = str(key)
+        if ch in ('\n', '\r'):
+            self._finish_tag_search(accept=True)
+        elif ch.isprintable():
+            selector.set_query(selector.query + ch)
+
+    def _finish_tag_search(self, accept):
+        selector = self.tag_selector
+        self._awaiting_tag_search = False
+        selector.searching = False
+        if accept and len(selector.visible):
+            tag = self._get_selected_tag()
+            self.log(f'selected tag {tag}', INFO)
+        else:
+            selector.current = self._search_restore_current
+            self.log('tag search cancelled', INFO)
+        selector.set_query('')
+
     def log(self, msg, level=''):
         self.logger.append(self.term.white(f'{level} {msg}'))
 
+    def _render_state_key(self, tag=None):
+        """Return a hashable key describing everything a plot of `tag` depends on.
+
+        Defaults to the selected tag. Labels carry ETA from 'train/epoch', so
+        its versions are part of the key as well.
+        """
+        if tag is None:
+            tag = self._get_selected_tag()
+        versions = []
+        for run_tag in self.run_tags:
+            per_run_versions = self._tag_version_by_run.get(run_tag, {})
+            versions.append((per_run_versions.get(tag, 0), per_run_versions.get('train/epoch', 0)))
+        return (
+            tag,
+            tuple(versions),
+            self.smoothing_window,
+            self.x_axis_modes[self.x_mode_index],
+            self.plot_engine,
+            self._xlim_steps,
+            self._ylim,
+        )
+
     def plot(self, tbox):
-        import time
-        t0 = time.perf_counter()
+        """Build the figure for the selected tag and return it as a string."""
+        return self.plot_tag(self._get_selected_tag(), tbox)
+
+    def plot_tag(self, tag, tbox, panel=False):
+        """Build the figure for `tag` and return it as a string.
+
+        Grid panels (`panel=True`) may render on worker threads: they leave
+        viewer state alone (see `_prepare_plot`), skip the HUD timers and show
+        render errors inside the panel instead of logging them.
+        """
+        perf = self.perf if not panel else _NO_PERF
+        with get_tracer().span('plot', cat='viewer', tag=tag, engine=self.plot_engine, w=tbox.w, h=tbox.h) as span:
+            perf_token = perf.start()
+            spec = self._prepare_plot(tag, panel=panel)
+            perf.stop('series', perf_token)
+            if spec is None:
+                return None
+            span.set(series=len(spec['series']), points=sum(len(s[1]) for s in spec['series']))
+            perf_token = perf.start()
+            # Safeguard rendering to avoid crashing the UI on plotting errors
+            figure = None
+            try:
+                if self.plot_engine == 'braille':
+                    figure = self._build_braille(spec, tbox)
+                else:
+                    figure = self._build_plotext(spec, tbox)
+            except Exception as e:
+                if panel:
+                    return f'plot rendering failed: {e}'
+                self.log(f'plot rendering failed: {e}', ERROR)
+                # Clear potentially invalid limits to recover next frame
+                self._xlim_steps = None
+                self._ylim = None
+            perf.stop('build', perf_token)
+            return figure
+
+    def _build_plotext(self, spec, tbox):
+        import plotext as plt  # deferred: ~35 ms to import and unused by the braille engine
         plt.theme('clear')
         plt.cld()
         plt.plot_size(tbox.w, tbox.h)
-        # Collect union of tags across runs for selection
-        all_tags = OrderedDict()
-        for run_tag in self.run_tags:
-            for t in self.records_by_run.get(run_tag, {}):
-                all_tags.setdefault(t, None)
-        keys = list(all_tags.keys())
-        if not keys:
-            return
-        safe_idx = max(0, min(self.tag_selector.current, len(keys)-1))
-        key = keys[safe_idx]
+        for x_vals, values, label, color in spec['series']:
+            x_vals, values = decimate_minmax(*crop_to_range(x_vals, values, spec['xlim']), tbox.w)
+            plt.plot(list(x_vals), list(values), label=label, color=color)
+        plt.title(spec['title'])
+        plt.xfrequency(10)
+        plt.xlabel(spec['xlabel'])
+        if spec['xlim'] is not None:
+            plt.xlim(*spec['xlim'])
+        if spec['ylim'] is not None:
+            plt.ylim(*spec['ylim'])
+        return plt.build()
+
+    def _build_braille(self, spec, tbox):
+        fig = BrailleLinePlot()
+        for x_vals, values, label, color in spec['series']:
+            fig.plot(x_vals, values, label=label, color=color)
+        fig.title = spec['title']
+        fig.xlabel = spec['xlabel']
+        fig.xlim = spec['xlim']
+        fig.ylim = spec['ylim']
+        fig.absolute_time = spec['x_mode'] == 'absolute'
+        return fig.build(tbox.w, tbox.h)
+
+    def _prepare_plot(self, key, panel=False):
+        """Collect series, labels and validated limits for tag `key`.
+
+        Returns a dict consumed by the plot engines, or None when there is
+        nothing to draw. A limit that does not fit the data is cleared with a
+        warning, except for grid panels: they only read viewer state (the tag
+        is loaded by `_prepare_grid`) and ignore such a limit locally, since
+        other panels may still fit it.
+        """
+        if key is None:
+            return None
+        if not panel:
+            self._ensure_tag_loaded(key)
+            for run_tag in self.run_tags:
+                self.series_budget.touch((run_tag, key))
+
+        def drop_limit(attr, message):
+            if not panel:
+                self.log(message, WARN)
+                setattr(self, attr, None)
+
         x_mode = self.x_axis_modes[self.x_mode_index]
 
-        # Build and plot series for each run that has this tag
+        # Build series for each run that has this tag
         last_step = None
         any_series = False
+        series = []
+        xlim = None
+        ylim = None
         xlabel = 'step'
         custom_ticks = None
         custom_labels = None
@@ -267,8 +1078,8 @@ class TensorboardViewer:
                         start_day = start_dt.strftime('%d/%m')
                         xlabel = f'time HH:MM (start {start_day})'
                     else:
-                        t0 = times[0]
-                        rel = [t - t0 for t in times]
+                        first_time = times[0]
+                        rel = [t - first_time for t in times]
                         total = rel[-1] if rel else 0
                         if total < 60:
                             divisor = 1.0
@@ -303,18 +1114,15 @@ class TensorboardViewer:
                 speed_str = None
 
             color = self.series_colors[idx % len(self.series_colors)]
-            try:
-                plot_label = str(run_tag)
-                extra_parts = []
-                if eta_str is not None:
-                    extra_parts.append(f"eta {eta_str}")
-                if speed_str is not None:
-                    extra_parts.append(speed_str)
-                if extra_parts:
-                    plot_label = f"{plot_label} (" + ", ".join(extra_parts) + ")"
-                plt.plot(x_vals, values, label=plot_label, color=color)
-            except Exception:
-                plt.plot(x_vals, values, color=color)
+            plot_label = str(run_tag)
+            extra_parts = []
+            if eta_str is not None:
+                extra_parts.append(f"eta {eta_str}")
+            if speed_str is not None:
+                extra_parts.append(speed_str)
+            if extra_parts:
+                plot_label = f"{plot_label} (" + ", ".join(extra_parts) + ")"
+            series.append((x_vals, values, plot_label, color))
             any_series = True
             if sorted_steps:
                 s_last = sorted_steps[-1]
@@ -353,13 +1161,10 @@ class TensorboardViewer:
                             global_xlim_max = run_max
 
         if not any_series:
-            return
+            return None
 
         last_step = global_last_step
-        plt.title(f"{key} (smooth={self.smoothing_window}, last_step={last_step})")
-        plt.xfrequency(10)
-        plt.xlabel(xlabel)
-        # Apply xlim after plotting
+        # Resolve xlim after collecting series
         if self._xlim_steps is not None:
             start_s, end_s = self._xlim_steps
             if x_mode == 'step':
@@ -370,27 +1175,21 @@ class TensorboardViewer:
                     cx0 = max(x0, global_xmin_step)
                     cx1 = min(x1, global_xmax_step)
                     if cx1 > cx0:
-                        plt.xlim(cx0, cx1)
+                        xlim = (cx0, cx1)
                     else:
-                        self.log('requested xlim is outside data range; ignoring', WARN)
-                        self._xlim_steps = None
+                        drop_limit('_xlim_steps', 'requested xlim is outside data range; ignoring')
                 else:
-                    self.log('no data range available for xlim; ignoring', WARN)
-                    self._xlim_steps = None
+                    drop_limit('_xlim_steps', 'no data range available for xlim; ignoring')
             else:
                 if global_xlim_min is not None and global_xlim_max is not None:
                     if global_xlim_max > global_xlim_min:
-                        try:
-                            plt.xlim(global_xlim_min, global_xlim_max)
-                        except Exception as e:
-                            self.log(f'failed to set xlim for {x_mode}: {global_xlim_min} {global_xlim_max}: {e}', WARN)
-                    else:
+                        xlim = (global_xlim_min, global_xlim_max)
+                    elif not panel:
                         self.log('computed xlim has non-positive width; ignoring', WARN)
                 else:
                     # No points within requested range in time-based x axis; clear invalid selection
-                    self.log('requested xlim selects no points in current x mode; clearing', WARN)
-                    self._xlim_steps = None
-        # Apply ylim after plotting
+                    drop_limit('_xlim_steps', 'requested xlim selects no points in current x mode; clearing')
+        # Resolve ylim against the plotted values
         if self._ylim is not None:
             y_min, y_max = self._ylim
             if global_ymin is not None and global_ymax is not None:
@@ -399,31 +1198,30 @@ class TensorboardViewer:
                 cy0 = max(a, global_ymin)
                 cy1 = min(b, global_ymax)
                 if cy1 > cy0:
-                    plt.ylim(cy0, cy1)
+                    ylim = (cy0, cy1)
                 else:
-                    self.log('requested ylim is outside data range; ignoring', WARN)
-                    self._ylim = None
+                    drop_limit('_ylim', 'requested ylim is outside data range; ignoring')
             else:
-                self.log('no data range available for ylim; ignoring', WARN)
-                self._ylim = None
-        # Safeguard rendering to avoid crashing the UI on plotting errors
-        try:
-            plt.show()
-        except Exception as e:
-            self.log(f'plot rendering failed: {e}', ERROR)
-            # Clear potentially invalid limits to recover next frame
-            self._xlim_steps = None
-            self._ylim = None
-        if self._profile_enabled:
-            self.log(f'plot took {(time.perf_counter()-t0)*1000:.1f}ms', DEBUG)
+                drop_limit('_ylim', 'no data range available for ylim; ignoring')
+        return {
+            'tag': key,
+            'title': f"{key} (smooth={self.smoothing_window}, last_step={last_step})",
+            'xlabel': xlabel,
+            'x_mode': x_mode,
+            'series': series,
+            'xlim': xlim,
+            'ylim': ylim,
+        }
 
     def _finalize_xlim_input(self):
         raw = (self._xlim_input_buffer or '').strip()
         self._awaiting_xlim_input = False
         self._xlim_input_buffer = ''
+        self._pending_xlim = None
         if raw == '':
             self._xlim_steps = None
             self.log('xlim cleared', INFO)
+            self._start_backfill()
             return
         try:
             if ':' in raw:
@@ -435,28 +1233,40 @@ class TensorboardViewer:
                 end_v = int(raw)
             if start_v > end_v:
                 start_v, end_v = end_v, start_v
-            # Validate against available step range for currently selected tag
-            selected_tag = self._get_selected_tag()
-            gmin, gmax = self._get_global_step_range_for_tag(selected_tag)
-            if gmin is None or gmax is None:
-                self._xlim_steps = None
-                self.log('no data available to apply xlim; ignoring', WARN)
-                return
-            # Clamp to data range
-            cx0 = max(start_v, gmin)
-            cx1 = min(end_v, gmax)
-            if cx1 <= cx0:
-                self._xlim_steps = None
-                self.log('requested xlim is outside data range; ignoring', WARN)
-                return
-            self._xlim_steps = (cx0, cx1)
-            if (cx0, cx1) != (start_v, end_v):
-                self.log(f'clamped xlim (steps) to {cx0}:{cx1}', INFO)
-            else:
-                self.log(f'set xlim (steps) to {cx0}:{cx1}', INFO)
+            gmin, _gmax = self._get_global_step_range_for_tag(self._get_selected_tag())
+            if gmin is not None and start_v < gmin:
+                # Zooming out past the loaded window
+                self._start_backfill()
+                if self._backfill_jobs:
+                    # Validated against the merged history by _merge_backfill
+                    self._pending_xlim = (start_v, end_v)
+                    self.log(f'xlim {start_v}:{end_v} applies once older history is loaded', INFO)
+                    return
+            self._apply_xlim(start_v, end_v)
         except Exception as e:
             self.log(f'failed to parse xlim: {e}', WARN)
 
+    def _apply_xlim(self, start_v, end_v):
+        """Clamp a step range to the selected tag's data and use it as xlim."""
+        selected_tag = self._get_selected_tag()
+        gmin, gmax = self._get_global_step_range_for_tag(selected_tag)
+        if gmin is None or gmax is None:
+            self._xlim_steps = None
+            self.log('no data available to apply xlim; ignoring', WARN)
+            return
+        # Clamp to data range
+        cx0 = max(start_v, gmin)
+        cx1 = min(end_v, gmax)
+        if cx1 <= cx0:
+            self._xlim_steps = None
+            self.log('requested xlim is outside data range; ignoring', WARN)
+            return
+        self._xlim_steps = (cx0, cx1)
+        if (cx0, cx1) != (start_v, end_v):
+            self.log(f'clamped xlim (steps) to {cx0}:{cx1}', INFO)
+        else:
+            self.log(f'set xlim (steps) to {cx0}:{cx1}', INFO)
+
     def _render_xlim_prompt(self):
         self.logger.replace_last(self.term.white(f"{INFO} Enter xlim in steps as start:end (ESC to cancel): {self._xlim_input_buffer}"))
 
@@ -488,12 +1298,7 @@ class TensorboardViewer:
 
     def _get_selected_tag(self):
         """Return the currently selected tag name or None if unavailable."""
-        # Collect union of tags across runs
-        all_tags = OrderedDict()
-        for run_tag in self.run_tags:
-            for t in self.records_by_run.get(run_tag, {}):
-                all_tags.setdefault(t, None)
-        keys = list(all_tags.keys())
+        keys = self.tag_names
         if not keys:
             return None
         safe_idx = max(0, min(self.tag_selector.current, len(keys)-1))
@@ -607,60 +1412,136 @@ class TensorboardViewer:
         eta = max(0.0, t_rel * (1.0 / frac) - time_elapsed)
         return eta, speed
 
+    def render_frame(self):
+        """Lay out and render one frame for the current terminal size."""
+        perf = self.perf
+        if self._backfill_done:
+            self._merge_backfill()
+        if self._loading:
+            self._update_load_gauges()
+        if self.series_budget.max_bytes is not None:
+            self.tag_selector.title = f' Tags List {self._memory_usage_text()}'
+        self.ui.ratios = (4, 1) if self.term.width > 100 else (3, 1)
+        if perf.enabled:
+            self._update_hud()
+        if self._mem_panel_enabled:
+            self._update_mem_panel()
+        if self._grid_enabled:
+            self._prepare_grid()
+        perf_token = perf.start()
+        with get_tracer().span('render', cat='ui'):
+            frame = self.ui.render()
+        perf.stop('render', perf_token)
+        return frame
+
+    def _mark_dirty(self):
+        self._dirty = True
+
+    def _wake(self):
+        """Redraw soon; safe to call from worker threads."""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._mark_dirty)
+
+    def _write_frame(self):
+        perf = self.perf
+        frame = self.render_frame()
+        perf_token = perf.start()
+        with get_tracer().span('write', cat='ui', bytes=len(frame)):
+            sys.stdout.write(frame)
+            sys.stdout.flush()
+        perf.stop('write', perf_token)
+        perf.frame()
+
+    def _read_keys(self):
+        # select() only sees bytes blessed has not buffered yet, so handle
+        # every key already available before waiting again
+        tracer = get_tracer()
+        perf = self.perf
+        while not self._quit_and_reselect:
+            key = self.term.inkey(timeout=0)
+            if not key:
+                break
+            perf_token = perf.start()
+            with tracer.span('input', cat='ui', key=key.name or str(key)):
+                self.handle_input(key)
+            perf.stop('input', perf_token)
+        self._dirty = True
+
+    def _scan_tick(self):
+        """Ingest due runs within SCAN_BUDGET and schedule the next tick."""
+        try:
+            if self.scan_due():
+                self._dirty = True
+        except Exception as e:
+            self.log(f'failed to check file update: {e}', WARN)
+            self._dirty = True
+        self._loop.call_later(0 if self._loading else self.scan_scheduler.next_delay(), self._scan_tick)
+
+    def _schedule_panel_refresh(self):
+        # The HUD and memory panel change without input; redraw them once a second
+        if self._panel_timer is None and (self.perf.enabled or self._mem_panel_enabled):
+            self._panel_timer = self._loop.call_later(self.PANEL_REFRESH_INTERVAL, self._refresh_panels)
+
+    def _refresh_panels(self):
+        self._panel_timer = None
+        self._dirty = True
+
+    def _watch_resize(self):
+        """Redraw on SIGWINCH; returns a function restoring the previous handler."""
+        import signal
+        sigwinch = getattr(signal, 'SIGWINCH', None)
+        if sigwinch is None:
+            return lambda: None
+        loop = self._loop
+        try:
+            previous = signal.signal(sigwinch, lambda signum, frame: loop.call_soon_threadsafe(self._mark_dirty))
+        except ValueError:
+            # Not the main thread
+            return lambda: None
+        return lambda: signal.signal(sigwinch, previous)
+
     def run(self):
+        from tbview.eventloop import EventLoop
         term = self.term
-        ui = self.ui
         self.log('tbview-cli started.', INFO)
         if len(self.run_tags) == 1:
             self.log(f'current run: {self.run_tags[0]}', INFO)
         else:
             self.log(f'current runs: {", ".join(self.run_tags)}', INFO)
+        loop = self._loop = EventLoop()
         try:
             with term.fullscreen(), term.cbreak(), term.hidden_cursor():
-                while True:
-                    import time
-                    frame_start = time.perf_counter()
-                    ui.ratios = (4, 1) if term.width > 100 else (3, 1)
-                    ui.display()
-                    key = term.inkey(timeout=0.05)
-                    if key:
-                        self.handle_input(key)
-                        if self._quit_and_reselect:
-                            return True
-                    else:
-                        # small sleep to avoid busy loop
-                        time.sleep(0.05)
-
-                    # Reload data every 15 seconds if file updated
-                    try:
-                        import os
-                        now = time.time()
-                        if now - self._last_scan_ts >= 15.0:
-                            needs_scan = False
-                            for path, run_tag in zip(self.event_paths, self.run_tags):
-                                try:
-                                    current_size = os.path.getsize(path)
-                                    current_mtime = os.path.getmtime(path)
-                                except Exception:
-                                    continue
-                                if (current_size != self._last_scan_size_by_run.get(run_tag, 0)
-                                    or current_mtime != self._last_seen_mtime_by_run.get(run_tag, 0)):
-                                    needs_scan = True
-                                    break
-                            if needs_scan:
-                                self.scan_events()
-                    except Exception as e:
-                        self.log(f'failed to check file update: {e}', WARN)
-                    self._frame_count += 1
-                    if self._profile_enabled:
-                        dt = time.perf_counter() - frame_start
-                        if dt > 0:
-                            fps = 1.0 / dt
-                            if time.perf_counter() - self._last_fps_log > 2.0:
-                                self.log(f'frame {self._frame_count} dt {dt*1000:.1f}ms ({fps:.1f} fps)', DEBUG)
-                                self._last_fps_log = time.perf_counter()
+                keyboard_fd = getattr(term, '_keyboard_fd', None)
+                if keyboard_fd is not None:
+                    loop.add_reader(keyboard_fd, self._read_keys)
+                restore_resize = self._watch_resize()
+                loop.call_later(0 if self._loading else self.scan_scheduler.next_delay(), self._scan_tick)
+                self._dirty = True
+                prefetch = True
+                try:
+                    while not self._quit_and_reselect:
+                        if self._dirty:
+                            self._dirty = False
+                            self._write_frame()
+                            self._schedule_panel_refresh()
+                        # Block until input, new data, a resize or a timer,
+                        # except while neighbours of the selection remain to
+                        # be prefetched
+                        if loop.poll(0 if prefetch else None):
+                            prefetch = True
+                        elif prefetch:
+                            prefetch = self._prefetch_neighbors()
+                finally:
+                    restore_resize()
+                return True
         except KeyboardInterrupt:
             print('exit.')
             return False
-        return False
-
+        finally:
+            self._loop = None
+            loop.close()
+            if self._grid is not None:
+                self._grid.close()
+            if self.remote is not None:
+                self.remote.close()
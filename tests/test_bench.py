@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+from tbview import bench, synth
+from tbview.parser import read_records_from_offset
+
+
+def test_generate_event_file_with_corrupt_tail_parses_valid_prefix():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.synthetic")
+        info = synth.generate_event_file(path, steps=20, tags=3, histograms=1, histogram_every=5,
+                                         graph_bytes=64, corrupt_tail=True)
+        warnings = []
+        events = list(read_records_from_offset(path, 0, warn=warnings.append))
+    assert info["records"] == 1 + 20 + 4
+    assert len(events) == info["records"]
+    assert events[-1][1] == info["valid_bytes"] < info["size"]
+    assert warnings and "Truncated" in warnings[0]
+    assert len(info["tags"]) == 3
+
+
+def test_generator_is_reproducible():
+    with tempfile.TemporaryDirectory() as d:
+        a = os.path.join(d, "a")
+        b = os.path.join(d, "b")
+        synth.generate_event_file(a, steps=10, tags=2, seed=7)
+        synth.generate_event_file(b, steps=10, tags=2, seed=7)
+        with open(a, "rb") as fa, open(b, "rb") as fb:
+            assert fa.read() == fb.read()
+
+
+def test_quick_benchmarks_produce_comparable_report():
+    report = bench.run_benchmarks(["parse_full", "tail_scan"], quick=True, repeat=1)
+    assert set(report["results"]) == {"parse_full", "tail_scan"}
+    assert report["results"]["parse_full"]["records_per_s"] > 0
+    assert bench.compare(report, report) == []
+    slower = {"results": {"parse_full": dict(report["results"]["parse_full"],
+                                             seconds=report["results"]["parse_full"]["seconds"] / 10)}}
+    assert bench.compare(report, slower, tolerance=0.5)[0].startswith("parse_full")
+
+
+def test_rescan_starts_from_empty_state():
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=2, steps=50, tags=2)
+        viewer = bench._make_viewer(paths)
+        for _ in range(3):
+            bench._rescan(viewer)
+        for run_tag in viewer.run_tags:
+            assert len(viewer._tag_offsets_by_run[run_tag]["train/metric_0"]) == 50
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+from tbview.dashing_lib import braille
+from tbview.dashing_lib.braille import BrailleLinePlot, crop_to_range, decimate_minmax
+
+ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def make_plot():
+    fig = BrailleLinePlot()
+    xs = list(range(500))
+    fig.plot(xs, [((i * 37) % 101) / 100.0 for i in xs], label="runA", color="red")
+    fig.plot(xs, [i / 500.0 for i in xs], label="runB", color="green")
+    fig.title = "loss"
+    fig.xlabel = "step"
+    return fig
+
+
+def test_decimate_minmax_keeps_extremes_and_order():
+    xs = list(range(1000))
+    ys = [0.0] * 1000
+    ys[123] = 5.0
+    ys[777] = -5.0
+    dx, dy = decimate_minmax(xs, ys, 50)
+    assert len(dx) <= 100
+    assert 5.0 in list(dy) and -5.0 in list(dy)
+    assert list(dx) == sorted(dx)
+    # short series are returned untouched
+    assert decimate_minmax([1, 2], [3, 4], 50) == ([1, 2], [3, 4])
+
+
+def test_crop_to_range_keeps_one_neighbour_each_side():
+    xs = list(range(10))
+    ys = [x * 2 for x in xs]
+    cx, cy = crop_to_range(xs, ys, (3, 5))
+    assert list(cx) == [2, 3, 4, 5, 6]
+    assert list(cy) == [4, 6, 8, 10, 12]
+    assert crop_to_range(xs, ys, None) == (xs, ys)
+
+
+def test_build_produces_exact_height_with_axes_and_legend():
+    text = make_plot().build(60, 16)
+    lines = text.splitlines()
+    assert len(lines) == 16
+    plain = [ANSI.sub("", line) for line in lines]
+    assert "loss" in plain[0]
+    assert "runA" in plain[1] and "runB" in plain[2]
+    assert plain[-3].lstrip().startswith("└")
+    assert "step" in plain[-1]
+    assert any(0x2800 < ord(ch) <= 0x28FF for line in plain for ch in line)
+
+
+def test_build_is_empty_when_too_small_or_without_series():
+    assert BrailleLinePlot().build(60, 16) == ""
+    assert make_plot().build(5, 3) == ""
+
+
+def test_pure_python_rasterizer_matches_numpy(monkeypatch):
+    if braille._numpy() is None:
+        pytest.skip("numpy not installed")
+    expected = make_plot().build(70, 20)
+    monkeypatch.setattr(braille, "np", None)
+    assert make_plot().build(70, 20) == expected
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_non_finite_points_are_dropped(monkeypatch, use_numpy):
+    if use_numpy and braille._numpy() is None:
+        pytest.skip("numpy not installed")
+    if not use_numpy:
+        monkeypatch.setattr(braille, "np", None)
+    fig = BrailleLinePlot()
+    fig.plot([0, 1, 2, 3], [1.0, float("nan"), float("inf"), 2.0], label="loss")
+    fig.plot([0, 1], [float("nan"), float("nan")], label="all-nan")
+    assert len(fig.series) == 1
+    assert list(fig.series[0][1]) == [1.0, 2.0]
+    assert len(fig.build(60, 16).splitlines()) == 16
@@ -35,3 +35,8 @@ def test_u32_masks_to_32_bits():
     assert u32(-1) == 0xFFFFFFFF
 
 
+def test_table_driven_crc_matches_crc32c():
+    from tbview.crc32c import CRC_INIT, crc_finalize, crc_update
+    data = os.urandom(4096)
+    assert crc_finalize(crc_update(CRC_INIT, data)) == u32(crc32c(data))
+    assert crc_finalize(crc_update(CRC_INIT, bytearray(data))) == u32(crc32c(data))
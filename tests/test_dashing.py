@@ -0,0 +1,57 @@
+import contextlib
+import io
+
+from tbview.dashing_lib.dashing import Log, TBox, Text
+from tbview.headless import HeadlessTerminal, ScreenBuffer
+
+
+def test_log_is_bounded_and_wraps_incrementally():
+    log = Log(max_lines=3)
+    for i in range(5):
+        log.append(f"msg{i}-abcdef")
+    assert log.max_lines == 3
+    assert list(log.logs) == ["msg2-abcdef", "msg3-abcdef", "msg4-abcdef"]
+    assert log.logs_wrapped(6) == ["msg2-a", "bcdef", "msg3-a", "bcdef", "msg4-a", "bcdef"]
+
+    # Appending after a wrap reuses cached chunks and evicts the oldest message
+    log.append("new")
+    assert log.logs_wrapped(6) == ["msg3-a", "bcdef", "msg4-a", "bcdef", "new"]
+    log.replace_last("replaced!")
+    assert log.logs_wrapped(6)[-2:] == ["replac", "ed!"]
+    # A different width rewraps everything
+    assert log.logs_wrapped(100) == ["msg3-abcdef", "msg4-abcdef", "replaced!"]
+
+
+def test_log_replace_last_on_empty_log_appends():
+    log = Log()
+    log.replace_last("first")
+    assert log.logs_wrapped(80) == ["first"]
+
+
+def test_text_wrapping_is_cached_per_width_and_text():
+    text = Text("abcdefgh\nij")
+    wrapped = text.text_wrapped(3)
+    assert wrapped == "abc\ndef\ngh\nij"
+    assert text.text_wrapped(3) is wrapped
+    assert text.text_wrapped(4) == "abcd\nefgh\nij"
+    text.text = "xyz"
+    assert text.text_wrapped(4) == "xyz"
+
+
+def test_render_returns_frame_without_writing(capsys):
+    text = Text("hello")
+    frame = text.render()
+    assert "hello" in frame
+    assert capsys.readouterr().out == ""
+
+
+def test_text_is_clipped_to_box_height():
+    term = HeadlessTerminal(20, 10)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        Text("\n".join(f"line{i}" for i in range(10)), border_color=15)._display(TBox(term, 0, 0, 20, 5), None)
+    screen = ScreenBuffer(20, 10)
+    screen.feed(out.getvalue())
+    lines = screen.lines()
+    assert [line.strip("│ ") for line in lines[1:4]] == ["line0", "line1", "line2"]
+    assert lines[4].startswith("└") and lines[5:] == [""] * 5
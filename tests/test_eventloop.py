@@ -0,0 +1,85 @@
+import os
+import select
+import sys
+import tempfile
+import threading
+import time
+
+import pytest
+
+from tbview import synth
+from tbview.eventloop import EventLoop
+
+
+def test_timers_run_in_deadline_order_and_can_be_cancelled():
+    loop = EventLoop()
+    ran = []
+    loop.call_later(0.02, lambda: ran.append("late"))
+    loop.call_later(0.0, lambda: ran.append("soon"))
+    cancelled = loop.call_later(0.01, lambda: ran.append("cancelled"))
+    loop.cancel(cancelled)
+    deadline = time.time() + 2
+    while len(ran) < 2 and time.time() < deadline:
+        loop.poll()
+    assert ran == ["soon", "late"]
+    loop.close()
+
+
+def test_thread_wakes_blocking_poll_and_readers_fire():
+    loop = EventLoop()
+    ran = []
+    threading.Timer(0.05, lambda: loop.call_soon_threadsafe(lambda: ran.append("woken"))).start()
+    start = time.perf_counter()
+    assert loop.poll() == 1
+    assert ran == ["woken"] and time.perf_counter() - start < 1.0
+
+    r, w = os.pipe()
+    loop.add_reader(r, lambda: ran.append(os.read(r, 10)))
+    assert loop.poll(0) == 0
+    os.write(w, b"k")
+    assert loop.poll(1.0) == 1 and ran[-1] == b"k"
+    loop.remove_reader(r)
+    os.close(r)
+    os.close(w)
+    loop.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs a pty")
+def test_viewer_is_silent_when_idle_and_quits_on_key():
+    import pty
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.generate_event_file(path, steps=100, tags=3)
+        pid, fd = pty.fork()
+        if pid == 0:
+            os.environ["TERM"] = "xterm-256color"
+            os.execvp(sys.executable, [sys.executable, "-m", "tbview.cli", path, "--engine", "braille"])
+
+        def read_for(seconds):
+            out = b""
+            end = time.time() + seconds
+            while time.time() < end:
+                if select.select([fd], [], [], 0.05)[0]:
+                    try:
+                        out += os.read(fd, 65536)
+                    except OSError:
+                        break
+            return out
+
+        try:
+            # blessed queries the terminal on startup and waits for answers a
+            # real terminal would send; wait for the first frame instead
+            out = b""
+            start = time.time()
+            while b"Tags List" not in out:
+                assert time.time() - start < 15
+                out += read_for(0.2)
+            read_for(1.0)
+            assert read_for(1.0) == b""
+            os.write(fd, b"q")
+            start = time.time()
+            while os.waitpid(pid, os.WNOHANG) == (0, 0):
+                assert time.time() - start < 5
+                read_for(0.05)
+        finally:
+            os.close(fd)
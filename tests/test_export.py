@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+import tempfile
+
+import pytest
+
+from tbview import export, synth
+
+
+def _make_runs(root, runs=3):
+    return synth.generate_run_dir(root, runs=runs, steps=40, tags=4, corrupt_tail=True)
+
+
+def test_iter_scalar_chunks_respects_chunk_size_and_filters():
+    with tempfile.TemporaryDirectory() as d:
+        (path,) = _make_runs(d, runs=1)
+        chunks = list(export.iter_scalar_chunks(path, export.TagFilter(["train/*", "eval/*"], ["eval/*"]),
+                                                chunk_rows=16, warn=lambda msg: None))
+    assert all(len(c["step"]) <= 16 + 4 for c in chunks)
+    assert len(chunks) > 1
+    assert {t for c in chunks for t in c["tag"]} == {"train/metric_0"}
+    assert sum(len(c["step"]) for c in chunks) == 40
+
+
+def test_export_directory_to_csv_and_jsonl_with_process_pool():
+    with tempfile.TemporaryDirectory() as d:
+        _make_runs(os.path.join(d, "logs"))
+        for fmt in ("csv", "jsonl"):
+            out_dir = os.path.join(d, "out_" + fmt)
+            jobs = export.plan_jobs(os.path.join(d, "logs"), out_dir, fmt, include=["lr/*"], chunk_rows=7)
+            results = export.run_export(jobs, workers=2)
+            assert [r["rows"] for r in results] == [40, 40, 40]
+            out = sorted(os.listdir(out_dir))
+            assert len(out) == 3 and all(name.endswith("." + fmt) for name in out)
+            with open(os.path.join(out_dir, out[0])) as f:
+                if fmt == "csv":
+                    rows = list(csv.DictReader(f))
+                else:
+                    rows = [json.loads(line) for line in f]
+            assert len(rows) == 40
+            assert rows[0]["run"] == "run_0" and rows[0]["tag"] == "lr/metric_2"
+            assert [int(r["step"]) for r in rows] == list(range(40))
+
+
+def test_export_npz_streams_columns():
+    np = pytest.importorskip("numpy")
+    with tempfile.TemporaryDirectory() as d:
+        (path,) = _make_runs(d, runs=1)
+        out = os.path.join(d, "out.npz")
+        stats = export.export_file(path, out, "npz", run="run_0", chunk_rows=10)
+        data = np.load(out)
+        assert stats["rows"] == 160
+        assert data["step"].shape == (160,)
+        assert list(data["tags"]) == synth.tag_names(4)
+        assert str(data["run"]) == "run_0"
+        assert data["tags"][data["tag_index"][1]] == "eval/metric_1"
+        # temporary column files are removed
+        assert sorted(os.listdir(d)) == ["out.npz", "run_0"]
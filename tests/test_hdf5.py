@@ -0,0 +1,116 @@
+import os
+import tempfile
+
+import pytest
+
+from tbview import synth
+
+h5py = pytest.importorskip("h5py")
+from tbview.hdf5 import Hdf5Writer, export_hdf5  # noqa: E402
+
+
+def test_export_writes_chunked_datasets_in_batches():
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "events.out.tfevents.test")
+        info = synth.generate_event_file(src, steps=100, tags=2, corrupt_tail=True)
+        out = export_hdf5(src, batch_rows=30, log=lambda msg: None, warn=lambda msg: None)
+        assert out == os.path.join(d, "[hdf5]events.out.tfevents.test.h5")
+        with h5py.File(out, "r") as hf:
+            steps = hf["train/metric_0/steps"]
+            assert steps.chunks is not None and steps.maxshape == (None,)
+            assert list(steps[:5]) == [0, 1, 2, 3, 4]
+            assert hf["eval/metric_1/values"].shape == (100,)
+            assert hf["eval/metric_1/wall_time"][10] == 1010.0
+            assert hf.attrs["source_offset"] == info["valid_bytes"]
+
+
+def test_export_sorts_and_deduplicates_steps():
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "events.out.tfevents.test")
+        # A trainer restarted from step 3 writes steps 3 and 4 again
+        steps = [0, 1, 2, 3, 4, 3, 4, 5]
+        synth.write_tfrecord_records(src, [synth.make_event(step, "loss", i) for i, step in enumerate(steps)])
+        out = export_hdf5(src, batch_rows=3, log=lambda msg: None)
+        with h5py.File(out, "r") as hf:
+            assert list(hf["loss/steps"][:]) == [0, 1, 2, 3, 4, 5]
+            assert list(hf["loss/values"][:]) == [0, 1, 2, 5, 6, 7]
+            assert hf["loss/steps"].compression is None
+
+
+def test_follow_resumes_from_stored_offset():
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "events.out.tfevents.test")
+        out = os.path.join(d, "out.h5")
+        synth.write_tfrecord_records(src, [synth.make_event(i, "loss", i) for i in range(10)])
+        writer = Hdf5Writer(out, src, resume=True)
+        assert writer.consume() == 10
+        writer.close()
+
+        synth.write_tfrecord_records(src, [synth.make_event(i, "loss", i) for i in range(10, 15)])
+        writer = Hdf5Writer(out, src, resume=True)
+        assert writer.offset > 0
+        assert writer.consume() == 5
+        writer.close()
+        with h5py.File(out, "r") as hf:
+            assert list(hf["loss/steps"][:]) == list(range(15))
+
+
+@pytest.mark.parametrize("tags", [1, 2])
+def test_interrupted_consume_resumes_without_duplicates(tags):
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "events.out.tfevents.test")
+        out = os.path.join(d, "out.h5")
+        names = ["loss", "acc"][:tags]
+        synth.write_tfrecord_records(src, [synth.make_scalars_event(i, {n: float(i) for n in names})
+                                           for i in range(40)])
+        writer = Hdf5Writer(out, src, batch_rows=10, resume=True)
+        add = writer.add
+        calls = []
+
+        def interrupted_add(*args):
+            calls.append(1)
+            if len(calls) == 25 * tags + tags:
+                raise KeyboardInterrupt
+            add(*args)
+
+        writer.add = interrupted_add
+        with pytest.raises(KeyboardInterrupt):
+            writer.consume()
+        writer.close()
+
+        writer = Hdf5Writer(out, src, resume=True)
+        writer.consume()
+        writer.close()
+        with h5py.File(out, "r") as hf:
+            for name in names:
+                assert list(hf[name + "/steps"][:]) == list(range(40))
+
+
+def test_malformed_record_stops_export_with_a_warning():
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "events.out.tfevents.test")
+        synth.write_tfrecord_records(src, [synth.make_event(i, "loss", i) for i in range(5)])
+        synth.write_tfrecord_records(src, [b"\x2a\x05\x0a"])
+        synth.write_tfrecord_records(src, [synth.make_event(5, "loss", 5)])
+        warnings = []
+        out = export_hdf5(src, log=lambda msg: None, warn=warnings.append)
+        assert any("Failed to decode event" in w for w in warnings)
+        with h5py.File(out, "r") as hf:
+            assert list(hf["loss/steps"][:]) == list(range(5))
+            # The stored offset points at the bad record, not past it
+            bad_offset = hf.attrs["source_offset"]
+        writer = Hdf5Writer(out, src, resume=True)
+        assert writer.offset == bad_offset
+        assert writer.consume(warn=warnings.append) == 0
+        assert writer.stopped_at == bad_offset
+        writer.close()
+
+
+def test_follow_stops_at_undecodable_record():
+    with tempfile.TemporaryDirectory() as d:
+        src = os.path.join(d, "events.out.tfevents.test")
+        synth.write_tfrecord_records(src, [synth.make_event(0, "loss", 0), b"\x2a\x05\x0a"])
+        logs = []
+        export_hdf5(src, follow=True, poll_interval=0.01, log=logs.append, warn=lambda msg: None,
+                    should_stop=lambda: pytest.fail("kept following"))
+        assert "following for new records (Ctrl+C to stop)" not in logs
@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal, ScreenBuffer, parse_keys, parse_size, run_headless
+from tbview.viewer import TensorboardViewer
+
+
+def test_screen_buffer_applies_cursor_moves_and_drops_styling():
+    term = HeadlessTerminal(20, 10)
+    screen = ScreenBuffer(20, 4)
+    screen.feed(term.move(1, 2) + term.color(15) + "hello" + term.normal + "\n")
+    screen.feed(term.move(3, 17) + "clipped")
+    assert screen.lines() == ["", "  hello", "", "                 cli"]
+
+
+def test_parse_keys_and_size():
+    term = HeadlessTerminal(80, 24)
+    keys = parse_keys(["# comment", "", "s", "KEY_DOWN", "text:/ab", "KEY_ENTER"], term)
+    assert [k.name or str(k) for k in keys] == ["s", "KEY_DOWN", "/", "a", "b", "KEY_ENTER"]
+    assert keys[1].is_sequence and not keys[0].is_sequence
+    assert parse_size("160x48") == (160, 48)
+
+
+def test_run_headless_renders_scripted_frames_deterministically():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.synthetic")
+        synth.generate_event_file(path, steps=50, tags=3)
+
+        def render():
+            term = HeadlessTerminal(120, 36)
+            viewer = TensorboardViewer(path, "run", plot_engine="braille", term=term)
+            keys = parse_keys(["KEY_DOWN", "s"], term)
+            return run_headless(viewer, keys=keys)
+
+        first = render()
+        second = render()
+    assert first["summary"]["frames"] == 3
+    assert [f["key"] for f in first["frames"]] == [None, "KEY_DOWN", "s"]
+    final = first["final_frame"]
+    assert "Tags List" in final
+    assert "eval/metric_1 (smooth=10" in final
+    assert final == second["final_frame"]
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tbview import bench
+from tbview.cli import PLOT_ENGINES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("inquirer", "plotext", "blessed", "numpy", "google.protobuf", "tbview.viewer")
+
+
+def _loaded_after_import(module):
+    code = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+    return set(out.stdout.split())
+
+
+@pytest.mark.parametrize("module", ["tbview.cli", "tbview.summary", "tbview.export"])
+def test_entry_points_do_not_import_the_ui_or_protobuf(module):
+    loaded = _loaded_after_import(module)
+    assert not {m for m in loaded if m.split(".")[0] in HEAVY or m in HEAVY}
+
+
+def test_cli_engines_match_viewer():
+    from tbview.viewer import TensorboardViewer
+    assert PLOT_ENGINES == TensorboardViewer.PLOT_ENGINES
+
+
+def test_import_benchmark_reports_each_entry_point():
+    results = bench.bench_import(bench.BenchContext("/tmp", quick=True, repeat=1))
+    assert list(results) == [f"import[{name}]" for name, _module in bench.IMPORT_TARGETS]
+    assert all(r["import_ms"] >= 0 for r in results.values())
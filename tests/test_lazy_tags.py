@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal
+from tbview.parser import decode_scalars, peek_scalar_tags
+from tbview.viewer import TensorboardViewer
+
+
+def test_peek_and_filtered_decode():
+    payload = synth.make_scalars_event(7, {"a": 1.0, "b": 2.0, "c": 3.0}, wall_time=5.0)
+    assert peek_scalar_tags(payload) == ["a", "b", "c"]
+    assert decode_scalars(payload, tags={b"b"}) == (7, 5.0, [("b", 2.0)])
+
+
+def test_viewer_discovers_tags_and_decodes_on_demand():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=100, tags=50)
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30))
+        assert len(viewer.tag_names) == 50
+        assert "grad/metric_3" not in viewer.records_by_run["run"]
+        assert len(viewer._tag_offsets_by_run["run"]["grad/metric_3"]) == 100
+
+        viewer.render_frame()
+        selected = viewer._get_selected_tag()
+        assert sorted(viewer.records_by_run["run"][selected]) == list(range(100))
+        assert viewer._prefetch_neighbors()
+        assert len(viewer.records_by_run["run"]) == 2
+
+        # New records are decoded incrementally for loaded tags only
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(100, {selected: 0.5, "grad/metric_3": 1.5})])
+        viewer.scan_events()
+        assert viewer.records_by_run["run"][selected][100] == 0.5
+        assert "grad/metric_3" not in viewer.records_by_run["run"]
+        viewer._ensure_tag_loaded("grad/metric_3")
+        assert viewer.records_by_run["run"]["grad/metric_3"][100] == 1.5
+        assert len(viewer.records_by_run["run"]["grad/metric_3"]) == 101
+
+
+def test_grid_panels_keep_shared_limits_and_load_on_ui_thread():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.generate_event_file(path, steps=100, tags=3)
+        # A tag logged only late in the run cannot fit an early xlim
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(s, {"eval/late": 1.0 + s})
+                                            for s in range(500, 510)])
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", grid_size=4,
+                                   term=HeadlessTerminal(120, 40))
+        viewer.grid_pins = ["train/metric_0", "eval/late"]
+        viewer._set_grid_enabled(True)
+        viewer._xlim_steps = (0, 50)
+        viewer._ylim = (-100.0, 1000.0)
+
+        loaded = []
+        ensure = viewer._ensure_tag_loaded
+        viewer._ensure_tag_loaded = lambda tag: (loaded.append(tag), ensure(tag))
+        viewer.render_frame()
+        assert {"train/metric_0", "eval/late"} <= set(loaded)
+        assert viewer._xlim_steps == (0, 50)
+        assert viewer._ylim == (-100.0, 1000.0)
+        assert len(viewer.records_by_run["run"]["eval/late"]) == 10
+
+
+def test_malformed_record_is_skipped_with_a_warning():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(s, {"loss": 1.0}) for s in range(3)])
+        # Valid framing and CRC, truncated summary inside
+        synth.write_tfrecord_records(path, [b"\x2a\x05\x0a"])
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(s, {"loss": 1.0}) for s in range(3, 5)])
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30))
+        viewer._ensure_tag_loaded("loss")
+        assert sorted(viewer.records_by_run["run"]["loss"]) == list(range(5))
+        assert viewer._last_offset_by_run["run"] == os.path.getsize(path)
+        assert any("Failed to decode event" in line for line in viewer.logger.logs)
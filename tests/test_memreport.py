@@ -0,0 +1,47 @@
+import os
+import tempfile
+import tracemalloc
+
+from blessed.keyboard import Keystroke
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal
+from tbview.memreport import format_panel, memory_report
+from tbview.viewer import TensorboardViewer
+
+
+def _viewer(d, runs=2):
+    paths = synth.generate_run_dir(d, runs=runs, steps=200, tags=4)
+    return TensorboardViewer(paths, [f"run_{i}" for i in range(runs)], plot_engine="braille",
+                             term=HeadlessTerminal(120, 40))
+
+
+def test_memory_report_accounts_series_per_run_and_tag():
+    with tempfile.TemporaryDirectory() as d:
+        viewer = _viewer(d)
+        viewer.render_frame()
+        report = memory_report(viewer)
+        assert [r["run"] for r in report["runs"]] == ["run_0", "run_1"]
+        assert all(r["tags"] == 4 and r["loaded"] == 1 and r["points"] == 200 for r in report["runs"])
+        assert {(s["run"], s["tag"]) for s in report["series"]} == {
+            ("run_0", "train/metric_0"), ("run_1", "train/metric_0")}
+        assert report["series_bytes"] == sum(s["bytes"] for s in report["series"]) > 200 * 24
+        assert report["ui"]["plot_cache"] > 0 and "tracemalloc" not in report
+        assert any("run_0:train/metric_0" in line for line in format_panel(report))
+
+
+def test_memory_panel_toggle_and_deep_mode():
+    with tempfile.TemporaryDirectory() as d:
+        viewer = _viewer(d, runs=1)
+        viewer.handle_input(Keystroke("r"))
+        frame = viewer.render_frame()
+        assert "Memory" in frame and "series" in frame
+        viewer.handle_input(Keystroke("r"))
+        assert viewer.ui.items[1].items[0] is viewer.tips
+
+        tracemalloc.start()
+        try:
+            report = memory_report(viewer, deep=True, top=5)
+        finally:
+            tracemalloc.stop()
+        assert report["tracemalloc"] is not None and len(report["tracemalloc"]) <= 5
@@ -1,36 +1,12 @@
 import os
 import struct
 import tempfile
-from typing import List
 
 import pytest
 
-from tbview.parser import read_records, read_records_from_offset, test_crc32c as validate_crc32c
-from tbview.tf_protobuf.event_pb2 import Event
+from tbview.parser import read_records, read_records_from_offset, split_record_ranges, test_crc32c as validate_crc32c
 from tbview.crc32c import masked_crc32c
-
-
-def write_tfrecord_records(path: str, payloads: List[bytes]):
-    # Always append to support incremental writes across calls
-    with open(path, "ab") as f:
-        for payload in payloads:
-            length_bytes = struct.pack("Q", len(payload))
-            length_crc = struct.pack("I", masked_crc32c(length_bytes))
-            payload_crc = struct.pack("I", masked_crc32c(payload))
-            f.write(length_bytes)
-            f.write(length_crc)
-            f.write(payload)
-            f.write(payload_crc)
-
-
-def make_event(step: int, tag: str, value: float) -> bytes:
-    e = Event()
-    e.step = step
-    e.wall_time = 1000.0 + step
-    v = e.summary.value.add()
-    v.tag = tag
-    v.simple_value = float(value)
-    return e.SerializeToString()
+from tbview.synth import make_event, write_tfrecord_records
 
 
 def test_read_records_streams_all_events_and_stops_on_truncation():
@@ -111,3 +87,36 @@ def test_read_records_stops_on_invalid_crc():
         assert steps == [1]
 
 
+def test_resync_skips_corrupt_region_and_unaligned_start():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        payloads = [make_event(i, "loss", 1.0 / (i + 1)) for i in range(6)]
+        write_tfrecord_records(path, payloads)
+        record = 8 + 4 + len(payloads[0]) + 4
+        # Overwrite the middle of records 2 and 3 with garbage
+        with open(path, "r+b") as f:
+            f.seek(2 * record + 5)
+            f.write(b"\xff" * (record + 3))
+
+        assert [e.step for e in read_records(path, warn=lambda m: None)] == [0, 1]
+        warnings = []
+        steps = [e.step for e in read_records(path, warn=warnings.append, resync=True)]
+        assert steps == [0, 1, 4, 5]
+        assert "skipped" in warnings[0]
+
+        out = list(read_records_from_offset(path, 7, warn=lambda m: None, resync=True))
+        assert [e.step for e, _ in out] == [1, 4, 5]
+        assert out[-1][1] == os.path.getsize(path)
+
+
+def test_split_record_ranges_cover_every_record_once():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        write_tfrecord_records(path, [make_event(i, "loss", float(i)) for i in range(100)])
+        ranges = split_record_ranges(path, 4)
+        assert len(ranges) == 4
+        assert ranges[0][0] == 0 and ranges[-1][1] == os.path.getsize(path)
+        steps = []
+        for start, end in ranges:
+            steps.extend(e.step for e, _ in read_records_from_offset(path, start, end_offset=end))
+        assert steps == list(range(100))
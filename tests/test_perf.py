@@ -0,0 +1,35 @@
+from tbview.perf import PerfStats, percentile
+
+
+def test_percentile_nearest_rank():
+    values = sorted(float(i) for i in range(1, 101))
+    assert percentile(values, 50) == 51.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_disabled_stats_do_not_record():
+    perf = PerfStats(enabled=False)
+    token = perf.start()
+    assert token is None
+    perf.stop('scan', token)
+    perf.add_ingest(10, 1024, 0.1)
+    perf.frame()
+    assert perf.latency_ms('scan')[3] == 0
+    assert perf.ingest_rates() == (0.0, 0.0)
+    assert perf.fps() == 0.0
+
+
+def test_enabled_stats_report_latencies_and_rates():
+    perf = PerfStats(window=4, enabled=True)
+    for _ in range(6):
+        perf.stop('build', perf.start())
+    assert perf.latency_ms('build')[3] == 4  # rolling window
+    perf.add_ingest(1000, 2 * 1024 * 1024, 0.5)
+    perf.add_ingest(1000, 2 * 1024 * 1024, 0.5)
+    assert perf.ingest_rates() == (2000.0, 4.0)
+    lines = perf.summary_lines()
+    assert any(line.startswith(' build') for line in lines)
+    assert any('rec/s' in line for line in lines)
+    perf.reset()
+    assert perf.latency_ms('build')[3] == 0
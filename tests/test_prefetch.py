@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+
+import pytest
+
+from tbview import prefetch, synth
+from tbview.headless import HeadlessTerminal
+from tbview.prefetch import SpeculativePrefetcher, likely_choices
+from tbview.runcache import RunCache, RunState, set_run_cache
+from tbview.viewer import TensorboardViewer
+
+
+@pytest.fixture
+def run_cache():
+    cache = RunCache(1 << 30)
+    previous = set_run_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_run_cache(previous)
+
+
+def _options(paths):
+    return [(os.path.dirname(p), os.path.basename(p), 0, "") for p in paths]
+
+
+def test_eager_tags_match_viewer():
+    assert prefetch.EAGER_TAGS == TensorboardViewer.EAGER_TAGS
+
+
+def test_likely_choices_order():
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=6, steps=5, tags=1)
+        for i, path in enumerate(paths):
+            os.utime(path, (1000 + i, 1000 + i))
+        options = _options(paths)
+        previous = {(os.path.dirname(paths[2]), os.path.basename(paths[2]))}
+        choices = likely_choices(options, previous, limit=5, recent=2)
+        assert choices == [paths[2], paths[5], paths[4], paths[0], paths[1]]
+
+
+def test_prefetched_runs_open_loaded(run_cache):
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=3, steps=2000, tags=4)
+        tags = [os.path.basename(os.path.dirname(p)) for p in paths]
+        prefetcher = SpeculativePrefetcher(paths[:2], run_cache, cpu_fraction=1.0).start()
+        deadline = time.monotonic() + 30
+        while len(prefetcher.parsed) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        prefetcher.cancel()
+        assert prefetcher.parsed == paths[:2]
+
+        viewer = TensorboardViewer(paths, tags, plot_engine="braille", term=HeadlessTerminal(100, 30),
+                                   progressive=True)
+        # Only the run that was not prefetched is left to read
+        assert list(viewer._loading) == tags[2:]
+        for tag in tags[:2]:
+            assert len(viewer._tag_offsets_by_run[tag]["train/metric_0"]) == 2000
+
+
+def test_cancel_keeps_partial_run(run_cache):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.generate_event_file(path, steps=20000, tags=4)
+        prefetcher = SpeculativePrefetcher([path], run_cache, cpu_fraction=0.1).start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        prefetcher.cancel()
+        assert time.perf_counter() - started < 0.5
+        state = run_cache.take(path)
+        assert state is not None and 0 < state.last_offset < os.path.getsize(path)
+        run_cache.put(path, state)
+
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30),
+                                   progressive=True)
+        assert viewer._loading["run"][0] == state.last_offset
+        while viewer._loading:
+            viewer.scan_due()
+        assert len(viewer._tag_offsets_by_run["run"]["train/metric_0"]) == 20000
+
+
+def test_memory_budget_does_not_evict():
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=2, steps=2000, tags=4)
+        kept = RunState(("dev", "ino"), {}, set(), {"t": {0: 1.0}}, {"t": {0: 0.0}}, {}, 1, 1, 0.0)
+        cache = RunCache(kept.nbytes() + 64)
+        cache.put("/elsewhere/events.out.tfevents.1.host", kept)
+        prefetcher = SpeculativePrefetcher(paths, cache, cpu_fraction=1.0).start()
+        prefetcher._thread.join(30)
+        prefetcher.cancel()
+        assert prefetcher.parsed == []
+        assert len(cache) == 1 and "/elsewhere/events.out.tfevents.1.host" in cache
@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal, ScreenBuffer
+from tbview.viewer import TensorboardViewer
+
+
+def _screen(viewer):
+    screen = ScreenBuffer(viewer.term.width, viewer.term.height)
+    screen.feed(viewer.render_frame())
+    return screen.text()
+
+
+def test_progressive_load_draws_partial_data_then_restores_tips():
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=2, steps=3000, tags=4)
+        tags = [os.path.basename(os.path.dirname(p)) for p in paths]
+        viewer = TensorboardViewer(paths, tags, plot_engine="braille", term=HeadlessTerminal(120, 36),
+                                   progressive=True)
+        assert viewer.tag_names == [] and list(viewer._loading) == tags
+        assert "Loading 2 run(s) 0%" in _screen(viewer)
+
+        viewer.scan_due(budget=0.0)
+        assert viewer.tag_names
+        selected = viewer._get_selected_tag()
+        text = _screen(viewer)
+        assert "Loading" in text and "%" in text
+        partial = len(viewer.records_by_run[tags[0]][selected])
+        assert 0 < partial < 3000
+
+        while viewer._loading:
+            viewer.scan_due(budget=0.0)
+        assert len(viewer.records_by_run[tags[0]][selected]) == 3000
+        # Loaded while the second run had not been reached yet
+        assert len(viewer.records_by_run[tags[1]][selected]) == 3000
+        text = _screen(viewer)
+        assert "Tips" in text and "Loading" not in text
+        assert "loaded 2 run(s)" in "\n".join(viewer.logger.logs)
@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+import pytest
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal
+from tbview.runcache import RunCache, get_run_cache, set_run_cache
+from tbview.series import POINT_BYTES
+from tbview.viewer import TensorboardViewer
+
+
+@pytest.fixture
+def run_cache():
+    cache = RunCache(1 << 30)
+    previous = set_run_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_run_cache(previous)
+
+
+def _viewer(paths, tags, **kwargs):
+    return TensorboardViewer(paths, tags, plot_engine="braille", term=HeadlessTerminal(100, 30), **kwargs)
+
+
+def test_reopened_runs_resume_from_cache(run_cache):
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=2, steps=500, tags=4)
+        tags = [os.path.basename(os.path.dirname(p)) for p in paths]
+        first = _viewer(paths, tags)
+        first._ensure_tag_loaded("eval/metric_1")
+        first.stash_runs()
+        assert len(run_cache) == 2
+
+        synth.write_tfrecord_records(paths[0], [synth.make_scalars_event(500, {"eval/metric_1": 0.5})])
+        # Overlapping selection: run_0 comes from the cache, run_1 is left there
+        second = _viewer(paths[:1], tags[:1], progressive=True)
+        assert paths[0] not in run_cache and paths[1] in run_cache
+        assert second.tag_names == first.tag_names
+        assert len(second.records_by_run[tags[0]]["eval/metric_1"]) == 500
+        # Only the appended record is left to read
+        assert list(second._loading) == tags[0:1]
+        while second._loading:
+            second.scan_due()
+        assert second.records_by_run[tags[0]]["eval/metric_1"][500] == 0.5
+
+
+def test_replaced_file_is_parsed_again(run_cache):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.generate_event_file(path, steps=100, tags=2)
+        _viewer(path, "run").stash_runs()
+        os.remove(path)
+        synth.generate_event_file(path, steps=10, tags=2)
+        viewer = _viewer(path, "run")
+        assert len(viewer._tag_offsets_by_run["run"]["train/metric_0"]) == 10
+
+
+def test_lru_eviction_by_size():
+    cache = RunCache(max_bytes=250 * POINT_BYTES)
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=3, steps=100, tags=1)
+        viewers = [_viewer(p, "run") for p in paths]
+        previous = set_run_cache(cache)
+        try:
+            for viewer in viewers:
+                viewer._ensure_tag_loaded("train/metric_0")
+                viewer.stash_runs()
+        finally:
+            set_run_cache(previous)
+        assert paths[0] not in cache and paths[1] in cache and paths[2] in cache
+        assert cache.total <= cache.max_bytes
+    assert get_run_cache().max_bytes == 0
+
+
+def test_failed_scan_keeps_the_resume_offset(monkeypatch):
+    from tbview import runcache
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.generate_event_file(path, steps=10, tags=2)
+        viewer = _viewer(path, "run")
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(s, {"train/metric_0": 1.0})
+                                            for s in range(10, 20)])
+        read = runcache.read_payloads_from_offset
+
+        def failing_read(*args, **kwargs):
+            for i, item in enumerate(read(*args, **kwargs)):
+                if i == 2:
+                    raise OSError("read failed")
+                yield item
+
+        monkeypatch.setattr(runcache, "read_payloads_from_offset", failing_read)
+        for _ in range(3):
+            with pytest.raises(OSError):
+                viewer.scan_events()
+        assert len(viewer._tag_offsets_by_run["run"]["train/metric_0"]) == 16
+        monkeypatch.setattr(runcache, "read_payloads_from_offset", read)
+        viewer.scan_events()
+        assert len(viewer._tag_offsets_by_run["run"]["train/metric_0"]) == 20
+        assert viewer._last_offset_by_run["run"] == os.path.getsize(path)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal
+from tbview.scheduler import ScanScheduler
+from tbview.viewer import TensorboardViewer
+
+
+def test_checks_are_staggered_and_back_off_when_idle():
+    sched = ScanScheduler(["a", "b", "c", "d"], min_interval=1.0, max_interval=8.0, now=0.0)
+    assert sched.due(0.3) == ["a"]
+    assert sched.due(1.0) == ["a", "b", "c", "d"]
+    assert sched.next_delay(0.0) == 0.25
+
+    for now in (1.0, 3.0, 7.0, 15.0, 23.0):
+        sched.observe("a", grew=False, now=now)
+    assert sched.intervals["a"] == 8.0
+    sched.observe("a", grew=True, now=31.0)
+    assert sched.intervals["a"] == 1.0 and sched.due(31.5) == ["b", "c", "d"]
+
+    sched.observe("b", grew=True, pending=True, now=32.0)
+    assert "b" in sched.due(32.0)
+
+
+def test_scan_due_ingests_within_budget_and_resumes():
+    with tempfile.TemporaryDirectory() as d:
+        paths = synth.generate_run_dir(d, runs=3, steps=50, tags=2)
+        tags = [os.path.basename(os.path.dirname(p)) for p in paths]
+        viewer = TensorboardViewer(paths, tags, plot_engine="braille", term=HeadlessTerminal(100, 30))
+        viewer.scan_scheduler = ScanScheduler(tags, min_interval=0.0)
+        synth.generate_event_file(paths[0] + ".more", steps=5000, tags=2)
+        with open(paths[0] + ".more", "rb") as src, open(paths[0], "ab") as dst:
+            dst.write(src.read())
+        size = os.path.getsize(paths[0])
+
+        assert viewer.scan_due(budget=0.0)
+        assert 0 < viewer._last_offset_by_run[tags[0]] < size
+        while viewer._last_offset_by_run[tags[0]] < size:
+            viewer.scan_due(budget=0.0)
+        assert len(viewer._tag_offsets_by_run[tags[0]]["train/metric_0"]) == 5050
+        assert not viewer.scan_due()
+
+
+def test_failing_run_backs_off():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.generate_event_file(path, steps=10, tags=1)
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30))
+        viewer.scan_scheduler = ScanScheduler(["run"], min_interval=1.0, now=0.0)
+        synth.write_tfrecord_records(path, [synth.make_event(10, "loss", 1.0)])
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("disk on fire")
+
+        viewer._scan_run = broken
+        viewer.scan_scheduler.observe("run", grew=True, pending=True)
+        viewer.scan_due()
+        assert viewer.scan_scheduler.next_delay() > 0
+        assert any("disk on fire" in line for line in viewer.logger.logs)
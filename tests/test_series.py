@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+import pytest
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal
+from tbview.series import POINT_BYTES, SeriesBudget, parse_size_bytes
+from tbview.viewer import TensorboardViewer
+
+
+def test_budget_picks_least_recently_viewed_victims():
+    budget = SeriesBudget(max_bytes=250 * POINT_BYTES)
+    for key in ("a", "b", "c"):
+        budget.set_points(key, 100)
+    budget.touch("a")
+    assert budget.total == 300 * POINT_BYTES
+    assert budget.victims() == ["b"]
+    assert budget.victims(protected=["b"]) == ["c"]
+    budget.discard("b")
+    assert not budget.over_budget() and len(budget) == 2
+
+
+def test_parse_size_bytes():
+    assert parse_size_bytes("512M") == 512 << 20
+    assert parse_size_bytes("1.5g") == 3 << 29
+    assert parse_size_bytes("4096") == 4096
+    with pytest.raises(ValueError):
+        parse_size_bytes("lots")
+
+
+def test_viewer_evicts_and_reloads_series_under_budget():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=100, tags=6)
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30),
+                                   max_memory=250 * POINT_BYTES)
+        for tag in viewer.tag_names[:3]:
+            viewer._ensure_tag_loaded(tag)
+        # The selected tag is on screen and never evicted
+        loaded = set(viewer.records_by_run["run"])
+        assert loaded == {viewer.tag_names[0], viewer.tag_names[2]}
+        assert viewer.series_budget.total <= 250 * POINT_BYTES
+
+        viewer.tag_selector.current = 1
+        viewer.render_frame()
+        assert len(viewer.records_by_run["run"][viewer.tag_names[1]]) == 100
+        assert viewer.tag_names[0] not in viewer.records_by_run["run"]
+        assert "Tags List" in viewer.tag_selector.title and "/" in viewer.tag_selector.title
@@ -0,0 +1,142 @@
+import os
+import socketserver
+import tempfile
+import threading
+import time
+
+import pytest
+
+from tbview import synth
+from tbview.headless import HeadlessTerminal
+from tbview.serve import (STATUS_OK, SeriesClient, SeriesServer, SeriesStore, ServeError, is_serving, poll_store,
+                          recv_message, send_message)
+from tbview.viewer import TensorboardViewer
+
+
+@pytest.fixture
+def served_run():
+    with tempfile.TemporaryDirectory(prefix="tbv") as d:
+        run_dir = os.path.join(d, "run")
+        os.makedirs(run_dir)
+        path = os.path.join(run_dir, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=300, tags=6)
+        store = SeriesStore(d)
+        store.discover()
+        socket_path = os.path.join(d, "s.sock")
+        server = SeriesServer(socket_path, store)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield d, path, socket_path
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_client_reads_tags_and_series(served_run):
+    root, path, socket_path = served_run
+    assert is_serving(socket_path)
+    client = SeriesClient(socket_path)
+    try:
+        offset, counts = client.tags(path)
+        assert offset == os.path.getsize(path)
+        assert counts == [(tag, 300) for tag in synth.tag_names(6)]
+
+        total, steps, values, walls = client.series(path, "train/metric_0", start=290)
+        assert total == 300
+        assert list(steps) == list(range(290, 300))
+        assert list(walls) == [1000.0 + s for s in range(290, 300)]
+
+        total, steps, values, _walls = client.series(path, "train/metric_0", max_points=40)
+        assert total == 300 and 0 < len(steps) <= 40
+
+        with pytest.raises(ServeError):
+            client.tags(os.path.join(os.path.dirname(root), "elsewhere", "events.out.tfevents.x"))
+        client.ping()
+    finally:
+        client.close()
+
+
+def test_viewer_attached_to_daemon_matches_local(served_run):
+    _root, path, socket_path = served_run
+    local = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30))
+    remote = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30),
+                               remote=socket_path)
+    assert remote.tag_names == local.tag_names
+    for viewer in (local, remote):
+        viewer._ensure_tag_loaded("grad/metric_3")
+    assert remote.records_by_run["run"]["grad/metric_3"] == local.records_by_run["run"]["grad/metric_3"]
+    assert remote.wall_times_by_run["run"] == local.wall_times_by_run["run"]
+
+    # Appended records arrive incrementally for loaded tags only
+    synth.write_tfrecord_records(path, [synth.make_scalars_event(300, {"grad/metric_3": 0.5, "train/metric_0": 1.5})])
+    remote.scan_events()
+    assert remote.records_by_run["run"]["grad/metric_3"][300] == 0.5
+    assert remote._remote_received[("run", "grad/metric_3")] == 301
+    assert "train/metric_0" not in remote.records_by_run["run"]
+    remote.render_frame()
+
+
+def test_malformed_record_is_skipped_by_the_daemon():
+    with tempfile.TemporaryDirectory(prefix="tbv") as d:
+        path = os.path.join(d, "events.out.tfevents.1.host")
+        synth.write_tfrecord_records(path, [synth.make_event(0, "loss", 1.0), b"\x2a\x05\x0a",
+                                            synth.make_event(1, "loss", 2.0)])
+        store = SeriesStore(d)
+        store.discover()
+        assert store.refresh() == 2
+        series = store.get(path)
+        assert series.offset == os.path.getsize(path)
+        assert series.tag_counts()[1] == [("loss", 2)]
+
+
+def test_poll_store_survives_a_failed_refresh():
+    calls = []
+    stop = threading.Event()
+
+    class FlakyStore(object):
+        def discover(self):
+            pass
+
+        def refresh(self):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            if len(calls) == 3:
+                stop.set()
+
+    thread = threading.Thread(target=poll_store, args=(FlakyStore(), stop, 0.01))
+    thread.start()
+    thread.join(5)
+    assert len(calls) >= 3
+
+
+def test_client_reconnects_after_a_timeout():
+    class SlowEcho(socketserver.BaseRequestHandler):
+        def handle(self):
+            while True:
+                body = recv_message(self.request)
+                if not body:
+                    return
+                if body[1:] == b"slow":
+                    time.sleep(0.5)
+                send_message(self.request, bytes([STATUS_OK]) + body[1:])
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with tempfile.TemporaryDirectory(prefix="tbv") as d:
+        socket_path = os.path.join(d, "s.sock")
+        server = Server(socket_path, SlowEcho)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = SeriesClient(socket_path, timeout=0.1)
+            with pytest.raises(OSError):
+                client._call(b"\x00slow")
+            time.sleep(0.6)
+            # The late reply to the timed out request is not read as this one's
+            assert client._call(b"\x00fast") == bytes([STATUS_OK]) + b"fast"
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+from tbview.parser import read_records_from_offset
+from tbview.stress import run_stress, writer_main
+
+
+def test_writer_splits_records_without_corrupting_the_stream():
+    with tempfile.TemporaryDirectory() as d:
+        paths = [os.path.join(d, "a.tfevents"), os.path.join(d, "b.tfevents")]
+        writer_main(paths, scalars_per_sec=800, tags=4, duration=0.3, partial_every=3)
+        counts = []
+        for path in paths:
+            warnings = []
+            events = list(read_records_from_offset(path, 0, warn=warnings.append))
+            assert warnings == []
+            assert events[-1][1] == os.path.getsize(path)
+            counts.append(len(events))
+    assert abs(counts[0] - counts[1]) <= 1 and counts[0] > 0
+
+
+def test_run_stress_reports_latency_and_ingests_everything():
+    with tempfile.TemporaryDirectory() as d:
+        report = run_stress(d, runs=2, tags=4, rate=2000, duration=1.0, fps=20, size=(100, 30))
+    assert report["events_ingested"] > 0
+    assert report["latency_ms"]["count"] == report["events_ingested"]
+    assert report["latency_ms"]["p50"] >= 0
+    assert report["frames"] > 0
+    assert report["memory"]["rss_end"] > 0
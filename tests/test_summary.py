@@ -0,0 +1,78 @@
+import os
+import tempfile
+
+from tbview import synth
+from tbview.parser import decode_scalars, find_record_boundary, read_payloads_from_offset, read_records
+from tbview.summary import format_table, summarize, summarize_file
+
+
+def test_decode_scalars_matches_protobuf():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=20, tags=3, histograms=1, histogram_every=5, graph_bytes=256)
+        decoded = []
+        for payload, _offset in read_payloads_from_offset(path):
+            step, wall_time, scalars = decode_scalars(payload)
+            decoded.extend((step, wall_time, tag, value) for tag, value in scalars)
+        expected = [(ev.step, ev.wall_time, v.tag, v.simple_value)
+                    for ev in read_records(path) for v in ev.summary.value if v.HasField("simple_value")]
+        assert decoded == expected
+
+
+def test_find_record_boundary_resyncs_to_next_record():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=50, tags=4)
+        offsets = [0] + [end for _payload, end in read_payloads_from_offset(path)]
+        with open(path, "rb") as f:
+            assert find_record_boundary(f, offsets[10]) == offsets[10]
+            assert find_record_boundary(f, offsets[10] + 3) == offsets[11]
+            assert find_record_boundary(f, offsets[-1]) is None
+
+
+def test_tail_mode_is_approximate_and_full_mode_indexes():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "run_0", "events.out.tfevents.test")
+        os.makedirs(os.path.dirname(path))
+        synth.generate_event_file(path, steps=2000, tags=2, noise=0.1)
+        full = summarize_file(path, full=True)
+        tail = summarize_file(path, tail_bytes=2048)
+        assert full["exact"] and not tail["exact"]
+        assert full["tags"]["train/metric_0"][4] == 2000
+        assert tail["tags"]["train/metric_0"][:2] == full["tags"]["train/metric_0"][:2]
+        assert tail["tags"]["train/metric_0"][4] < 2000
+
+        index_path = os.path.join(d, "index.json")
+        rows = summarize(d, index_path=index_path, full=True, include=["train/*"])
+        assert {r["tag"] for r in rows} == {"train/metric_0"}
+        assert all(r["exact"] and r["run"] == "run_0" for r in rows)
+        # Served from the index; appended records are merged incrementally
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(5000, {"train/metric_0": -1.0})])
+        rows = summarize(d, index_path=index_path, tail_bytes=1024)
+        row = [r for r in rows if r["tag"] == "train/metric_0"][0]
+        assert row["exact"] and row["step"] == 5000 and row["min"] == -1.0 and row["count"] == 2001
+        assert "~" not in format_table(rows)
+
+
+def test_filtered_read_of_whole_file_indexes_every_tag():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "run_0", "events.out.tfevents.test")
+        os.makedirs(os.path.dirname(path))
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(0, {"rare/x": 1.0})])
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(step, {"train/loss": 0.5})
+                                            for step in range(1, 400)])
+        index_path = os.path.join(d, "index.json")
+        rows = summarize(d, index_path=index_path, tail_bytes=1024, include=["rare/*"])
+        assert [r["tag"] for r in rows] == ["rare/x"] and rows[0]["exact"]
+        rows = summarize(d, index_path=index_path, tail_bytes=1024)
+        assert {r["tag"] for r in rows} == {"rare/x", "train/loss"}
+
+
+def test_undecodable_record_is_skipped(capsys):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.write_tfrecord_records(path, [synth.make_scalars_event(1, {"train/loss": 2.0}), b"\x2a\x05\x0a",
+                                            synth.make_scalars_event(2, {"train/loss": 1.0})])
+        result = summarize_file(path, full=True)
+        assert result["tags"]["train/loss"][:5] == [2, 1.0, 1.0, 2.0, 2]
+        assert "skipping undecodable record" in capsys.readouterr().err
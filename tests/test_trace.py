@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+
+from tbview.parser import read_records_from_offset
+from tbview.trace import Tracer, get_tracer, set_tracer
+from tbview.synth import make_event, write_tfrecord_records
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("work", n=1) as span:
+        span.set(extra=2)
+    tracer.counter("records", run=3)
+    assert tracer.events == []
+
+
+def test_spans_and_counters_are_saved_as_chrome_trace():
+    with tempfile.TemporaryDirectory() as d:
+        out = os.path.join(d, "trace.json")
+        tracer = Tracer(out)
+        with tracer.span("outer", cat="viewer", tag="loss") as span:
+            with tracer.span("inner"):
+                pass
+            span.set(points=10)
+        tracer.counter("records_ingested", runA=5)
+        tracer.save()
+        with open(out) as f:
+            events = json.load(f)["traceEvents"]
+    by_name = {e["name"]: e for e in events}
+    assert by_name["outer"]["ph"] == "X"
+    assert by_name["outer"]["args"] == {"tag": "loss", "points": 10}
+    assert by_name["inner"]["ts"] >= by_name["outer"]["ts"]
+    assert by_name["records_ingested"]["ph"] == "C"
+    assert by_name["records_ingested"]["args"] == {"runA": 5}
+
+
+def test_parser_reports_records_and_bytes_to_installed_tracer():
+    tracer = Tracer(os.devnull)
+    previous = set_tracer(tracer)
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "events.out.tfevents.test")
+            write_tfrecord_records(path, [make_event(i, "loss", i) for i in range(3)])
+            list(read_records_from_offset(path, 0))
+            size = os.path.getsize(path)
+    finally:
+        set_tracer(previous)
+    assert get_tracer() is previous
+    (span,) = [e for e in tracer.events if e["name"] == "read_records_from_offset"]
+    assert span["args"]["records"] == 3
+    assert span["args"]["bytes"] == size
+
+
+def test_parser_span_counts_records_when_consumer_stops_early():
+    tracer = Tracer(os.devnull)
+    previous = set_tracer(tracer)
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "events.out.tfevents.test")
+            write_tfrecord_records(path, [make_event(i, "loss", i) for i in range(5)])
+            reader = read_records_from_offset(path, 0)
+            next(reader)
+            _event, offset = next(reader)
+            reader.close()
+    finally:
+        set_tracer(previous)
+    (span,) = [e for e in tracer.events if e["name"] == "read_records_from_offset"]
+    assert "error" not in span["args"]
+    assert span["args"]["records"] == 2
+    assert span["args"]["bytes"] == offset
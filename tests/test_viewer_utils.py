@@ -44,3 +44,14 @@ def test_compute_run_epoch_eta_and_speed_from_epoch_series():
     assert speed is not None and abs(speed - 1.0) < 1e-6
 
 
+def test_grid_tags_prefer_pins_and_pad_with_none():
+    self_like = Dummy()
+    self_like.grid_size = 4
+    self_like.grid_pins = []
+    self_like.tag_names = ["a", "b", "c", "d", "e"]
+    self_like.tag_selector = Dummy()
+    self_like.tag_selector.current = 3
+    # Without pins the grid follows the selection
+    assert TensorboardViewer._grid_tags(self_like) == ["d", "e", None, None]
+    self_like.grid_pins = ["e", "a"]
+    assert TensorboardViewer._grid_tags(self_like) == ["e", "a", None, None]
@@ -0,0 +1,117 @@
+import contextlib
+import io
+
+from tbview.dashing_lib.dashing import TBox
+from tbview.dashing_lib.widgets import PlotextTile, PlotGrid, SelectionTile, TagIndex
+from tbview.headless import HeadlessTerminal, ScreenBuffer
+
+
+def test_plotext_tile_memoizes_lines_by_size_and_state_key():
+    calls = []
+    state = {"key": ("loss", 1)}
+
+    def plot_fn(tbox):
+        calls.append((tbox.w, tbox.h))
+        return f"{tbox.w}x{tbox.h}\nline2"
+
+    tile = PlotextTile(plot_fn, cache_key_fn=lambda: state["key"])
+    box = TBox(None, 0, 0, 20, 5)
+    assert tile.plot_lines(box) == ["20x5", "line2"]
+    assert tile.plot_lines(box) == ["20x5", "line2"]
+    assert len(calls) == 1
+
+    # A resize or a change in render state triggers a rebuild
+    tile.plot_lines(TBox(None, 0, 0, 30, 5))
+    state["key"] = ("loss", 2)
+    tile.plot_lines(TBox(None, 0, 0, 30, 5))
+    assert len(calls) == 3
+
+
+def test_plotext_tile_without_key_always_renders_and_handles_empty_plot():
+    calls = []
+
+    def plot_fn(tbox):
+        calls.append(1)
+        return None
+
+    tile = PlotextTile(plot_fn)
+    box = TBox(None, 0, 0, 10, 3)
+    assert tile.plot_lines(box) == []
+    assert tile.plot_lines(box) == []
+    assert len(calls) == 2
+
+
+def test_plotext_tile_pads_by_visible_width_inside_borders():
+    term = HeadlessTerminal(20, 6)
+    lines = "\n".join(["\x1b[31m" + "x" * 4 + "\x1b[0m", "y" * 40, "z"])
+    tile = PlotextTile(lambda tbox: lines, border_color=15)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tile._display(TBox(term, 0, 0, 20, 6), None)
+    screen = ScreenBuffer(20, 6)
+    screen.feed(out.getvalue())
+    rows = screen.rows
+    # Every content row keeps the right border in the last column
+    assert all(rows[r][19] == "│" for r in range(1, 5))
+    assert "".join(rows[2][3:19]) == "xxxx" + " " * 12
+    assert "".join(rows[3][3:19]) == "y" * 16
+    assert "".join(rows[4][3:19]) == "z" + " " * 15
+
+
+def test_plot_grid_lays_out_panels_and_prerenders_only_stale_ones():
+    calls = []
+    keys = {i: ("tag", i, 0) for i in range(4)}
+
+    def make_panel(i):
+        def plot_fn(tbox):
+            calls.append(i)
+            return f"panel {i}"
+        return PlotextTile(plot_fn, cache_key_fn=lambda: keys[i], border_color=15)
+
+    grid = PlotGrid([make_panel(i) for i in range(4)], ncols=2, parallel_fn=lambda: True)
+    try:
+        box = TBox(None, 0, 0, 80, 40)
+        boxes = [b for _p, b in grid.panel_boxes(box)]
+        assert [(b.x, b.y) for b in boxes] == [(0, 0), (0, 40), (20, 0), (20, 40)]
+        assert sum(b.w * b.h for b in boxes) == 80 * 40
+
+        for panel, b in grid.panel_boxes(box):
+            panel.prerender(b)
+        assert sorted(calls) == [0, 1, 2, 3]
+
+        keys[2] = ("tag", 2, 1)
+        for panel, b in grid.panel_boxes(box):
+            panel.prerender(b)
+        assert sorted(calls) == [0, 1, 2, 2, 3]
+    finally:
+        grid.close()
+
+
+def test_tag_index_ranks_prefix_then_substring_then_fuzzy():
+    index = TagIndex(["eval/loss", "train/loss", "lr", "loss", "layer/o/s/s"])
+    assert index.prefix("LO") == [3]
+    assert index.search("loss") == [3, 0, 1, 4]
+    # Narrowing within previous candidates gives the same answer as a full scan
+    assert index.search("losss", candidates=index.search("loss")) == index.search("losss")
+    assert index.search("") == [0, 1, 2, 3, 4]
+
+
+def test_selection_tile_search_narrows_and_moves_within_matches():
+    tags = [f"tag{i:04d}" for i in range(5000)]
+    tile = SelectionTile([])
+    tile.set_options([f"[{i+1}] {t}" for i, t in enumerate(tags)], keys=tags)
+    tile.current = 10
+    tile.set_query("tag49")
+    # prefix matches come first, fuzzy ones (e.g. tag4019) follow
+    assert list(tile.visible[:100]) == list(range(4900, 5000))
+    assert 4019 in tile.visible
+    assert tile.current == 4900
+    tile.move(3)
+    assert tile.current == 4903
+    tile.move(-10)
+    assert tile.current == 4900
+    # Clearing the query keeps the selection and lists everything again
+    tile.set_query("")
+    assert tile.current == 4900 and len(tile.visible) == 5000
+    tile.move(5000)
+    assert tile.current == 4999
@@ -0,0 +1,92 @@
+import argparse
+import os
+import tempfile
+import time
+
+import pytest
+
+from tbview import synth
+from tbview.cli import parse_duration
+from tbview.headless import HeadlessTerminal
+from tbview.parser import read_payloads_from_offset, decode_scalars, window_start_offset
+from tbview.viewer import TensorboardViewer
+
+
+def _first_step_at(path, offset):
+    payload, _end = next(read_payloads_from_offset(path, offset))
+    return decode_scalars(payload)[0]
+
+
+def test_window_start_offset_by_steps_and_wall_time():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        # wall_time is 1000 + step
+        synth.generate_event_file(path, steps=5000, tags=4)
+        assert _first_step_at(path, window_start_offset(path, last_steps=100)) == 4900
+        assert _first_step_at(path, window_start_offset(path, since=250, now=1000 + 4999)) == 4749
+        assert window_start_offset(path, last_steps=10 ** 6) == 0
+        assert window_start_offset(path, since=10, now=10 ** 6) == os.path.getsize(path)
+
+
+def test_window_start_offset_skips_undecodable_records():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        payloads = []
+        for step in range(5000):
+            payloads.append(synth.make_scalars_event(step, {"train/loss": 0.5}, wall_time=1000.0 + step))
+            if step % 10 == 3:
+                # Valid framing and CRC, but not a decodable event
+                payloads.append(b"\x2a\x05\x0a")
+        synth.write_tfrecord_records(path, payloads)
+        assert _first_step_at(path, window_start_offset(path, last_steps=100)) == 4900
+        assert _first_step_at(path, window_start_offset(path, since=250, now=1000 + 4999)) == 4749
+        assert window_start_offset(path, last_steps=10 ** 6) == 0
+
+
+def test_viewer_loads_window_then_backfills_history():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=3000, tags=2)
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30),
+                                   last_steps=50)
+        viewer._ensure_tag_loaded("train/metric_0")
+        series = viewer.records_by_run["run"]["train/metric_0"]
+        assert sorted(series) == list(range(2950, 3000))
+
+        viewer._start_backfill()
+        deadline = time.time() + 10
+        while viewer._history_end_by_run and time.time() < deadline:
+            viewer.render_frame()
+            time.sleep(0.01)
+        series = viewer.records_by_run["run"]["train/metric_0"]
+        assert list(series) == list(range(3000))
+        assert viewer.wall_times_by_run["run"]["train/metric_0"][0] == 1000.0
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("1.5h") == 5400
+    assert parse_duration("2d") == 172800
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_duration("soon")
+
+
+def test_xlim_before_loaded_window_waits_for_backfill():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "events.out.tfevents.test")
+        synth.generate_event_file(path, steps=3000, tags=2)
+        viewer = TensorboardViewer(path, "run", plot_engine="braille", term=HeadlessTerminal(100, 30),
+                                   last_steps=50)
+        viewer.render_frame()
+        viewer._xlim_input_buffer = "0:100"
+        viewer._finalize_xlim_input()
+        assert viewer._pending_xlim == (0, 100)
+        assert viewer._xlim_steps is None
+
+        deadline = time.time() + 10
+        while viewer._history_end_by_run and time.time() < deadline:
+            viewer.render_frame()
+            time.sleep(0.01)
+        assert viewer._pending_xlim is None
+        assert viewer._xlim_steps == (0, 100)